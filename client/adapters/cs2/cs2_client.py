@@ -13,7 +13,10 @@ from time import sleep
 from typing import Optional, Tuple, List
 
 from util.config import load_config, get_config_path
-from util.chat_utils import write_chat_to_cfg, load_chat, send_chat
+from util.chat_output import ChatOutputScheduler
+from util.chat_utils import CS2ChatSink
+from util.log_tailer import LogTailer, create_watcher
+from util.wire_format import JSON_CONTENT_TYPE, MSGPACK_CONTENT_TYPE, decode_body, encode_body, is_msgpack, msgpack_available
 import util.keys as keys
 
 
@@ -66,16 +69,26 @@ class CS2Client:
         self.send_chat_key_win32 = keys.KEYS[self.send_chat_key]
         self.console_log_path = self.config.get("console_log_path")
         self.exec_path = self.config.get("exec_path")
-        
-        # Chat queue for outgoing messages
-        self.chat_queue = []
-        self.chat_queue_lock = threading.Lock()
-        self.chat_queue_thread = threading.Thread(target=self._chat_queue_worker, daemon=True)
+
+        # One keep-alive session to the server, so chat lines do not each pay a TCP handshake.
+        self.http = requests.Session()
+        self.http.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.http.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        wire_format = str(self.config.get("server_wire_format", "auto")).strip().lower()
+        if wire_format != "json" and msgpack_available():
+            self.http.headers["Accept"] = f"{MSGPACK_CONTENT_TYPE}, {JSON_CONTENT_TYPE}"
+        # Request bodies switch to msgpack once the server has answered in it.
+        self._server_speaks_msgpack = False
         
         # Control flags
         self.paused = False
         self.running = True
         self.stop_event = threading.Event()
+
+        # Paced, coalescing output queue for outgoing messages
+        sink = CS2ChatSink(self.exec_path, self.send_chat_key, self.load_chat_key_win32, self.send_chat_key_win32)
+        self.chat_output = ChatOutputScheduler.from_config(sink, self.config, stop_event=self.stop_event)
+        self.chat_queue_thread = threading.Thread(target=self.chat_output.run, daemon=True)
         self.logger.info(f"CS2 session initialized: {self.session_id}")
 
     def _acquire_instance_lock(self) -> bool:
@@ -296,7 +309,9 @@ class CS2Client:
         self.logger.info("Stopping CS2 client...")
         self.stop_event.set()
         self.running = False
+        self.chat_output.stop()
         keyboard.unhook_all_hotkeys()
+        self.http.close()
         self._release_instance_lock()
         self.logger.info("CS2 client stopped.")
         
@@ -321,16 +336,11 @@ class CS2Client:
         if not chattext:
             return
             
-        # Check if a duplicate message is already in the queue
-        with self.chat_queue_lock:
-            for queued_is_team, queued_chattext in self.chat_queue:
-                if queued_chattext == chattext and queued_is_team == is_team:
-                    self.logger.debug(f"Duplicate message found in queue: {chattext} (team: {is_team})")
-                    return
-                    
-        self.logger.debug(f"Adding message to chat queue: {chattext} (team: {is_team})")
-        self.chat_queue.append((is_team, chattext))
-        self.logger.info(f"{len(self.chat_queue)} messages in queue.")
+        if not self.chat_output.enqueue(is_team, chattext):
+            self.logger.debug(f"Duplicate message found in queue: {chattext} (team: {is_team})")
+            return
+
+        self.logger.debug(f"Added message to chat queue: {chattext} (team: {is_team}), {len(self.chat_output)} queued.")
 
     def remove_player_from_chat_queue(self, playername: str) -> int:
         """Remove queued bot responses that belong to a specific player."""
@@ -339,54 +349,16 @@ class CS2Client:
             return 0
 
         prefix = f"{normalized_player}:"
-        with self.chat_queue_lock:
-            before = len(self.chat_queue)
-            self.chat_queue = [item for item in self.chat_queue if not item[1].startswith(prefix)]
-            removed = before - len(self.chat_queue)
+        removed = self.chat_output.remove_where(lambda is_team, chattext: chattext.startswith(prefix))
 
         if removed > 0:
             self.logger.info(f"Removed {removed} queued messages for player {normalized_player}.")
         return removed
-        
-    def _chat_queue_worker(self) -> None:
-        """Process the chat queue and send messages to CS2."""
-        while True:
-            while not self.chat_queue and not self.stop_event.is_set():
-                self._interruptible_sleep(0.1)
-                
-            if not self.chat_queue:
-                continue
-
-            with self.chat_queue_lock:
-                if not self.chat_queue:
-                    continue
-                is_team, chattext = self.chat_queue.pop(0)
-            self.logger.info(f"Processing chat message: {chattext} (team: {is_team})")
-            
-            try:
-                # Write the message to the chat configuration file
-                write_chat_to_cfg(self.exec_path, self.send_chat_key, is_team, chattext)
-                self._interruptible_sleep(0.5)
-                
-                # Load the chat message into the game
-                while self.paused and not self.stop_event.is_set():
-                    self._interruptible_sleep(0.1)
-                    
-                load_chat(self.load_chat_key_win32)
-                self._interruptible_sleep(0.5)
-                
-                # Send the chat message
-                while self.paused and not self.stop_event.is_set():
-                    self._interruptible_sleep(0.1)
-                    
-                send_chat(self.send_chat_key_win32)
-                self._interruptible_sleep(0.5)
-            except Exception as e:
-                self.logger.error(f"Error processing chat message: {e}")
                 
     def set_paused(self, paused: bool) -> None:
         """Set the paused state of the client."""
         self.paused = paused
+        self.chat_output.set_paused(paused)
         self.state = "Paused" if paused else "Ready"
         self.logger.info(f"CS2 client {self.state.lower()}.")
         
@@ -455,50 +427,117 @@ class CS2Client:
 
         return False
             
-    def send_to_server(self, is_team: bool, playername: str, chattext: str) -> Optional[list]:
+    def _build_payload(self, is_team: bool, playername: str, chattext: str, language: Optional[str] = None) -> dict:
+        """Build the server payload for one chat line."""
+        return {
+            "is_team": is_team,
+            "playername": playername,
+            "chattext": chattext,
+            "platform": "cs2",
+            # Use runtime language to avoid mid-session config drift.
+            "language": language or self.language,
+            "session_id": self.session_id,
+        }
+
+    def _post(self, path: str, payload: dict, timeout: float) -> Tuple[int, Optional[dict]]:
+        """POST ``payload`` over the shared session; returns (status, decoded body on 200)."""
+        body, content_type = encode_body(payload, use_msgpack=self._server_speaks_msgpack)
+        response = self.http.post(
+            f"{self.server_url}{path}", data=body, headers={"Content-Type": content_type}, timeout=timeout
+        )
+        response_type = response.headers.get("Content-Type")
+        if is_msgpack(response_type):
+            self._server_speaks_msgpack = True
+        if response.status_code != 200:
+            return response.status_code, None
+        data = decode_body(response.content, response_type)
+        if not isinstance(data, dict):
+            raise requests.exceptions.InvalidJSONError(f"Undecodable response body from {path}")
+        return response.status_code, data
+
+    def send_to_server(self, is_team: bool, playername: str, chattext: str, language: Optional[str] = None) -> Optional[list]:
         """Send a message to the server and get responses."""
         from time import time
         start_time = time()
-        
+
+        url = f"{self.server_url}/process_message"
+        payload = self._build_payload(is_team, playername, chattext, language)
+        self.logger.debug(f"Sending to {url}: is_team={is_team}, playername={playername}, chattext={chattext}, language={payload['language']}")
         try:
-            url = f"{self.server_url}/process_message"
-            self.logger.info(f"Sending POST to: {url}")
-            self.logger.info(f"Payload: is_team={is_team}, playername={playername}, chattext={chattext}")
-            
-            # Use runtime language to avoid mid-session config drift.
-            language = self.language
-            self.logger.info(f"DEBUG: Config adapters: {self.config.get('adapters', {})}")
-            self.logger.info(f"DEBUG: CS2 config: {self.config.get('adapters', {}).get('cs2', {})}")
-            self.logger.info(f"DEBUG: Active runtime language: {language}")
-            
-            request_start = time()
-            response = requests.post(
-                url,
-                json={
-                    "is_team": is_team,
-                    "playername": playername,
-                    "chattext": chattext,
-                    "platform": "cs2",
-                    "language": language,
-                    "session_id": self.session_id,
-                },
-                timeout=5
-            )
-            request_time = time() - request_start
-            
-            self.logger.info(f"Response status: {response.status_code} (request took {request_time:.4f}s)")
-            
-            if response.status_code == 200:
-                data = response.json()
-                total_time = time() - start_time
-                self.logger.info(f"Total send_to_server time: {total_time:.4f}s")
-                return data.get("responses", [])
-            else:
-                self.logger.error(f"Server returned status code: {response.status_code}, URL was: {url}")
-                return None
+            status, data = self._post("/process_message", payload, timeout=5)
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Failed to communicate with server: {e}, URL was: {url}")
+            return None
+
+        if status == 200:
+            self.logger.debug(f"send_to_server took {time() - start_time:.4f}s")
+            return data.get("responses", [])
+        self.logger.error(f"Server returned status code: {status}, URL was: {url}")
+        return None
+
+    def send_batch_to_server(self, payloads: List[dict]) -> List[Optional[list]]:
+        """Send several chat lines in one request; returns responses in the same order.
+
+        Falls back to one request per line when the server has no batch endpoint.
+        """
+        from time import time
+        start_time = time()
+
+        url = f"{self.server_url}/process_messages"
+        try:
+            self.logger.debug(f"Sending batch of {len(payloads)} messages to: {url}")
+            status, data = self._post("/process_messages", {"messages": payloads}, timeout=5 + len(payloads))
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to communicate with server: {e}, URL was: {url}")
+            return [None] * len(payloads)
+
+        if status == 200:
+            results = data.get("results", [])
+            self.logger.debug(f"Batch request took {time() - start_time:.4f}s")
+            return [
+                result.get("responses", []) if isinstance(result, dict) and "error" not in result else None
+                for result in results
+            ] + [None] * (len(payloads) - len(results))
+
+        if status not in (404, 405):
+            self.logger.error(f"Server returned status code: {status}, URL was: {url}")
+            return [None] * len(payloads)
+
+        self.logger.info("Server has no batch endpoint; sending messages individually.")
+        return [
+            self.send_to_server(payload["is_team"], payload["playername"], payload["chattext"], payload["language"])
+            for payload in payloads
+        ]
+
+    def _parse_chat_entry(self, line: str) -> Optional[Tuple[bool, str, str]]:
+        """Parse one console line into ``(is_team, playername, chattext)``, or None to skip it."""
+        is_team, playername, chattext = self.parse_chat_line(line)
+        if not playername or not chattext:
+            return None
+
+        # Seeing our own output echoed lets the chat queue speed up its pacing.
+        acknowledged = self.chat_output.acknowledge(chattext, sender=playername)
+        if acknowledged or self._is_echoed_bot_message(playername, chattext):
+            self.logger.debug(f"Skipping echoed bot output: [{playername}] {chattext}")
             return None
+
+        return is_team, playername, chattext
+
+    def _queue_responses(self, is_team: bool, responses: Optional[list]) -> None:
+        """Queue server responses for sending to CS2."""
+        if not responses:
+            return
+
+        for response in responses:
+            control = response.get("control")
+            if control == "remove_player_queue":
+                self.remove_player_from_chat_queue(response.get("player", ""))
+                continue
+
+            response_is_team = response.get("is_team", is_team)
+            response_text = response.get("text", "")
+            if response_text:
+                self.add_to_chat_queue(response_is_team, response_text)
             
     def run(self):
         """Main loop to monitor the console log and process messages."""
@@ -537,53 +576,40 @@ class CS2Client:
             
         self.state = "Ready"
         
-        # Open console log file
+        # Follow the console log; the tailer blocks on file-change notifications between reads.
         self.logger.info("Attempting to read console log...")
-        try:
-            log_file = open(self.console_log_path, "r", encoding="utf-8")
-        except FileNotFoundError:
-            self.logger.error(f"Console log file {self.console_log_path} not found.")
-            return
-            
-        log_file.seek(0, os.SEEK_END)  # Move to the end of the file
-        
+        watcher = create_watcher(self.console_log_path, self.config.get("console_log_watcher", "auto"))
+        tailer = LogTailer(self.console_log_path, watcher=watcher, stop_event=self.stop_event)
+        self.logger.info(f"Watching console log with {type(watcher).__name__}.")
+
         self.logger.info("Starting CS2 client main loop...")
-        while self.running:
-            line = log_file.readline()
-            if not line:
-                continue
-                
-            # Parse the line
-            is_team, playername, chattext = self.parse_chat_line(line)
-            if not playername or not chattext:
-                continue
+        for entries in tailer.parsed_batches(self._parse_chat_entry, max_lines=20):
+            if not self.running:
+                break
 
-            if self._is_echoed_bot_message(playername, chattext):
-                self.logger.debug(f"Skipping echoed bot output: [{playername}] {chattext}")
-                continue
-            
-            self.logger.info(f"Parsed chat: [{playername}] {chattext} (team: {is_team})")
+            pending = []
+            for is_team, playername, chattext in entries:
+                self.logger.info(f"Parsed chat: [{playername}] {chattext} (team: {is_team})")
 
-            # Handle adapter-local language command without hitting the server.
-            if self._handle_local_language_command(is_team, chattext):
+                # Handle adapter-local language command without hitting the server.
+                if self._handle_local_language_command(is_team, chattext):
+                    continue
+
+                pending.append(self._build_payload(is_team, playername, chattext))
+
+            if not pending:
                 continue
-                
-            # Send to server for processing
-            responses = self.send_to_server(is_team, playername, chattext)
-            
-            # Queue responses for sending to CS2
-            if responses:
-                for response in responses:
-                    control = response.get("control")
-                    if control == "remove_player_queue":
-                        self.remove_player_from_chat_queue(response.get("player", ""))
-                        continue
-
-                    response_is_team = response.get("is_team", is_team)
-                    response_text = response.get("text", "")
-                    if response_text:
-                        self.add_to_chat_queue(response_is_team, response_text)
-                        
+
+            # Send to server for processing; bursts of lines go out as one batch.
+            if len(pending) == 1:
+                payload = pending[0]
+                results = [self.send_to_server(payload["is_team"], payload["playername"], payload["chattext"], payload["language"])]
+            else:
+                results = self.send_batch_to_server(pending)
+
+            for payload, responses in zip(pending, results):
+                self._queue_responses(payload["is_team"], responses)
+
         self.logger.info("CS2 client main loop exited.")
         
     def _interruptible_sleep(self, duration: float) -> None:
@@ -1,9 +1,10 @@
 import os
+import asyncio
 import logging
+import aiohttp
 import discord
-import requests
 from discord.ext import commands
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict, Tuple
 from dotenv import load_dotenv
 
 from util.config import load_config
@@ -11,6 +12,10 @@ from util.config import load_config
 # Load environment variables from .env file
 load_dotenv()
 
+# Keep-alive connections to the bot server shared by every channel.
+SERVER_MAX_CONNECTIONS = int(os.getenv("DISCORD_SERVER_MAX_CONNECTIONS", "20"))
+SERVER_KEEPALIVE_SECONDS = float(os.getenv("DISCORD_SERVER_KEEPALIVE_SECONDS", "30"))
+
 
 class DiscordClient(commands.Bot):
     """Client adapter for Discord that handles Discord-specific interactions."""
@@ -50,6 +55,9 @@ class DiscordClient(commands.Bot):
         self.logger.addHandler(console_handler)
         self.active_scramble_sessions = set()
         self.channel_languages = {}
+        # Messages waiting for the server, per session; a session is present while it is being flushed.
+        self._pending_server_messages: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._http_session: Optional[aiohttp.ClientSession] = None
         
         # Load configuration
         self.config = load_config()
@@ -252,12 +260,8 @@ class DiscordClient(commands.Bot):
         
         # Send to server for processing
         language = self.channel_languages.get(session_id, self.default_language)
-        responses = await self.send_to_server(
-            is_team,
-            playername,
-            chattext,
-            session_id=session_id,
-            language=language,
+        responses = await self._submit_to_server(
+            self._build_payload(is_team, playername, chattext, session_id=session_id, language=language)
         )
 
         if is_prefixed:
@@ -283,6 +287,91 @@ class DiscordClient(commands.Bot):
                     except discord.errors.HTTPException as e:
                         self.logger.error(f"Failed to send message: {e}")
     
+    def _build_payload(
+        self,
+        is_team: bool,
+        playername: str,
+        chattext: str,
+        session_id: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the server payload for one Discord message."""
+        return {
+            "is_team": is_team,
+            "playername": playername,
+            "chattext": chattext,
+            "platform": "discord",
+            "language": language or self.default_language,
+            "session_id": session_id or "discord-default",
+        }
+
+    async def _submit_to_server(self, payload: Dict[str, Any]) -> Optional[List[Dict]]:
+        """Queue a message for its session and wait for its responses.
+
+        While a request for a session is in flight, further messages from that
+        session are collected and sent together as one batch, in arrival order.
+        """
+        session_id = payload["session_id"]
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending_server_messages.get(session_id)
+        if pending is not None:
+            pending.append((payload, future))
+        else:
+            self._pending_server_messages[session_id] = [(payload, future)]
+            asyncio.ensure_future(self._flush_session(session_id))
+        return await future
+
+    async def _flush_session(self, session_id: str) -> None:
+        """Send queued messages for a session until none are left."""
+        while True:
+            pending = self._pending_server_messages.get(session_id)
+            if not pending:
+                self._pending_server_messages.pop(session_id, None)
+                return
+            self._pending_server_messages[session_id] = []
+
+            payloads = [payload for payload, _ in pending]
+            try:
+                if len(payloads) == 1:
+                    payload = payloads[0]
+                    results = [await self.send_to_server(
+                        payload["is_team"],
+                        payload["playername"],
+                        payload["chattext"],
+                        session_id=payload["session_id"],
+                        language=payload["language"],
+                    )]
+                else:
+                    results = await self.send_batch_to_server(payloads)
+            except Exception as e:
+                self.logger.error(f"Failed to send messages for session {session_id}: {e}")
+                results = [None] * len(pending)
+
+            for (_, future), responses in zip(pending, results):
+                if not future.done():
+                    future.set_result(responses)
+
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Return the pooled keep-alive session, creating it on first use inside the event loop."""
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(limit=SERVER_MAX_CONNECTIONS, keepalive_timeout=SERVER_KEEPALIVE_SECONDS)
+            self._http_session = aiohttp.ClientSession(connector=connector)
+        return self._http_session
+
+    async def _post_json(self, url: str, body: Dict[str, Any], timeout: float) -> Tuple[int, Optional[Dict]]:
+        """POST ``body`` as JSON without blocking the event loop; returns (status, parsed body on 200)."""
+        session = self._get_http_session()
+        async with session.post(url, json=body, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status != 200:
+                return response.status, None
+            return response.status, await response.json()
+
+    async def close(self) -> None:
+        """Close the server connection pool along with the Discord connection."""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        await super().close()
+
     async def send_to_server(
         self,
         is_team: bool,
@@ -292,38 +381,59 @@ class DiscordClient(commands.Bot):
         language: Optional[str] = None,
     ) -> Optional[List[Dict]]:
         """Send a message to the server and get responses."""
+        url = f"{self.server_url}/process_message"
+        self.logger.info(f"Sending POST to: {url}")
+        payload = self._build_payload(is_team, playername, chattext, session_id=session_id, language=language)
+        self.logger.info(
+            f"Payload: is_team={is_team}, playername={playername}, chattext={chattext}, session_id={payload['session_id']}, language={payload['language']}"
+        )
         try:
-            url = f"{self.server_url}/process_message"
-            self.logger.info(f"Sending POST to: {url}")
-            resolved_language = language or self.default_language
-            self.logger.info(
-                f"Payload: is_team={is_team}, playername={playername}, chattext={chattext}, session_id={session_id}, language={resolved_language}"
-            )
-            
-            response = requests.post(
-                url,
-                json={
-                    "is_team": is_team,
-                    "playername": playername,
-                    "chattext": chattext,
-                    "platform": "discord",
-                    "language": resolved_language,
-                    "session_id": session_id or "discord-default",
-                },
-                timeout=5
-            )
-            
-            self.logger.info(f"Response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("responses", [])
-            else:
-                self.logger.error(f"Server returned status code: {response.status_code}")
-                return None
-        except requests.exceptions.RequestException as e:
+            status, data = await self._post_json(url, payload, timeout=5)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            # ValueError: a 200 whose body is not valid JSON.
             self.logger.error(f"Failed to communicate with server: {e}")
             return None
+
+        self.logger.info(f"Response status: {status}")
+        if status == 200 and isinstance(data, dict):
+            return data.get("responses", [])
+        self.logger.error(f"Server returned status code: {status}")
+        return None
+
+    async def send_batch_to_server(self, payloads: List[Dict[str, Any]]) -> List[Optional[List[Dict]]]:
+        """Send several messages in one request; returns responses in the same order."""
+        url = f"{self.server_url}/process_messages"
+        try:
+            self.logger.info(f"Sending batch of {len(payloads)} messages to: {url}")
+            status, data = await self._post_json(url, {"messages": payloads}, timeout=5 + len(payloads))
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.logger.error(f"Failed to communicate with server: {e}")
+            return [None] * len(payloads)
+
+        if status == 200:
+            results = data.get("results", []) if isinstance(data, dict) else []
+            if not isinstance(results, list):
+                results = []
+            return [
+                result.get("responses", []) if isinstance(result, dict) and "error" not in result else None
+                for result in results
+            ] + [None] * (len(payloads) - len(results))
+
+        if status not in (404, 405):
+            self.logger.error(f"Server returned status code: {status}")
+            return [None] * len(payloads)
+
+        # Older servers have no batch endpoint; fall back to one request per message.
+        return [
+            await self.send_to_server(
+                payload["is_team"],
+                payload["playername"],
+                payload["chattext"],
+                session_id=payload["session_id"],
+                language=payload["language"],
+            )
+            for payload in payloads
+        ]
     
     def run_bot(self):
         """Run the Discord bot."""
@@ -1,6 +1,44 @@
 from util.commands import command_registry
 from modules.fishing import Fishing as FishingModule
 
+# CS2 drops chat text past this length; it is also what the client merges short lines up to.
+CHAT_LINE_LIMIT = 127
+
+def _format_bulk_cast(bot, playername: str, result: dict) -> list:
+    """Summarize a bulk cast result as chat lines, splitting the results to fit the chat limit."""
+    parts = [
+        bot.t("commands.fishing.cast_bulk_fish", name=fish["name"], weight=fish["weight"], price=fish["price"])
+        for fish in result["fish"]
+    ]
+    parts.extend(
+        bot.t("commands.fishing.cast_bulk_autosold", name=fish["name"], price=fish["price"])
+        for fish in result["autosold"]
+    )
+    parts.extend(
+        item["name"] if item["quantity"] == 1
+        else bot.t("commands.fishing.cast_bulk_item", name=item["name"], quantity=item["quantity"])
+        for item in result["items"]
+    )
+    if result["misses"]:
+        parts.append(bot.t("commands.fishing.cast_bulk_empty", count=result["misses"]))
+    if result["sack_full"]:
+        parts.append(bot.t("commands.fishing.cast_bulk_sack_full"))
+
+    def render(chunk, first):
+        if first:
+            return bot.t("commands.fishing.cast_bulk_summary",
+                player=playername, casts=result["casts"], results=", ".join(chunk))
+        return f"{playername}: {', '.join(chunk)}"
+
+    lines, chunk = [], []
+    for part in parts:
+        if chunk and len(render(chunk + [part], not lines)) > CHAT_LINE_LIMIT:
+            lines.append(render(chunk, not lines))
+            chunk = []
+        chunk.append(part)
+    lines.append(render(chunk, not lines))
+    return lines
+
 @command_registry.register("cast", aliases=["fish", "gofish"])
 def cast_command(bot, is_team: bool, playername: str, chattext: str) -> None:
     """
@@ -9,14 +47,19 @@ def cast_command(bot, is_team: bool, playername: str, chattext: str) -> None:
     :param bot: The Bot instance.
     :param is_team: Whether the message is for the team chat.
     :param playername: The name of the player.
-    :param chattext: Additional text (ignored for this command).
-    :help cast: Cast your fishing rod to catch a fish or item. (alias: fish, gofish)
+    :param chattext: Optional number of casts to make at once.
+    :help cast: Cast your fishing rod to catch a fish or item. Add a number (e.g. cast 10) to cast several times at once. (alias: fish, gofish)
     """
     fishing_module: FishingModule = bot.modules.get_module("fishing")
     if fishing_module:
-        result = fishing_module.fish(playername, t=bot.t)
+        count_text = chattext.strip() if chattext else ""
+        count = int(count_text) if count_text.isdecimal() else 1
+        result = fishing_module.fish(playername, t=bot.t, count=count)
         if result:
-            if result.get("type") == "fish":
+            if result.get("type") == "bulk":
+                for line in _format_bulk_cast(bot, playername, result):
+                    bot.add_to_chat_queue(is_team, line)
+            elif result.get("type") == "fish":
                 # If a fish is caught, display its details
                 message = bot.t("commands.fishing.cast_success_fish",
                     player=playername, name=result['name'], 
@@ -50,11 +93,10 @@ def sack_command(bot, is_team: bool, playername: str, chattext: str) -> None:
     :param chattext: Additional text (ignored for this command).
     :help sack: Display the contents of your fishing sack. (alias: bag)
     """
-    bot.logger.info(f"SACK_COMMAND CALLED for {playername}")
     fishing_module: FishingModule = bot.modules.get_module("fishing")
     if fishing_module:
         sack = fishing_module.get_sack(playername)
-        bot.logger.info(f"SACK_COMMAND got sack: {sack}")
+        bot.logger.debug("Sack for %s: %s", playername, sack)
         if sack:
             sack_contents = []
             for fish in sack:
@@ -27,7 +27,7 @@ def inventory_command(bot, is_team: bool, playername: str, chattext: str) -> Non
     else:
         bot.add_to_chat_queue(is_team, bot.t("commands.inventory.module_not_found", player=playername))
 
-@command_registry.register("open", aliases=["case"])
+@command_registry.register("open", aliases=["case"], slow=True)
 def open_command(bot, is_team: bool, playername: str, chattext: str) -> None:
     """
     Open a case from the player's inventory.
@@ -60,7 +60,7 @@ def _get_target_locale(to_input: str) -> str:
     return _TARGET_LOCALE_MAP.get(normalized, "en_US")
 
 
-@command_registry.register("translate", aliases=["trans", "tl"])
+@command_registry.register("translate", aliases=["trans", "tl"], slow=True)
 def translate_command(bot, is_team: bool, playername: str, chattext: str) -> None:
     # Support:
     #   !translate <to>               — translate last message to <to>
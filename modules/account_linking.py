@@ -1,13 +1,50 @@
 """
 Account linking module for cross-platform user identification.
 """
+import os
 import random
 import string
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from util.database import DatabaseConnection
+from util.database import DatabaseConnection, after_commit, after_rollback
 from util.module_registry import module_registry
 
 
+class _IdentityCache:
+    """Thread-safe LRU cache with per-entry expiry for resolved identities."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class AccountLinking:
     """Manage account linking across platforms."""
     
@@ -15,6 +52,11 @@ class AccountLinking:
         """Initialize the account linking module."""
         self.code_length = 6
         self.code_expiry_minutes = 10
+        # Preferred identifiers are resolved for every chat line, so cache them.
+        # Unlinked players are cached for a shorter time since they may link elsewhere.
+        self._identity_ttl_seconds = float(os.getenv("ACCOUNT_LINK_CACHE_TTL_SECONDS", "600"))
+        self._unlinked_ttl_seconds = float(os.getenv("ACCOUNT_LINK_UNLINKED_CACHE_TTL_SECONDS", "60"))
+        self._identity_cache = _IdentityCache(int(os.getenv("ACCOUNT_LINK_CACHE_SIZE", "10000")))
 
     def _translate(self, t, key, default_text, **kwargs):
         if callable(t):
@@ -187,6 +229,13 @@ class AccountLinking:
             # Migrate fishing data if needed
             self._migrate_fishing_data(cursor, source_platform, source_identifier, 
                                        target_platform, target_identifier)
+
+        # Links change which identifier every account in the group resolves to. Clear now for
+        # the rest of this message, and again when the link commits or rolls back, since a
+        # concurrent lookup may have re-cached the old identity in between.
+        self._identity_cache.clear()
+        after_commit(self._identity_cache.clear)
+        after_rollback(self._identity_cache.clear)
         
         return {
             "success": True,
@@ -385,35 +434,36 @@ class AccountLinking:
         :param identifier: The user identifier
         :return: The preferred identifier (Discord username if linked, otherwise original)
         """
+        key = (platform, identifier)
+        preferred = self._identity_cache.get(key)
+        if preferred is not None:
+            return preferred
+
         with DatabaseConnection() as cursor:
-            # Find the account_id for this user
+            # Resolve this user's link group and its Discord account in one query
             cursor.execute("""
-                SELECT account_id FROM account_links
-                WHERE platform = %s AND identifier = %s
+                SELECT discord.identifier
+                FROM account_links AS link
+                LEFT JOIN account_links AS discord
+                    ON discord.account_id = link.account_id AND discord.platform = 'discord'
+                WHERE link.platform = %s AND link.identifier = %s
+                LIMIT 1
             """, (platform, identifier))
-            
             result = cursor.fetchone()
-            
-            if not result:
-                # No linked account, return original identifier
-                return identifier
-            
-            account_id = result[0]
-            
-            # Look for a Discord account in this link group
-            cursor.execute("""
-                SELECT identifier FROM account_links
-                WHERE account_id = %s AND platform = 'discord'
-            """, (account_id,))
-            
-            discord_result = cursor.fetchone()
-            
-            if discord_result:
-                # Return Discord identifier if it exists
-                return discord_result[0]
-            
-            # No Discord account linked, return original identifier
+
+        if not result:
+            # No linked account, return original identifier
+            self._identity_cache.set(key, identifier, self._unlinked_ttl_seconds)
             return identifier
+
+        # Prefer the Discord identifier if the group has one
+        preferred = result[0] or identifier
+        self._identity_cache.set(key, preferred, self._identity_ttl_seconds)
+        return preferred
+
+    def invalidate_identity_cache(self):
+        """Drop all cached preferred identifiers."""
+        self._identity_cache.clear()
     
     def cleanup_expired_codes(self):
         """Remove expired linking codes."""
@@ -20,6 +20,17 @@ class Casino:
                 return translated
         return default_text.format(**kwargs)
 
+    def _place_bet(self, user_id, amount):
+        """
+        Atomically debit a bet.
+
+        :return: (True, new_balance) if the bet was taken, otherwise (False, current_balance).
+        """
+        result = self.economy.deduct_balance(user_id, amount)
+        if isinstance(result, dict):
+            return False, result.get("balance", 0.0)
+        return True, result
+
     def flip(self, user_id, amount=10, t=None):
         """
         Flip a coin to gamble an amount.
@@ -31,14 +42,14 @@ class Casino:
         if amount <= 0:
             return self._translate(t, "commands.flip.amount_must_be_positive", "No way jose, pick a number greater than 0.")
 
-        # Ensure the user has enough balance
-        current_balance = self.economy.get_balance(user_id)
-        if current_balance < amount:
+        # Take the bet up front; this fails cleanly if the user can't afford it
+        placed, balance = self._place_bet(user_id, amount)
+        if not placed:
             return self._translate(
                 t,
                 "commands.flip.insufficient_funds",
                 "Insufficient funds. Your current balance is ${current_balance:.2f}.",
-                current_balance=current_balance,
+                current_balance=balance,
             )
 
         # Perform the coin flip
@@ -56,25 +67,24 @@ class Casino:
         chance_suffix = f" (Luck-adjusted win chance: {chance_text}%.)" if has_luck_effect else ""
         outcome = "heads" if random.random() < cutoff else "tails"
         if outcome == "heads":
-            # User wins, double the amount
-            self.economy.add_balance(user_id, amount)
+            # User wins, return the bet plus the winnings
+            new_balance = self.economy.add_balance(user_id, amount * 2)
             return self._translate(
                 t,
                 "commands.flip.win_heads",
                 "You flipped heads and won ${amount:.2f}! Your new balance is ${new_balance:.2f}.{chance_suffix}",
                 amount=amount,
-                new_balance=self.economy.get_balance(user_id),
+                new_balance=new_balance,
                 chance_suffix=chance_suffix,
             )
         else:
-            # User loses, deduct the amount
-            self.economy.deduct_balance(user_id, amount)
+            # User loses, the bet was already taken
             return self._translate(
                 t,
                 "commands.flip.lose_tails",
                 "You flipped tails and lost ${amount:.2f}. Your new balance is ${new_balance:.2f}.{chance_suffix}",
                 amount=amount,
-                new_balance=self.economy.get_balance(user_id),
+                new_balance=balance,
                 chance_suffix=chance_suffix,
             )
 
@@ -132,17 +142,15 @@ class Casino:
         if key in self.blackjack_games:
             return self._translate(t, "commands.blackjack.game_already_active", "You already have an active blackjack hand in this session.")
 
-        current_balance = self.economy.get_balance(user_id)
-        if current_balance < bet:
+        placed, balance = self._place_bet(user_id, bet)
+        if not placed:
             return self._translate(
                 t,
                 "commands.blackjack.insufficient_funds",
                 "Insufficient funds. Your current balance is ${current_balance:.2f}.",
-                current_balance=current_balance,
+                current_balance=balance,
             )
 
-        self.economy.deduct_balance(user_id, bet)
-
         deck = self._bj_new_deck()
         player_hand = [deck.pop(), deck.pop()]
         dealer_hand = [deck.pop(), deck.pop()]
@@ -153,22 +161,22 @@ class Casino:
         dealer_blackjack = dealer_value == 21 and len(dealer_hand) == 2
 
         if player_blackjack and dealer_blackjack:
-            self.economy.add_balance(user_id, bet)
+            new_balance = self.economy.add_balance(user_id, bet)
             return self._translate(
                 t,
                 "commands.blackjack.push_blackjack",
                 "Push. Both you and dealer have blackjack. Your bet is returned. Balance: ${new_balance:.2f}.",
-                new_balance=self.economy.get_balance(user_id),
+                new_balance=new_balance,
             )
 
         if player_blackjack:
-            self.economy.add_balance(user_id, bet * 2.5)
+            new_balance = self.economy.add_balance(user_id, bet * 2.5)
             return self._translate(
                 t,
                 "commands.blackjack.player_blackjack",
                 "Blackjack! You win ${win_amount:.2f}. Balance: ${new_balance:.2f}.",
                 win_amount=bet * 1.5,
-                new_balance=self.economy.get_balance(user_id),
+                new_balance=new_balance,
             )
 
         if dealer_blackjack:
@@ -177,7 +185,7 @@ class Casino:
                 "commands.blackjack.dealer_blackjack",
                 "Dealer has blackjack. You lose ${bet:.2f}. Balance: ${new_balance:.2f}.",
                 bet=bet,
-                new_balance=self.economy.get_balance(user_id),
+                new_balance=balance,
             )
 
         game = {
@@ -247,16 +255,14 @@ class Casino:
             )
 
         extra_bet = game["bet"]
-        current_balance = self.economy.get_balance(user_id)
-        if current_balance < extra_bet:
+        placed, balance = self._place_bet(user_id, extra_bet)
+        if not placed:
             return self._translate(
                 t,
                 "commands.blackjack.insufficient_funds",
                 "Insufficient funds. Your current balance is ${current_balance:.2f}.",
-                current_balance=current_balance,
+                current_balance=balance,
             )
-
-        self.economy.deduct_balance(user_id, extra_bet)
         game["bet"] += extra_bet
 
         # Double down draws exactly one card, then the hand stands.
@@ -272,7 +278,7 @@ class Casino:
                 player_hand=self._bj_render_hand(game["player_hand"]),
                 player_value=player_value,
                 bet=bet,
-                new_balance=self.economy.get_balance(user_id),
+                new_balance=balance,
             )
 
         return self.blackjack_stand(user_id, session_id, t=t)
@@ -291,7 +297,7 @@ class Casino:
         bet = game["bet"]
 
         if dealer_value > 21 or player_value > dealer_value:
-            self.economy.add_balance(user_id, bet * 2)
+            new_balance = self.economy.add_balance(user_id, bet * 2)
             result = self._translate(
                 t,
                 "commands.blackjack.win",
@@ -299,9 +305,11 @@ class Casino:
                 win_amount=bet,
             )
         elif player_value == dealer_value:
-            self.economy.add_balance(user_id, bet)
+            new_balance = self.economy.add_balance(user_id, bet)
             result = self._translate(t, "commands.blackjack.push", "Push. Your bet is returned.")
         else:
+            # The bet was taken when it was placed; nothing to settle.
+            new_balance = self.economy.get_balance(user_id)
             result = self._translate(
                 t,
                 "commands.blackjack.lose",
@@ -318,7 +326,7 @@ class Casino:
             player_value=player_value,
             dealer_hand=self._bj_render_hand(game["dealer_hand"]),
             dealer_value=dealer_value,
-            new_balance=self.economy.get_balance(user_id),
+            new_balance=new_balance,
         )
 
         self._bj_finish(user_id, session_id)
@@ -337,16 +345,6 @@ class Casino:
         if amount <= 0:
             return self._translate(t, "commands.dice.amount_must_be_positive", "Bet must be greater than 0.")
 
-        # Ensure the user has enough balance
-        current_balance = self.economy.get_balance(user_id)
-        if current_balance < amount:
-            return self._translate(
-                t,
-                "commands.dice.insufficient_funds",
-                "Insufficient funds. Your current balance is ${current_balance:.2f}.",
-                current_balance=current_balance,
-            )
-
         # Normalize guess
         guess_lower = guess.strip().lower()
 
@@ -382,13 +380,20 @@ class Casino:
                     "Invalid guess. Use 'high', 'low', or a number 1-6.",
                 )
 
-        # Deduct the bet upfront
-        self.economy.deduct_balance(user_id, amount)
+        # Deduct the bet upfront; this fails cleanly if the user can't afford it
+        placed, new_balance = self._place_bet(user_id, amount)
+        if not placed:
+            return self._translate(
+                t,
+                "commands.dice.insufficient_funds",
+                "Insufficient funds. Your current balance is ${current_balance:.2f}.",
+                current_balance=new_balance,
+            )
 
         # Calculate payout
         if win:
             payout = amount * (1 + payout_multiplier)
-            self.economy.add_balance(user_id, payout)
+            new_balance = self.economy.add_balance(user_id, payout)
             result_msg = self._translate(
                 t,
                 "commands.dice.win",
@@ -410,7 +415,7 @@ class Casino:
             roll=roll,
             guess=guess_lower,
             result=result_msg,
-            new_balance=self.economy.get_balance(user_id),
+            new_balance=new_balance,
         )
 
         return rolled_msg
@@ -427,26 +432,24 @@ class Casino:
         if amount <= 0:
             return self._translate(t, "commands.slots.amount_must_be_positive", "Bet must be greater than 0.")
 
-        current_balance = self.economy.get_balance(user_id)
-        if current_balance < amount:
+        # Deduct upfront so payout logic is simple and consistent with dice.
+        placed, new_balance = self._place_bet(user_id, amount)
+        if not placed:
             return self._translate(
                 t,
                 "commands.slots.insufficient_funds",
                 "Insufficient funds. Your current balance is ${current_balance:.2f}.",
-                current_balance=current_balance,
+                current_balance=new_balance,
             )
 
         symbols = ["cherry", "lemon", "bell", "star", "seven"]
         reels = [random.choice(symbols), random.choice(symbols), random.choice(symbols)]
 
-        # Deduct upfront so payout logic is simple and consistent with dice.
-        self.economy.deduct_balance(user_id, amount)
-
         a, b, c = reels
         if a == b == c:
             payout_multiplier = 5.0
             payout = amount * (1 + payout_multiplier)
-            self.economy.add_balance(user_id, payout)
+            new_balance = self.economy.add_balance(user_id, payout)
             result = self._translate(
                 t,
                 "commands.slots.win_three",
@@ -456,7 +459,7 @@ class Casino:
         elif a == b or b == c or a == c:
             payout_multiplier = 1.0
             payout = amount * (1 + payout_multiplier)
-            self.economy.add_balance(user_id, payout)
+            new_balance = self.economy.add_balance(user_id, payout)
             result = self._translate(
                 t,
                 "commands.slots.win_two",
@@ -478,5 +481,5 @@ class Casino:
             "Slots: [{reels}] {result} Balance: ${new_balance:.2f}.",
             reels=reels_text,
             result=result,
-            new_balance=self.economy.get_balance(user_id),
+            new_balance=new_balance,
         )
\ No newline at end of file
@@ -23,35 +23,50 @@ class Economy:
         return result
 
     def add_balance(self, user_id, amount):
-        """Add an amount to the user's balance."""
-        current_balance = self.get_balance(user_id)
-        new_balance = round(current_balance + amount, 2)
-        
+        """Add an amount to the user's balance and return the new balance.
+
+        The increment happens in a single statement, so concurrent updates to
+        the same user cannot overwrite each other.
+        """
         with DatabaseConnection() as cursor:
             cursor.execute("""
                 INSERT INTO user_balances (user_id, balance)
                 VALUES (%s, %s)
-                ON CONFLICT(user_id) DO UPDATE SET balance = EXCLUDED.balance
-            """, (user_id, new_balance))
-        
-        return new_balance
+                ON CONFLICT(user_id) DO UPDATE SET balance = user_balances.balance + EXCLUDED.balance
+                RETURNING balance
+            """, (user_id, round(amount, 2)))
+            result = cursor.fetchone()
+
+        return round(float(result[0]), 2)
 
     def deduct_balance(self, user_id, amount):
-        """Deduct an amount from the user's balance."""
-        current_balance = self.get_balance(user_id)
-        if current_balance < amount:
-            return {"error": "Insufficient funds."}
-        
-        new_balance = round(current_balance - amount, 2)
-        
+        """Deduct an amount from the user's balance if they can afford it.
+
+        Returns the new balance, or ``{"error": ..., "balance": current}`` when
+        the user has insufficient funds. The check and the debit are one
+        conditional UPDATE, so two concurrent debits can never overdraw.
+        """
+        amount = round(amount, 2)
         with DatabaseConnection() as cursor:
+            # Data-modifying CTEs see the pre-update snapshot, so the second
+            # column is the balance before this debit.
             cursor.execute("""
-                UPDATE user_balances
-                SET balance = %s
-                WHERE user_id = %s
-            """, (new_balance, user_id))
-        
-        return new_balance
+                WITH debit AS (
+                    UPDATE user_balances
+                    SET balance = balance - %s
+                    WHERE user_id = %s AND balance >= %s
+                    RETURNING balance
+                )
+                SELECT
+                    (SELECT balance FROM debit),
+                    (SELECT balance FROM user_balances WHERE user_id = %s)
+            """, (amount, user_id, amount, user_id))
+            new_balance, current_balance = cursor.fetchone()
+
+        if new_balance is None:
+            current_balance = round(float(current_balance), 2) if current_balance is not None else 0.0
+            return {"error": "Insufficient funds.", "balance": current_balance}
+        return round(float(new_balance), 2)
 
     def get_top_balances(self, limit=5):
         """Retrieve the top users with the highest balances."""
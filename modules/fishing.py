@@ -2,18 +2,76 @@ import random
 import json
 import os
 import sys
-from thefuzz import process, fuzz
-
+from bisect import bisect_right
+from itertools import accumulate
 from util.database import DatabaseConnection
 from util.config import get_config_path
 from util.module_registry import module_registry
+from util.name_index import NameIndex
 from modules.inventory import Inventory as InventoryModule
 from modules.status_effects import StatusEffects as StatusEffectsModule
 
+RARITIES = ["Common", "Uncommon", "Rare", "Epic", "Legendary", "Mythical"]  # Rarities increasing in value
+_RARITY_INDEX = {rarity: index for index, rarity in enumerate(RARITIES)}
+
+
+class CatchTable:
+    """
+    Precomputed weighted catch table for one minimum rarity.
+
+    Entries are split into groups by which status effects can scale them
+    (legendary rate, item rate), and each group keeps a cumulative weight array.
+    A cast scales whole groups instead of individual entries and then finds the
+    catch with a binary search, so its cost does not grow with the catalog.
+    """
+
+    def __init__(self, entries):
+        groups = {}
+        for item, weight in entries:
+            if weight <= 0:
+                continue
+            key = (item.get("rarity") == "Legendary", item.get("type") == "item")
+            groups.setdefault(key, []).append((item, weight))
+
+        self.groups = tuple(
+            (is_legendary, is_item, tuple(item for item, _ in members), tuple(accumulate(weight for _, weight in members)))
+            for (is_legendary, is_item), members in sorted(groups.items())
+        )
+
+    def scales(self, catch_mult=1.0, legendary_mult=1.0, item_mult=1.0):
+        """Return the weight multiplier of each group for the given effect multipliers."""
+        return tuple(
+            catch_mult * (legendary_mult if is_legendary else 1.0) * (item_mult if is_item else 1.0)
+            for is_legendary, is_item, _, _ in self.groups
+        )
+
+    def total(self, scales):
+        """Total scaled catch weight."""
+        return sum(scale * cumulative[-1] for scale, (_, _, _, cumulative) in zip(scales, self.groups))
+
+    def pick(self, roll, scales):
+        """Return the entry at ``roll`` (0 <= roll < total) or None when the roll lands past every entry."""
+        for scale, (_, _, items, cumulative) in zip(scales, self.groups):
+            if scale <= 0:
+                continue
+            group_total = scale * cumulative[-1]
+            if roll < group_total:
+                index = bisect_right(cumulative, roll / scale)
+                return items[min(index, len(items) - 1)]
+            roll -= group_total
+        return None
+
+
 class Fishing:
     load_after = ["inventory", "economy"]  # Load after the inventory and economy modules
+    MAX_BULK_CASTS = 10  # Upper bound for !cast <n>
     def __init__(self):
         self.fish_data = self.load_fish_data()
+        self.catch_tables = self.build_catch_tables(self.fish_data)
+        self.catalog_index = NameIndex((item["name"], (), item) for item in self.fish_data)
+        self.fish_name_index = NameIndex(
+            (item["name"], (), item["name"]) for item in self.fish_data if item.get("type") == "fish"
+        )
         self.inventory: InventoryModule = module_registry.get_module("inventory")  # Retrieve the Inventory module from the module registry
         self.status_effects: StatusEffectsModule = module_registry.get_module("status_effects")  # Retrieve the StatusEffects module from the module registry
         self.economy = module_registry.get_module("economy")
@@ -47,6 +105,48 @@ class Fishing:
         except FileNotFoundError:
             return []
 
+    @staticmethod
+    def build_catch_tables(fish_data):
+        """
+        Build one CatchTable per minimum rarity.
+
+        Fish below the minimum rarity are excluded; items are always catchable
+        but their catch rate halves for each rarity step below the minimum.
+        """
+        tables = {}
+        for minimum_rarity_index, minimum_rarity in enumerate(RARITIES):
+            entries = []
+            for item in fish_data:
+                if item.get("type") == "item":
+                    item_rarity_index = _RARITY_INDEX.get(item.get("rarity", "Common"), 0)
+                    weight = item["catch_rate"]
+                    if item_rarity_index < minimum_rarity_index:
+                        weight *= 0.5 ** (minimum_rarity_index - item_rarity_index)
+                    entries.append((item, weight))
+                elif _RARITY_INDEX.get(item.get("rarity"), -1) >= minimum_rarity_index:
+                    entries.append((item, item["catch_rate"]))
+            tables[minimum_rarity] = CatchTable(entries)
+        return tables
+
+    @staticmethod
+    def catch_multipliers(effects):
+        """Collapse fishing status effects into (catch, legendary, item, price) multipliers."""
+        catch_mult = legendary_mult = item_mult = price_mult = 1.0
+        for effect in effects:
+            if effect.get("module_id") != "fishing":
+                continue
+            effect_id = effect.get("effect_id") or ""
+            mult = effect.get("mult", 1)
+            if effect_id.startswith("legendary_rate"):
+                legendary_mult *= mult
+            if effect_id.startswith("catch_rate"):
+                catch_mult *= mult
+            if effect_id.startswith("item_rate") or effect_id.startswith("case_rate"):
+                item_mult *= mult
+            if effect_id.startswith("price"):
+                price_mult *= mult
+        return catch_mult, legendary_mult, item_mult, price_mult
+
     def calculate_miss_chance(self, playername):
         """
         Calculate the chance of missing a fish based on the player's stats.
@@ -98,12 +198,8 @@ class Fishing:
                 return attributes["fish_minimum_rarity"]
         return "Common"
     
-    def fish(self, user_id, t=None):
-        """Simulate fishing and store the result in the database or inventory."""
-        if not self.fish_data:
-            return None
-
-        # Check the current number of fish in the user's sack
+    def _count_sack(self, user_id):
+        """Number of fish (including bait) in the user's sack."""
         with DatabaseConnection() as cursor:
             cursor.execute("""
                 SELECT COUNT(*)
@@ -111,127 +207,213 @@ class Fishing:
                 WHERE user_id = %s
             """, (user_id,))
             fish_count = cursor.fetchone()
+        return int(fish_count[0]) if fish_count else 0
+
+    def _sack_full_error(self, sack_size, t=None):
+        return {
+            "type": "error",
+            "message": self._translate(
+                t,
+                "commands.fishing.sack_limit_reached",
+                "Your sack can only hold {sack_size} fish.",
+                sack_size=sack_size,
+            ),
+        }
+
+    def _use_bait(self, user_id, minimum_rarity, miss_chance):
+        """
+        Consume the player's bait, if any, and return the adjusted (minimum_rarity, miss_chance, used_bait).
+        """
+        bait = self.get_bait(user_id)
+        if not bait:
+            return minimum_rarity, miss_chance, False
+
+        # Remove the bait from the sack
+        self.remove_fish_from_sack(user_id, bait["id"])
 
-        # Convert fish_count to an integer
-        fish_count = int(fish_count[0]) if fish_count else 0
+        minimum_rarity, miss_chance = self._bait_odds(bait.get("rarity", "Common"), minimum_rarity, miss_chance)
+        return minimum_rarity, miss_chance, True
+
+    def _use_baits(self, user_id, count):
+        """Consume up to ``count`` of the player's baits in one statement and return their rarities."""
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                DELETE FROM caught_fish
+                WHERE id IN (
+                    SELECT id FROM caught_fish
+                    WHERE user_id = %s AND bait = 1
+                    ORDER BY id
+                    LIMIT %s
+                )
+                RETURNING name
+            """, (user_id, count))
+            rows = cursor.fetchall()
+        rarities = []
+        for (name,) in rows:
+            fish_data = self.catalog_index.get(name)
+            rarities.append(fish_data.get("rarity", "Common") if fish_data else "Common")
+        return rarities
+
+    @staticmethod
+    def _bait_odds(bait_rarity, minimum_rarity, miss_chance):
+        """Return the (minimum_rarity, miss_chance) of a cast made with bait of ``bait_rarity``."""
+        bait_rarity_index = RARITIES.index(bait_rarity)
+        minimum_rarity_index = RARITIES.index(minimum_rarity)
+
+        # If the bait rarity is higher than the minimum rarity, set the minimum rarity to the bait's rarity
+        if bait_rarity_index > minimum_rarity_index:
+            minimum_rarity = bait_rarity
+
+        # Increase the miss chance
+        miss_chance = 0.1 * (bait_rarity_index - minimum_rarity_index) + miss_chance
+        return minimum_rarity, miss_chance
+
+    def _catch_odds(self, minimum_rarity, miss_chance, multipliers):
+        """Return (table, scales, total_catch_rate) for a cast; total_catch_rate includes the miss share."""
+        catch_mult, legendary_mult, item_mult, _ = multipliers
+        table = self.catch_tables[minimum_rarity]
+        scales = table.scales(catch_mult, legendary_mult, item_mult)
+        fish_catch_rate = table.total(scales)  # Calculate the total catch rate for the filtered fish
+        total_catch_rate = fish_catch_rate + (fish_catch_rate * miss_chance)  # Adjust the total catch rate based on miss chance
+        return table, scales, total_catch_rate
+
+    @staticmethod
+    def _roll_fish(item, price_mult):
+        """Roll the weight of a caught fish and return (weight, price)."""
+        weight = round(random.uniform(item["min_weight"], item["max_weight"]), 2)
+        # Price scales with weight, the fish's price multiplier and price status effects
+        price = round(weight * item["price_multiplier"] * price_mult, 2)
+        return weight, price
+
+    def fish(self, user_id, t=None, count=1):
+        """
+        Simulate fishing and store the result in the database or inventory.
+
+        With ``count`` > 1 the casts are rolled together and persisted in bulk;
+        see fish_bulk for the result shape.
+        """
+        if not self.fish_data:
+            return None
+        if count > 1:
+            return self.fish_bulk(user_id, count, t=t)
 
         # Enforce fish limit
         sack_size = self.calculate_sack_size(user_id)  # Get the sack size
-        if sack_size > 0 and fish_count >= sack_size:
-            return {
-                "type": "error",
-                "message": self._translate(
-                    t,
-                    "commands.fishing.sack_limit_reached",
-                    "Your sack can only hold {sack_size} fish.",
-                    sack_size=sack_size,
-                ),
-            }
+        if sack_size > 0 and self._count_sack(user_id) >= sack_size:
+            return self._sack_full_error(sack_size, t=t)
 
         # Randomly select a fish or item based on catch rate
-        rarities = ["Common", "Uncommon", "Rare", "Epic", "Legendary", "Mythical"] # Rarities increasing in value
         minimum_rarity = self.get_minimum_rarity(user_id)  # Get the minimum rarity
         miss_chance = self.calculate_miss_chance(user_id)  # Calculate the miss chance
+        minimum_rarity, miss_chance, _ = self._use_bait(user_id, minimum_rarity, miss_chance)
 
-        # Check if the player has a bait set
-        bait = self.get_bait(user_id)
-        if bait:
-            # Remove the bait from the sack
-            self.remove_fish_from_sack(user_id, bait["id"])
-            # Remove the bait from the database
-            with DatabaseConnection() as cursor:
-                cursor.execute("""
-                    DELETE FROM caught_fish
-                    WHERE id = %s
-                """, (bait["id"],))
+        # Scale the precomputed table for this rarity by the player's status effects
+        multipliers = self.catch_multipliers(self.status_effects.get_effects(user_id))
+        table, scales, total_catch_rate = self._catch_odds(minimum_rarity, miss_chance, multipliers)
+        item = table.pick(random.uniform(0, total_catch_rate), scales)
+        if item is None:
+            return None
 
-            # Check the rarity of the bait
-            bait_rarity = bait.get("rarity", "Common")
-            bait_rarity_index = rarities.index(bait_rarity)
-            minimum_rarity_index = rarities.index(minimum_rarity)
-            
-            # If the bait rarity is higher than the minimum rarity, set the minimum rarity to the bait's rarity
-            if bait_rarity_index > minimum_rarity_index:
-                minimum_rarity = bait_rarity
+        if item["type"] == "fish":
+            weight, price = self._roll_fish(item, multipliers[3])
 
-            # Increase the miss chance
-            miss_chance = 0.1 * (bait_rarity_index - minimum_rarity_index) + miss_chance
-        
-        # get fish around
-        fish_around = []
-        minimum_rarity_index = rarities.index(minimum_rarity)
-        for item in self.fish_data:
-            if item.get("type") == "item":
-                item_copy = item.copy()
-                item_rarity = item_copy.get("rarity", "Common")
-                item_rarity_index = rarities.index(item_rarity) if item_rarity in rarities else 0
-                if item_rarity_index < minimum_rarity_index:
-                    penalty_steps = minimum_rarity_index - item_rarity_index
-                    item_copy["catch_rate"] *= 0.5 ** penalty_steps
-                fish_around.append(item_copy)
-                continue
+            if self.is_autosell_enabled(user_id, item["name"]):
+                new_balance = self.economy.add_balance(user_id, float(price))
+                return {
+                    "name": item["name"],
+                    "type": "autosold_fish",
+                    "weight": weight,
+                    "price": price,
+                    "balance": new_balance
+                }
 
-            if item["rarity"] == minimum_rarity or item["rarity"] in rarities[rarities.index(minimum_rarity):]:
-                fish_around.append(item.copy())
-        
-        # alter catch rate based on status effects
-        effects = self.status_effects.get_effects(user_id)
-        for effect in effects:
-            # legendary_rate effect
-            if effect.get("module_id") == "fishing" and effect.get("effect_id").startswith("legendary_rate"):
-                for item in fish_around:
-                    if item["rarity"] == "Legendary":
-                        item["catch_rate"] *= effect.get("mult", 1)
-            # catch_rate effect
-            if effect.get("module_id") == "fishing" and effect.get("effect_id").startswith("catch_rate"):
-                for item in fish_around:
-                    item["catch_rate"] *= effect.get("mult", 1)
-            # item_rate / case_rate effect
-            if effect.get("module_id") == "fishing" and (
-                effect.get("effect_id").startswith("item_rate") or
-                effect.get("effect_id").startswith("case_rate")
-            ):
-                for item in fish_around:
-                    if item["type"] == "item":
-                        item["catch_rate"] *= effect.get("mult", 1)
-                    
-        
-        fish_catch_rate = sum(item["catch_rate"] for item in fish_around)  # Calculate the total catch rate for the filtered fish
-        total_catch_rate = fish_catch_rate + (fish_catch_rate *  miss_chance)  # Adjust the total catch rate based on miss chance
-        random_roll = random.uniform(0, total_catch_rate)
-        cumulative_rate = 0
-
-        for item in fish_around:
-            cumulative_rate += item["catch_rate"]
-            if random_roll <= cumulative_rate:
-                if item["type"] == "fish":
-                    # Randomize the weight of the fish
-                    weight = round(random.uniform(item["min_weight"], item["max_weight"]), 2)
-                    # Calculate the price based on the weight and price multiplier
-                    price = weight * item["price_multiplier"]
-                    # price status effect
-                    for effect in effects:
-                        if effect.get("module_id") == "fishing" and effect.get("effect_id").startswith("price"):
-                            price *= effect.get("mult", 1)
-                    price = round(price, 2)
-
-                    if self.is_autosell_enabled(user_id, item["name"]):
-                        new_balance = self.economy.add_balance(user_id, float(price))
-                        return {
-                            "name": item["name"],
-                            "type": "autosold_fish",
-                            "weight": weight,
-                            "price": price,
-                            "balance": new_balance
-                        }
-
-                    # Add the fish to the database
-                    self.add_fish_to_db(user_id, item["name"], weight, price)
-                    return {"name": item["name"], "type": "fish", "weight": weight, "price": price}
-                elif item["type"] == "item":
-                    # Add the item to the inventory
-                    self.inventory.add_item(user_id, item["name"], item, 1)
-                    return {"name": item["name"], "type": "item", "message": f"You found a {item['name']}!"}
+            # Add the fish to the database
+            self.add_fish_to_db(user_id, item["name"], weight, price)
+            return {"name": item["name"], "type": "fish", "weight": weight, "price": price}
+        elif item["type"] == "item":
+            # Add the item to the inventory
+            self.inventory.add_item(user_id, item["name"], item, 1)
+            return {"name": item["name"], "type": "item", "message": f"You found a {item['name']}!"}
+
+    def fish_bulk(self, user_id, count, t=None):
+        """
+        Cast up to ``count`` times in one go.
+
+        Player stats, status effects and the autosell list are read once, all
+        rolls are drawn together, and the results are written with one
+        multi-row insert, one balance update and one inventory update per item
+        found. Up to ``count`` baits are used, one per cast from the first, as
+        repeated single casts would. Casting stops early once the sack is full.
+
+        :return: {"type": "bulk", "casts", "fish", "autosold", "autosold_total",
+                  "items", "misses", "sack_full", "balance"} or a sack-full error.
+        """
+        count = max(1, min(int(count), self.MAX_BULK_CASTS))
+
+        sack_size = self.calculate_sack_size(user_id)
+        free_slots = sack_size - self._count_sack(user_id) if sack_size > 0 else None
+        if free_slots is not None and free_slots <= 0:
+            return self._sack_full_error(sack_size, t=t)
+
+        minimum_rarity = self.get_minimum_rarity(user_id)
+        miss_chance = self.calculate_miss_chance(user_id)
+        bait_rarities = self._use_baits(user_id, count)
+        if free_slots is not None:
+            free_slots += len(bait_rarities)  # the baits were taking up slots
+
+        multipliers = self.catch_multipliers(self.status_effects.get_effects(user_id))
+        price_mult = multipliers[3]
+        autosell = {name.lower() for name in self.list_autosell_fish(user_id)}
+        base_odds = self._catch_odds(minimum_rarity, miss_chance, multipliers)
+        bait_odds = {
+            rarity: self._catch_odds(*self._bait_odds(rarity, minimum_rarity, miss_chance), multipliers)
+            for rarity in set(bait_rarities)
+        }
+        rolls = [random.random() for _ in range(count)]
+
+        caught, autosold, items = [], [], {}
+        misses = casts = 0
+        sack_full = False
+        for index, roll in enumerate(rolls):
+            table, scales, total_catch_rate = bait_odds[bait_rarities[index]] if index < len(bait_rarities) else base_odds
+            item = table.pick(roll * total_catch_rate, scales)
+            if item is None:
+                misses += 1
+            elif item["type"] == "fish":
+                autosell_fish = item["name"].lower() in autosell
+                if not autosell_fish and free_slots is not None and free_slots <= 0:
+                    sack_full = True
+                    break
+                weight, price = self._roll_fish(item, price_mult)
+                entry = {"name": item["name"], "weight": weight, "price": price}
+                if autosell_fish:
+                    autosold.append(entry)
+                else:
+                    caught.append(entry)
+                    if free_slots is not None:
+                        free_slots -= 1
+            elif item["type"] == "item":
+                found = items.setdefault(item["name"], {"item": item, "quantity": 0})
+                found["quantity"] += 1
+            casts += 1
+
+        self.add_fish_rows_to_db(user_id, [(fish["name"], fish["weight"], fish["price"]) for fish in caught])
+        for found in items.values():
+            self.inventory.add_item(user_id, found["item"]["name"], found["item"], found["quantity"])
+        autosold_total = round(sum(fish["price"] for fish in autosold), 2)
+        balance = self.economy.add_balance(user_id, autosold_total) if autosold else None
+
+        return {
+            "type": "bulk",
+            "casts": casts,
+            "fish": caught,
+            "autosold": autosold,
+            "autosold_total": autosold_total,
+            "items": [{"name": name, "quantity": found["quantity"]} for name, found in items.items()],
+            "misses": misses,
+            "sack_full": sack_full,
+            "balance": balance,
+        }
 
     def add_fish_to_db(self, user_id, name, weight, price):
         """Add a caught fish to the database."""
@@ -244,28 +426,24 @@ class Fishing:
             """, (user_id, name, weight, price))
         return f"You caught a {name} weighing {weight} lbs worth ${price}!"
 
-    def _get_all_fish_names(self):
-        return [item["name"] for item in self.fish_data if item.get("type") == "fish"]
+    def add_fish_rows_to_db(self, user_id, rows):
+        """Add several caught fish, given as (name, weight, price) tuples, with one INSERT."""
+        if not rows:
+            return
+        placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+        params = [value for name, weight, price in rows for value in (user_id, name, weight, price)]
+        with DatabaseConnection() as cursor:
+            cursor.execute(f"""
+                INSERT INTO caught_fish (user_id, name, weight, price)
+                VALUES {placeholders}
+            """, params)
 
     def resolve_fish_name(self, fish_name):
         """Resolve a fish name to canonical fish data name using exact then fuzzy matching."""
         if not fish_name:
             return None
 
-        fish_name = fish_name.strip()
-        fish_names = self._get_all_fish_names()
-        if not fish_names:
-            return None
-
-        exact = next((name for name in fish_names if name.lower() == fish_name.lower()), None)
-        if exact:
-            return exact
-
-        best_match = process.extractOne(fish_name, fish_names, scorer=fuzz.ratio)
-        if best_match and best_match[1] >= 80:
-            return best_match[0]
-
-        return None
+        return self.fish_name_index.resolve(fish_name, fuzzy_min=80)
 
     def add_autosell_fish(self, user_id, fish_name):
         """Add a fish to a user's autosell list and immediately sell matching fish in sack."""
@@ -350,23 +528,19 @@ class Fishing:
     def sell_matching_fish_in_sack(self, user_id, fish_name):
         """Sell all non-bait fish matching a specific name in the user's sack."""
         with DatabaseConnection() as cursor:
+            # Delete and price in one statement so a fish can't be sold twice
             cursor.execute("""
-                SELECT price
-                FROM caught_fish
+                DELETE FROM caught_fish
                 WHERE user_id = %s AND LOWER(name) = LOWER(%s) AND bait = 0
+                RETURNING price
             """, (user_id, fish_name))
             rows = cursor.fetchall()
 
-            if not rows:
-                return 0, 0.0, self.economy.get_balance(user_id)
-
-            total_earnings = float(sum(float(row[0]) for row in rows))
-            sold_count = len(rows)
+        if not rows:
+            return 0, 0.0, self.economy.get_balance(user_id)
 
-            cursor.execute("""
-                DELETE FROM caught_fish
-                WHERE user_id = %s AND LOWER(name) = LOWER(%s) AND bait = 0
-            """, (user_id, fish_name))
+        total_earnings = float(sum(float(row[0]) for row in rows))
+        sold_count = len(rows)
 
         new_balance = self.economy.add_balance(user_id, total_earnings)
         return sold_count, total_earnings, new_balance
@@ -459,12 +633,12 @@ class Fishing:
         with DatabaseConnection() as cursor:
 
             if name and name.strip().lower() == "all":
-                # Sell all fish in the sack
+                # Sell all fish in the sack, removing them in the same statement
                 cursor.execute("""
-                    SELECT price
-                    FROM caught_fish
+                    DELETE FROM caught_fish
                     WHERE user_id = %s
                     AND bait = 0
+                    RETURNING price
                 """, (user_id,))
                 fish_prices = cursor.fetchall()
 
@@ -477,12 +651,6 @@ class Fishing:
 
                 total_earnings = float(sum(price[0] for price in fish_prices))
 
-                # Remove all fish from the database
-                cursor.execute("""
-                    DELETE FROM caught_fish
-                    WHERE user_id = %s
-                    AND bait = 0
-                """, (user_id,))
                 # Add the earnings to the user's balance
                 new_balance = self.economy.add_balance(user_id, total_earnings)
 
@@ -533,11 +701,19 @@ class Fishing:
 
                 fish_id, name, price = fish
 
-                # Remove the fish from the database
+                # Remove the fish from the database; if a concurrent sell got
+                # there first, don't pay out a second time
                 cursor.execute("""
                     DELETE FROM caught_fish
                     WHERE id = %s
                 """, (fish_id,))
+                if cursor.rowcount == 0:
+                    return self._translate(
+                        t,
+                        "commands.fishing.sell_fish_not_found",
+                        "There were no '{name}' found in your sack.",
+                        name=name,
+                    )
                 # Add the earnings to the user's balance
                 new_balance = self.economy.add_balance(user_id, float(price))
                 
@@ -640,7 +816,7 @@ class Fishing:
             bait = cursor.fetchone()
         if bait:
             # Get the corresponding fish data
-            fish_data = next((fish for fish in self.fish_data if fish["name"].lower() == bait[1].lower()), None)
+            fish_data = self.catalog_index.get(bait[1])
             if fish_data:
                 return {
                     "id": bait[0],
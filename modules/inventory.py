@@ -6,12 +6,14 @@ import logging
 import time
 from thefuzz import process, fuzz
 
-from util.cs2_case_api import CS2CaseAPIError, CS2CaseClient
+from util.catalog_warmup import catalog_warmer
+from util.cs2_case_api import CS2CaseAPIError, get_cs2_case_client
 from util.database import DatabaseConnection
 from util.config import get_config_path
 from util.mtg_tcg_api import MTGTCGAPIError, MTGTCGClient
 from util.pokemon_tcg_api import PokemonTCGAPIError, PokemonTCGClient
 from util.module_registry import module_registry
+from util.name_index import NameIndex
 from modules.economy import Economy
 
 class Inventory:
@@ -26,29 +28,34 @@ class Inventory:
                 self.cases = json.load(file)
         except Exception as e:
             raise Exception(f"Error loading cases: {e}")
+        self.case_index = NameIndex(
+            ((case.get("name"), case.get("aliases", []), case) for case in self.cases),
+            fuzzy_aliases=True,
+        )
         self.economy: Economy = module_registry.get_module("economy")
         self.pokemon_tcg = PokemonTCGClient(api_key=os.getenv("POKEMONTCG_API_KEY"))
         self.mtg_tcg = MTGTCGClient()
-        self.cs2_case_api = CS2CaseClient()
+        self.cs2_case_api = get_cs2_case_client()
         self._ensure_pokedex_table()
         self._ensure_mtg_collection_table()
 
-        # Warm Pokemon set cache on startup so @open is usually instant.
+        # Warm catalog caches in the background so startup doesn't wait on the
+        # network and @open is usually instant once warming finishes.
         pokemon_set_ids = [
-            case.get("set_id")
+            case.get("set_id").strip()
             for case in self.cases
-            if case.get("source") == "pokemon_tcg_api" and case.get("set_id")
+            if case.get("source") == "pokemon_tcg_api" and (case.get("set_id") or "").strip()
         ]
         if pokemon_set_ids:
-            self.pokemon_tcg.prewarm_sets(pokemon_set_ids)
+            catalog_warmer.warm("pokemon", pokemon_set_ids, self.pokemon_tcg.prewarm_set)
 
         mtg_set_codes = [
-            case.get("set_code")
+            case.get("set_code").strip()
             for case in self.cases
-            if case.get("source") == "mtg_tcg_api" and case.get("set_code")
+            if case.get("source") == "mtg_tcg_api" and (case.get("set_code") or "").strip()
         ]
         if mtg_set_codes:
-            self.mtg_tcg.prewarm_sets(mtg_set_codes)
+            catalog_warmer.warm("mtg", mtg_set_codes, self.mtg_tcg.prewarm_set)
 
         cs2_case_names = [
             case.get("api_case_name", case.get("name"))
@@ -56,7 +63,21 @@ class Inventory:
             if case.get("source") == "cs2_case_api"
         ]
         if cs2_case_names:
-            self.cs2_case_api.prewarm_cases(cs2_case_names)
+            catalog_warmer.warm("cs2_cases", cs2_case_names, self.cs2_case_api.prewarm_case)
+
+    def _catalog_warming(self, case) -> bool:
+        """True if this case's catalog isn't cached yet and is still being warmed in the background."""
+        source = case.get("source")
+        if source == "pokemon_tcg_api":
+            set_id = (case.get("set_id") or "").strip()
+            return catalog_warmer.is_warming("pokemon", set_id) and not self.pokemon_tcg.is_set_cached(set_id)
+        if source == "mtg_tcg_api":
+            set_code = (case.get("set_code") or "").strip()
+            return catalog_warmer.is_warming("mtg", set_code) and not self.mtg_tcg.is_set_cached(set_code)
+        if source == "cs2_case_api":
+            api_case_name = case.get("api_case_name", case.get("name"))
+            return catalog_warmer.is_warming("cs2_cases", api_case_name) and not self.cs2_case_api.has_crates()
+        return False
 
     def _ensure_pokedex_table(self):
         """Ensure pokedex discovery table exists."""
@@ -292,15 +313,6 @@ class Inventory:
 
     def open_case(self, user_id, case_name, t=None):
         """Open a case and add a random item to the user's inventory."""
-        valid_cases = [case["name"] for case in self.cases]
-        valid_case_lookup = {name.lower(): name for name in valid_cases}
-        alias_lookup = {}
-        for case in self.cases:
-            canonical_name = case.get("name")
-            for alias in case.get("aliases", []):
-                if isinstance(alias, str) and alias.strip():
-                    alias_lookup[alias.strip().lower()] = canonical_name
-
         if case_name:
             user_inv = self.list_inventory(user_id)
             if not user_inv:
@@ -311,40 +323,8 @@ class Inventory:
                 )
 
             requested_name = case_name.strip()
-            normalized_requested = requested_name.lower()
-            canonical_case_name = valid_case_lookup.get(normalized_requested)
-
-            if not canonical_case_name:
-                canonical_case_name = alias_lookup.get(normalized_requested)
-
-            if not canonical_case_name:
-                partial_match = next(
-                    (
-                        name
-                        for name in valid_cases
-                        if normalized_requested in name.lower()
-                    ),
-                    None,
-                )
-                canonical_case_name = partial_match
-
-            if not canonical_case_name and alias_lookup:
-                partial_alias_match = next(
-                    (
-                        alias_lookup[alias]
-                        for alias in alias_lookup
-                        if normalized_requested in alias
-                    ),
-                    None,
-                )
-                canonical_case_name = partial_alias_match
-
-            if not canonical_case_name:
-                candidates = list(valid_case_lookup.keys()) + list(alias_lookup.keys())
-                best_match = process.extractOne(normalized_requested, candidates, scorer=fuzz.ratio)
-                if best_match and best_match[1] >= 75:
-                    matched_key = best_match[0]
-                    canonical_case_name = valid_case_lookup.get(matched_key) or alias_lookup.get(matched_key)
+            case = self.case_index.resolve(requested_name, substring=True, fuzzy_min=75)
+            canonical_case_name = case["name"] if case else None
 
             # check if has case
             if not canonical_case_name:
@@ -364,8 +344,12 @@ class Inventory:
                 )
             
             # open the case
-            # get first case whose ["name"] matches case_name
-            case = next((case for case in self.cases if case["name"] == canonical_case_name), None)
+            if self._catalog_warming(case):
+                return self._translate(
+                    t,
+                    "commands.inventory.open.catalog_warming",
+                    "That pack is still being stocked. Try opening it again in a moment.",
+                )
 
             if case and case.get("source") == "cs2_case_api":
                 pull_start = time.time()
@@ -578,7 +562,7 @@ class Inventory:
                 )
             
             # Find the first openable case/pack from inventory.
-            case_name = next((item['name'] for item in user_inv if item['name'] in valid_cases), None)
+            case_name = next((item['name'] for item in user_inv if self.case_index.get(item['name'])), None)
 
             if not case_name:
                 return None
@@ -2,11 +2,13 @@ import os
 import json
 import sys
 import logging
-from thefuzz import process, fuzz
 
-from util.cs2_case_api import CS2CaseClient
+from util.catalog_warmup import catalog_warmer
+from util.cs2_case_api import get_cs2_case_client
 from util.config import get_config_path
+from util.database import atomic
 from util.module_registry import module_registry
+from util.name_index import NameIndex
 from modules.economy import Economy
 from modules.inventory import Inventory
 
@@ -24,34 +26,41 @@ class Shop:
             raise Exception(f"Error loading shop: {e}")
         self.economy: Economy = module_registry.get_module("economy")
         self.inventory: Inventory = module_registry.get_module("inventory")
-        self.cs2_case_api = CS2CaseClient()
+        self.cs2_case_api = get_cs2_case_client()
 
         self._refresh_case_prices_on_startup()
         self.load_shop_categories()
 
     def _refresh_case_prices_on_startup(self):
-        """Refresh buy prices for CS2 cases from Steam market data at launch."""
+        """Refresh buy prices for CS2 cases from Steam market data in the background."""
         cases = self.shop.get("Cases")
         if not isinstance(cases, list) or not cases:
             return
 
-        refreshed = 0
+        market_names = []
         for case in cases:
             if not isinstance(case, dict):
                 continue
             market_name = case.get("market_hash_name") or case.get("api_case_name") or case.get("name")
-            if not isinstance(market_name, str) or not market_name.strip():
-                continue
+            if isinstance(market_name, str) and market_name.strip():
+                market_names.append(market_name.strip())
 
-            price = self.cs2_case_api.get_case_price(market_name.strip())
-            if price is None:
-                continue
+        if market_names:
+            catalog_warmer.warm("shop_case_prices", market_names, self._refresh_case_price)
 
-            case["price"] = round(float(price), 2)
-            refreshed += 1
+    def _refresh_case_price(self, market_name):
+        """Update the buy price of every shop case listed under ``market_name``."""
+        price = self.cs2_case_api.get_case_price(market_name)
+        if price is None:
+            return
 
-        if refreshed:
-            self.logger.info("Shop case prices refreshed from Steam count=%s", refreshed)
+        for case in self.shop.get("Cases", []):
+            if not isinstance(case, dict):
+                continue
+            name = case.get("market_hash_name") or case.get("api_case_name") or case.get("name")
+            if isinstance(name, str) and name.strip() == market_name:
+                case["price"] = round(float(price), 2)
+        self.logger.info("Shop case price refreshed from Steam case=%s price=%.2f", market_name, price)
 
     def _translate(self, t, key, default_text, **kwargs):
         if callable(t):
@@ -60,17 +69,10 @@ class Shop:
                 return translated
         return default_text.format(**kwargs)
 
-    def find_category(self, item_name, categories):
-        """Find the category of an item by its name."""
-        for category, items in categories.items():
-            for item in items:
-                if item["name"].lower() == item_name.lower() or item_name.lower() in [alias.lower() for alias in item.get("aliases", [])]:
-                    return category
-                best_match, score = process.extractOne(item_name.lower(), [i["name"].lower() for i in items], scorer=fuzz.ratio)
-                if best_match and score >= 80:
-                    return category
-
-        return None
+    def find_category(self, item_name):
+        """Find the category of an item by its name or aliases, falling back to a fuzzy match."""
+        match = self.item_index.resolve(item_name, fuzzy_min=80)
+        return match[0] if match else None
 
     def find_item(self, item_name, allowed_items):
         """
@@ -80,17 +82,9 @@ class Shop:
         :param allowed_items: The list of allowed shop items.
         :return: The item if found, otherwise None.
         """
-        for item in allowed_items["items"]:
-            if item["name"].lower() == item_name or item_name in [alias.lower() for alias in item.get("aliases", [])]:
-                return item
-        
-        best_match, score = process.extractOne(item_name, [item["name"].lower() for item in allowed_items["items"]], scorer=fuzz.ratio)
-        if best_match and score >= 60:
-            for item in allowed_items["items"]:
-                if item["name"].lower() == best_match:
-                    return item
-
-        return None
+        allowed_ids = {id(item) for item in allowed_items["items"]}
+        match = self.item_index.resolve(item_name, fuzzy_min=60, accept=lambda entry: id(entry[1]) in allowed_ids)
+        return match[1] if match else None
 
     def buy(self, playername, item_name, quantity=1, t=None):
         """
@@ -110,7 +104,7 @@ class Shop:
         item_name = item_name.lower()
 
         # Check if the item is in the player's shop
-        category = self.find_category(item_name, self.categories)
+        category = self.find_category(item_name)
         if category is None:
             return {"error": self._translate(t, "commands.shop.item_not_found", "The shopkeeper sighs and says: 'I don't have that item.'")}
 
@@ -138,38 +132,27 @@ class Shop:
                     )
                 }
 
-        # Check if the player has enough money
-        player_money = self.economy.get_balance(playername)
-        if player_money < trying_to_buy["price"] * quantity:
-            return {
-                "error": self._translate(
-                    t,
-                    "commands.shop.insufficient_funds",
-                    "The shopkeeper says: 'Isn't that too rich for your blood?'",
-                )
-            }
-
-        # Add the item to the player's inventory
+        # Charge the player and hand over the item in one savepoint: if any step
+        # fails, the debit is rolled back together with the rest of the purchase.
         try:
-            self.economy.deduct_balance(playername, trying_to_buy["price"] * quantity)
-            money_left = self.economy.get_balance(playername)
-            self.inventory.add_item(playername, trying_to_buy["name"], trying_to_buy, quantity)
-            if trying_to_buy.get("replaces") is not None:
-                # Remove the replaced item from the inventory
-                if isinstance(trying_to_buy["replaces"], str):
-                    trying_to_buy["replaces"] = [trying_to_buy["replaces"]]
-                for replace in trying_to_buy["replaces"]:
-                    self.inventory.remove_item(playername, replace, quantity)
-            return {
-                "success": self._translate(
-                    t,
-                    "commands.shop.purchase_success",
-                    "You bought {quantity} x '{item_name}'. Your new balance is ${money_left}.",
-                    quantity=quantity,
-                    item_name=trying_to_buy['name'],
-                    money_left=money_left,
-                )
-            }
+            with atomic():
+                money_left = self.economy.deduct_balance(playername, trying_to_buy["price"] * quantity)
+                if isinstance(money_left, dict):
+                    return {
+                        "error": self._translate(
+                            t,
+                            "commands.shop.insufficient_funds",
+                            "The shopkeeper says: 'Isn't that too rich for your blood?'",
+                        )
+                    }
+
+                self.inventory.add_item(playername, trying_to_buy["name"], trying_to_buy, quantity)
+                if trying_to_buy.get("replaces") is not None:
+                    # Remove the replaced item from the inventory
+                    if isinstance(trying_to_buy["replaces"], str):
+                        trying_to_buy["replaces"] = [trying_to_buy["replaces"]]
+                    for replace in trying_to_buy["replaces"]:
+                        self.inventory.remove_item(playername, replace, quantity)
         except Exception as e:
             return {
                 "error": self._translate(
@@ -179,14 +162,28 @@ class Shop:
                     error=e,
                 )
             }
-                
-        
+
+        return {
+            "success": self._translate(
+                t,
+                "commands.shop.purchase_success",
+                "You bought {quantity} x '{item_name}'. Your new balance is ${money_left}.",
+                quantity=quantity,
+                item_name=trying_to_buy['name'],
+                money_left=money_left,
+            )
+        }
 
     def load_shop_categories(self):
         """Load shop categories and items from the JSON file."""
         self.categories = {}
         for category, items in self.shop.items():
             self.categories[category] = items
+        self.item_index = NameIndex(
+            (item["name"], item.get("aliases", []), (category, item))
+            for category, items in self.categories.items()
+            for item in items
+        )
 
     def get_categories(self):
         """Get the available categories in the shop."""
@@ -1,16 +1,43 @@
+import heapq
 import json
+import logging
 import os
 import sys
-from copy import deepcopy
-from time import time
+import threading
+from time import monotonic, time
 
-from util.database import DatabaseConnection
+from util.database import DatabaseConnection, after_rollback
 from util.config import get_config_path
 from util.module_registry import module_registry
 
+logger = logging.getLogger(__name__)
+
 class StatusEffects:
-    def __init__(self):
+    """
+    Status effects with an in-memory cache of each user's active effects.
+
+    A user's effects are loaded from the database on first use and then served
+    from memory, with add/remove writing through (and dropping the user's entry
+    again if the enclosing unit of work rolls back). Expiry is tracked in a min-heap
+    so expired effects drop out of the cache lazily, and a background sweeper
+    deletes expired rows in bulk. Cached users are reloaded after ``cache_ttl``
+    seconds so changes made outside this module are picked up.
+    """
+
+    cache_ttl = 60  # Seconds before a user's cached effects are re-read from the database
+    sweep_interval = 300  # Seconds between bulk deletes of expired rows
+
+    def __init__(self, start_sweeper=True):
         self.status_effect_data: dict = self.load_status_effects()
+        self._lock = threading.Lock()
+        self._active = {}  # user_id -> {effect_name: expires_at}
+        self._loaded_at = {}  # user_id -> monotonic load time
+        self._expirations = []  # heap of (expires_at, user_id, effect_name)
+        self._stop_event = threading.Event()
+        self._sweeper_thread = None
+        if start_sweeper:
+            self._sweeper_thread = threading.Thread(target=self._sweeper_worker, name="status-effects-sweeper", daemon=True)
+            self._sweeper_thread.start()
 
     def load_status_effects(self):
         """Load status effects data from the configuration file."""
@@ -33,7 +60,8 @@ class StatusEffects:
         if module_id in self.status_effect_data.keys():
             module_to_search = self.status_effect_data[module_id]
             if effect_id in module_to_search.keys():
-                found_effect = deepcopy(module_to_search[effect_id])
+                # Effect definitions are flat, so a shallow copy keeps callers from mutating them
+                found_effect = dict(module_to_search[effect_id])
                 found_effect["module_id"] = module_id
                 found_effect["effect_id"] = effect_id
                 return found_effect
@@ -56,12 +84,12 @@ class StatusEffects:
             if existing_effect:
                 duration = existing_effect["duration"]
                 # add the duration to the existing effect
-                new_expires_at = int(time()) + duration + effect_data["duration"]
+                expires_at = int(time()) + duration + effect_data["duration"]
                 cursor.execute("""
                     UPDATE status_effects
                     SET expiration_time = %s
                     WHERE user_id = %s AND effect_name = %s
-                """, (new_expires_at, playername, effect_name))
+                """, (expires_at, playername, effect_name))
             else:
                 # add a new effect
                 expires_at = int(time()) + effect_data["duration"]
@@ -71,38 +99,76 @@ class StatusEffects:
                     ON CONFLICT (user_id, effect_name) DO UPDATE SET expiration_time = EXCLUDED.expiration_time
                 """, (playername, effect_name, expires_at))
 
+        with self._lock:
+            active = self._active.get(playername)
+            if active is not None:
+                active[effect_name] = expires_at
+                heapq.heappush(self._expirations, (expires_at, playername, effect_name))
+        after_rollback(lambda: self.invalidate(playername))
+
         return True
     
     def get_effects(self, playername):
         """Get all active status effects for a user."""
-        with DatabaseConnection() as cursor:
-            cursor.execute("""
-                SELECT effect_name, expiration_time FROM status_effects
-                WHERE user_id = %s
-            """, (playername,))
-            effects = cursor.fetchall()
-
-        active_effect_names = []
-        for effect_id, expires_at in effects:
-            if expires_at > int(time()):
-                active_effect_names.append((effect_id, expires_at))
-            else:
-                # Remove expired effect
-                self.remove_effect(playername, effect_id)
+        now = int(time())
+        active = self._get_active(playername, now)
 
         active_effects = []
-        for (effect_name, expires_at) in active_effect_names:
+        for effect_name, expires_at in active.items():
             if "." not in effect_name:
                 continue
             effect = self.find_effect(*effect_name.split(".", 1))
             if effect is None:
                 continue
-            effect["duration"] = expires_at - int(time())
+            effect["duration"] = expires_at - now
             active_effects.append(effect)
 
         return active_effects
 
-    
+    def _get_active(self, playername, now):
+        """Return a snapshot of {effect_name: expires_at} for the user, loading it if needed."""
+        with self._lock:
+            self._expire(now)
+            loaded_at = self._loaded_at.get(playername)
+            if loaded_at is not None and monotonic() - loaded_at < self.cache_ttl:
+                return dict(self._active[playername])
+
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                SELECT effect_name, expiration_time FROM status_effects
+                WHERE user_id = %s AND expiration_time > %s
+            """, (playername, now))
+            rows = cursor.fetchall()
+
+        active = {effect_name: int(expires_at) for effect_name, expires_at in rows}
+        with self._lock:
+            self._active[playername] = active
+            self._loaded_at[playername] = monotonic()
+            for effect_name, expires_at in active.items():
+                heapq.heappush(self._expirations, (expires_at, playername, effect_name))
+            return dict(active)
+
+    def _expire(self, now):
+        """Drop cached effects whose expiration has passed. Caller holds the lock."""
+        heap = self._expirations
+        while heap and heap[0][0] <= now:
+            expires_at, playername, effect_name = heapq.heappop(heap)
+            active = self._active.get(playername)
+            # Entries for extended or reloaded effects are stale; only drop exact matches
+            if active is not None and active.get(effect_name) == expires_at:
+                del active[effect_name]
+
+    def invalidate(self, playername=None):
+        """Forget cached effects for one user (or everyone) so they are re-read on next use."""
+        with self._lock:
+            if playername is None:
+                self._active.clear()
+                self._loaded_at.clear()
+                self._expirations.clear()
+            else:
+                self._active.pop(playername, None)
+                self._loaded_at.pop(playername, None)
+
     def remove_effect(self, playername, effect_id):
         """Remove a status effect from the user."""
         with DatabaseConnection() as cursor:
@@ -111,8 +177,48 @@ class StatusEffects:
                 WHERE user_id = %s AND effect_name = %s
             """, (playername, effect_id))
 
+        with self._lock:
+            active = self._active.get(playername)
+            if active is not None:
+                active.pop(effect_id, None)
+        after_rollback(lambda: self.invalidate(playername))
+
         return True
 
+    def sweep_expired(self):
+        """Delete every expired effect row in one statement and trim idle cache entries."""
+        with DatabaseConnection() as cursor:
+            cursor.execute("""
+                DELETE FROM status_effects
+                WHERE expiration_time <= %s
+            """, (int(time()),))
+            removed = cursor.rowcount
+
+        with self._lock:
+            self._expire(int(time()))
+            cutoff = monotonic() - self.cache_ttl
+            for playername in [user for user, loaded_at in self._loaded_at.items() if loaded_at < cutoff]:
+                self._active.pop(playername, None)
+                self._loaded_at.pop(playername, None)
+            live = {(user, name, expires_at) for user, effects in self._active.items() for name, expires_at in effects.items()}
+            self._expirations = [entry for entry in self._expirations if (entry[1], entry[2], entry[0]) in live]
+            heapq.heapify(self._expirations)
+
+        return removed
+
+    def _sweeper_worker(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                removed = self.sweep_expired()
+                if removed:
+                    logger.debug(f"Swept {removed} expired status effects")
+            except Exception as e:
+                logger.warning(f"Status effect sweep failed: {e}")
+
+    def stop(self):
+        """Stop the background sweeper."""
+        self._stop_event.set()
+
     def get_description(self, effect_name):
         """Get the description of a status effect."""
         effect_name = effect_name.strip().lower()
@@ -1,12 +1,24 @@
+import argparse
 import json
 import re
+import sys
+import time
+import tracemalloc
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 STRINGS_DIR = ROOT / "strings"
 REPORT_PATH = ROOT / "localization_benchmark_report.json"
+RUNTIME_REPORT_PATH = ROOT / "localization_runtime_report.json"
 BASE_LOCALE = "en_US"
 
+# Lookups timed in runtime mode: a key every locale has, a locale that falls
+# back to the base locale, and a key nobody has.
+HIT_KEY = "commands.fishing.cast_success_fish"
+HIT_KWARGS = {"player": "alice", "name": "Salmon", "weight": 2.5, "price": 12.0}
+FALLBACK_LOCALE = "xx_XX"
+MISS_KEY = "benchmark.missing.key"
+
 
 def flatten(data, prefix=""):
     items = {}
@@ -127,6 +139,120 @@ def print_summary(report):
     print(f"Report written to: {REPORT_PATH}")
 
 
+def _time_calls(func, iterations):
+    """Time ``func`` and measure the memory it allocates per call."""
+    func()  # warm up caches outside the measurement
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - started
+
+    traced_calls = min(iterations, 1000)
+    transient_bytes = 0
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(traced_calls):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        transient_bytes += tracemalloc.get_traced_memory()[1] - current
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    return {
+        "calls_per_second": round(iterations / elapsed, 1) if elapsed else None,
+        "microseconds_per_call": round(elapsed / iterations * 1e6, 3),
+        "peak_bytes_per_call": round(transient_bytes / traced_calls, 1),
+        "retained_blocks_per_call": round(retained / traced_calls, 3),
+    }
+
+
+def build_runtime_report(iterations=20000):
+    sys.path.insert(0, str(ROOT))
+    import logging
+
+    from util.commands import CommandRegistry
+    from util.localization import LocalizationManager
+
+    # Miss-path warnings would otherwise dominate the output.
+    logging.getLogger("util.localization").setLevel(logging.ERROR)
+
+    locales = [path.stem for path in sorted(STRINGS_DIR.glob("*.json"))]
+
+    cold_loads = {}
+    for locale in locales:
+        started = time.perf_counter()
+        manager = LocalizationManager(str(STRINGS_DIR), BASE_LOCALE)
+        base_done = time.perf_counter()
+        manager.get_string(HIT_KEY, language=locale)
+        finished = time.perf_counter()
+        cold_loads[locale] = {
+            "file_bytes": (STRINGS_DIR / f"{locale}.json").stat().st_size,
+            "base_load_ms": round((base_done - started) * 1000, 3),
+            "locale_load_ms": round((finished - base_done) * 1000, 3),
+        }
+
+    manager = LocalizationManager(str(STRINGS_DIR), BASE_LOCALE)
+    lookups = {
+        "get_string_hit": _time_calls(lambda: manager.get_string(HIT_KEY, language="pt_BR", **HIT_KWARGS), iterations),
+        "get_string_fallback": _time_calls(
+            lambda: manager.get_string(HIT_KEY, language=FALLBACK_LOCALE, **HIT_KWARGS), iterations
+        ),
+        "get_string_miss": _time_calls(lambda: manager.get_string(MISS_KEY, language="pt_BR"), iterations),
+        "get_value_hit": _time_calls(lambda: manager.get_value("command_aliases", language="pt_BR"), iterations),
+        "get_value_fallback": _time_calls(
+            lambda: manager.get_value("command_aliases", language=FALLBACK_LOCALE), iterations
+        ),
+        "get_value_miss": _time_calls(lambda: manager.get_value(MISS_KEY, language="pt_BR"), iterations),
+    }
+
+    registry = CommandRegistry()
+    bot = type("BenchmarkBot", (), {"_localization": manager})()
+
+    def build_alias_maps():
+        registry._localized_alias_cache.clear()
+        for locale in locales:
+            registry._get_localized_alias_map(locale, bot)
+
+    alias_iterations = max(1, iterations // 100)
+    alias_map = _time_calls(build_alias_maps, alias_iterations)
+    alias_map["locales"] = len(locales)
+
+    report = {
+        "python": sys.version.split()[0],
+        "iterations": iterations,
+        "cold_load": cold_loads,
+        "lookups": lookups,
+        "alias_map_build_all_locales": alias_map,
+    }
+    RUNTIME_REPORT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
+
+
+def print_runtime_summary(report):
+    total_load = sum(entry["locale_load_ms"] for entry in report["cold_load"].values())
+    slowest = max(report["cold_load"].items(), key=lambda item: item[1]["locale_load_ms"])
+    print(f"Cold load: {total_load:.1f} ms for {len(report['cold_load'])} locales (slowest {slowest[0]}: {slowest[1]['locale_load_ms']:.1f} ms)")
+    for name, data in report["lookups"].items():
+        print(
+            f"{name}: {data['microseconds_per_call']:.3f} us/call, "
+            f"{data['peak_bytes_per_call']:.0f} peak bytes/call, "
+            f"{data['retained_blocks_per_call']:.2f} retained blocks/call"
+        )
+    alias = report["alias_map_build_all_locales"]
+    print(f"Alias maps ({alias['locales']} locales): {alias['microseconds_per_call'] / 1000:.3f} ms per rebuild")
+    print(f"Report written to: {RUNTIME_REPORT_PATH}")
+
+
 if __name__ == "__main__":
-    report_data = build_report()
-    print_summary(report_data)
+    parser = argparse.ArgumentParser(description="Localization coverage and runtime benchmarks.")
+    parser.add_argument("--runtime", action="store_true", help="measure load time and lookup cost instead of coverage")
+    parser.add_argument("--iterations", type=int, default=20000, help="lookups per runtime measurement")
+    args = parser.parse_args()
+
+    if args.runtime:
+        print_runtime_summary(build_runtime_report(args.iterations))
+    else:
+        report_data = build_report()
+        print_summary(report_data)
@@ -0,0 +1,126 @@
+"""ASGI front end for the bot server.
+
+Exposes the same ``/process_message``, ``/process_messages``, ``/health`` and ``/metrics``
+contract as the Flask app (including optional msgpack bodies), but dispatches through ``BotServer.handle_request_async``
+so blocking commands run on bounded thread pools and async commands run on the
+event loop.
+"""
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from util.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from util.wire_format import accepts_msgpack, decode_body, encode_body
+
+
+class AsgiApp:
+    """Minimal ASGI application wrapping a BotServer instance."""
+
+    def __init__(self, bot_server) -> None:
+        self.bot_server = bot_server
+        self.logger = logging.getLogger(__name__)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        if scope.get("path") == "/metrics" and scope.get("method", "GET").upper() == "GET":
+            body = metrics_registry.render().encode("utf-8")
+            await self._send_body(send, body, METRICS_CONTENT_TYPE, 200)
+            return
+
+        payload, status = await self._route(scope, receive)
+        await self._send_payload(send, payload, status, accepts_msgpack(self._header(scope, b"accept")))
+
+    async def _route(self, scope, receive) -> Tuple[Dict[str, Any], int]:
+        path = scope.get("path", "")
+        method = scope.get("method", "GET").upper()
+
+        if path == "/health":
+            if method != "GET":
+                return {"error": "Method not allowed"}, 405
+            return self.bot_server.health(), 200
+
+        if path == "/process_message":
+            if method != "POST":
+                return {"error": "Method not allowed"}, 405
+            try:
+                data = decode_body(await self._read_body(receive), self._header(scope, b"content-type"))
+                return await self.bot_server.handle_request_async(data)
+            except Exception as e:
+                self.logger.error(f"Error processing message: {e}")
+                return {"error": str(e)}, 500
+
+        if path == "/process_messages":
+            if method != "POST":
+                return {"error": "Method not allowed"}, 405
+            try:
+                data = decode_body(await self._read_body(receive), self._header(scope, b"content-type"))
+                return await self.bot_server.handle_batch_request_async(data)
+            except Exception as e:
+                self.logger.error(f"Error processing message batch: {e}")
+                return {"error": str(e)}, 500
+
+        return {"error": "Not found"}, 404
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.bot_server.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _header(scope, name: bytes) -> Optional[str]:
+        for key, value in scope.get("headers") or ():
+            if key.lower() == name:
+                return value.decode("latin-1")
+        return None
+
+    @classmethod
+    async def _send_payload(cls, send, payload: Dict[str, Any], status: int, use_msgpack: bool = False) -> None:
+        body, content_type = encode_body(payload, use_msgpack=use_msgpack)
+        await cls._send_body(send, body, content_type, status)
+
+    @staticmethod
+    async def _send_body(send, body: bytes, content_type: str, status: int) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", content_type.encode("ascii")),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_asgi_app(bot_server) -> AsgiApp:
+    """Create the ASGI application for a BotServer instance."""
+    return AsgiApp(bot_server)
+
+
+def run_asgi_server(bot_server, host='127.0.0.1', port=8080):
+    """Serve the bot with uvicorn (optional dependency, ``pip install uvicorn``)."""
+    try:
+        import uvicorn
+    except ImportError as e:
+        raise RuntimeError("ASGI mode requires uvicorn; install it with 'pip install uvicorn'.") from e
+
+    bot_server.logger.info(f"Starting bot server (ASGI) on {host}:{port} (language: per-request, default: en_US)")
+    uvicorn.run(create_asgi_app(bot_server), host=host, port=port, log_level="info")
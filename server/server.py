@@ -1,20 +1,51 @@
 import os
 import sys
+import time
+import asyncio
+import inspect
 import logging
+import functools
 import threading
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from contextvars import ContextVar
-from flask import Flask, request, jsonify
-from typing import Deque, Dict, List
+from flask import Flask, Response, request, jsonify
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from util.catalog_warmup import catalog_warmer
 from util.config import load_config, copy_files_to_appdata
+from util.cs2_case_api import close_cs2_case_client
 from util.commands import command_registry
 from util.module_registry import module_registry
-from util.database import initialize_pool, close_pool
+from util.database import initialize_pool, close_pool, get_pool_stats, unit_of_work
 from util.localization import initialize_localization, get_localization_manager
+from util.log_pipeline import LogPipeline
+from util.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from util.wire_format import accepts_msgpack, decode_body, encode_body, is_msgpack
+
+
+_messages = metrics_registry.counter(
+    "bot_messages_total", "Chat messages received, by platform and session.", ("platform", "session")
+)
+_request_seconds = metrics_registry.histogram(
+    "bot_request_duration_seconds", "Time to process one chat message end to end.", ("platform",)
+)
+_command_seconds = metrics_registry.histogram(
+    "bot_command_duration_seconds", "Command execution time, by command.", ("command",)
+)
+_command_errors = metrics_registry.counter("bot_command_errors_total", "Commands that raised, by command.", ("command",))
+_module_seconds = metrics_registry.histogram(
+    "bot_module_duration_seconds", "Time spent in input-reading modules, by module.", ("module",)
+)
+_module_errors = metrics_registry.counter("bot_module_errors_total", "Input-reading modules that raised.", ("module",))
+_spam_cooldowns = metrics_registry.counter("bot_antispam_cooldowns_total", "Anti-spam cooldowns started.")
+_spam_blocked = metrics_registry.counter(
+    "bot_antispam_blocked_total", "Commands rejected because the player is in an anti-spam cooldown."
+)
 
 
 def resource_path(relative_path):
@@ -53,44 +84,50 @@ class BotServer:
     
     def __init__(self):
         """Initialize the bot server."""
-        # Set up logging
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
-        
-        # File handler for logging to a file
-        file_handler = logging.FileHandler("bot_server.log")
-        file_handler.setLevel(logging.INFO)
-        file_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        file_handler.setFormatter(file_formatter)
-        
-        # Stream handler for logging to the console
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        console_handler.setFormatter(console_formatter)
-        
-        # Add both handlers to the logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-        
         # Load configuration
         self.config = load_config()
         self.prefixes = self._parse_prefixes(self.config.get("command_prefix", "@"))
         
         # Initialize localization with default English
         self._localization = initialize_localization(strings_dir=resource_path("strings"), default_language="en_US")
-        self.language = "en_US"  # Default language, will be overridden per-request
         self._request_language = ContextVar("request_language", default="en_US")
         self._request_session = ContextVar("request_session", default="default")
+        self._request_platform = ContextVar("request_platform", default="unknown")
+        # Responses collected for the current request; each request gets its own list.
+        self._request_responses: ContextVar[Optional[List[Dict]]] = ContextVar("request_responses", default=None)
+
+        # Log through a queue drained by a background thread, so request threads never wait on file or console I/O.
+        # A fixed name, so [logging] sample_every keys match even when run as __main__.
+        self.logger = logging.getLogger("server.server")
+        self._log_pipeline = LogPipeline.from_config(self.config, "bot_server.log")
+        self._log_pipeline.handler.addFilter(self._add_request_context)
+        # On the root logger, so util.* and modules.* loggers go through the pipeline too.
+        self._log_pipeline.attach(logging.getLogger())
+        self._log_pipeline.start()
         
-        # Initialize database connection pool
+        # Bounded pools for blocking commands in async mode (configurable via [server]).
+        server_cfg = self.config.get("server", {}) if isinstance(self.config, dict) else {}
+        self._command_workers = self._positive_int(server_cfg.get("command_workers", 8), 8)
+        self._slow_command_workers = self._positive_int(server_cfg.get("slow_command_workers", 4), 4)
+        self._max_batch_size = self._positive_int(server_cfg.get("max_batch_size", 50), 50)
+        self._command_executor: Optional[ThreadPoolExecutor] = None
+        self._slow_command_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # Initialize database connection pool; each worker holds one connection for a whole message.
         self.logger.info("Initializing database connection pool...")
         try:
-            initialize_pool()
+            initialize_pool(workers=self._command_workers + self._slow_command_workers)
             self.logger.info("Database connection pool initialized successfully")
         except Exception as e:
             self.logger.error(f"Failed to initialize database pool: {e}")
             raise
+        # Flask serves every request on a thread of its own, and a message holds its pooled
+        # connection until it finishes; admit only as many messages as the pool can serve.
+        pool_stats = get_pool_stats()
+        self.request_slots = threading.BoundedSemaphore(
+            pool_stats["max"] if pool_stats else self._command_workers + self._slow_command_workers
+        )
         
         # Initialize command and module registries
         self.commands = command_registry
@@ -98,9 +135,6 @@ class BotServer:
         self.modules = module_registry
         self.modules.set_logger(self.logger)
         
-        # Response queue for collecting responses during command execution
-        self._response_queue = []
-
         # Last non-command message per session (used by translate fallback)
         self.last_message: Dict[str, str] = {}
 
@@ -134,6 +168,12 @@ class BotServer:
         self.load_commands()
         self.load_modules()
 
+    def _add_request_context(self, record: logging.LogRecord) -> bool:
+        """Log filter: tag records with the current request's session and platform."""
+        record.session = self._request_session.get()
+        record.platform = self._request_platform.get()
+        return True
+
     def _parse_prefixes(self, raw_prefixes):
         """Normalize command prefixes from config into a list."""
         if isinstance(raw_prefixes, list):
@@ -186,7 +226,24 @@ class BotServer:
         self.modules.load_modules(modules_dir)
         self.logger.info(f"Loaded {len(self.modules)} modules from {modules_dir}")
         
-    def process_message(self, is_team: bool, playername: str, chattext: str, language: str = "en_US", session_id: str = "default") -> List[Dict]:
+    @contextmanager
+    def _request_scope(self, language: str, session_id: str, platform: str):
+        """Bind request-scoped state for the duration of one message; yields the response list."""
+        language_token = self._request_language.set(language)
+        session_token = self._request_session.set(session_id)
+        platform_token = self._request_platform.set(platform or "unknown")
+        response_queue: List[Dict] = []
+        responses_token = self._request_responses.set(response_queue)
+        _messages.labels(platform or "unknown", session_id).inc()
+        try:
+            yield response_queue
+        finally:
+            self._request_responses.reset(responses_token)
+            self._request_platform.reset(platform_token)
+            self._request_language.reset(language_token)
+            self._request_session.reset(session_token)
+
+    def process_message(self, is_team: bool, playername: str, chattext: str, language: str = "en_US", session_id: str = "default", platform: str = "unknown") -> List[Dict]:
         """Process a message and return list of responses.
         
         Args:
@@ -194,109 +251,219 @@ class BotServer:
             playername: Name of the player
             chattext: The message text
             language: Language code for responses (defaults to en_US)
+            session_id: Session identifier of the originating chat
+            platform: Platform the message came from (e.g., 'cs2', 'discord')
         """
-        # Set language for this request (request-scoped to avoid cross-request bleed).
+        # Everything below is request-scoped so concurrent requests never share state.
         normalized_session = session_id or "default"
-        self.language = language
-        language_token = self._request_language.set(language)
-        session_token = self._request_session.set(normalized_session)
-        import time
         start_time = time.time()
-        
-        try:
-            # Clear response queue for this message
-            self._response_queue = []
 
+        # One DB connection and transaction for the whole message, committed at the end.
+        with unit_of_work(), self._request_scope(language, normalized_session, platform) as response_queue:
             command_parts = self._extract_command(chattext)
-
-            # Plain text is only meaningful when a scramble session is active.
-            if not command_parts:
-                # Always record last non-command message for translate fallback.
-                stripped_chat = (chattext or "").strip()
-                if stripped_chat and not self._is_recent_bot_response(normalized_session, stripped_chat):
-                    self.last_message[normalized_session] = stripped_chat
-                if not self._has_active_scramble_session(normalized_session):
-                    self.logger.debug(f"Ignoring non-command message for inactive session: {normalized_session}")
-                    return []
-
-            # Only commands count toward anti-spam cooldown.
-            if command_parts:
-                cooldown_seconds, should_warn = self._check_spam_cooldown(normalized_session, playername)
-                if cooldown_seconds > 0:
-                    responses = []
-                    if self._spam_remove_from_queue:
-                        responses.append({
-                            "is_team": is_team,
-                            "control": "remove_player_queue",
-                            "player": playername,
-                        })
-                    if should_warn:
-                        responses.append({
-                            "is_team": is_team,
-                            "text": self.t("errors.spam_cooldown", player=playername, seconds=cooldown_seconds),
-                        })
-                    self._remember_recent_responses(normalized_session, responses)
-                    return responses
-
-            # Pass to modules that are reading input
-            module_start = time.time()
-            for module_name, module_instance in self.modules.modules.items():
-                if hasattr(module_instance, "process") and getattr(module_instance, "reading_input", True):
-                    if not command_parts and module_name != "scramble":
-                        continue
-                    try:
-                        try:
-                            if module_name == "scramble":
-                                response = module_instance.process(playername, is_team, chattext, session_id=normalized_session, t=self.t)
-                            else:
-                                response = module_instance.process(playername, is_team, chattext, t=self.t)
-                        except TypeError:
-                            if module_name == "scramble":
-                                response = module_instance.process(playername, is_team, chattext, session_id=normalized_session)
-                            else:
-                                response = module_instance.process(playername, is_team, chattext)
-                        if response:
-                            self._response_queue.append({
-                                "is_team": is_team,
-                                "text": f"{playername}: {response}"
-                            })
-                    except Exception as e:
-                        self.logger.error(f"Error in module '{module_name}' while processing: {e}")
-            module_time = time.time() - module_start
+            early_responses = self._run_before_command(is_team, playername, chattext, command_parts, normalized_session, response_queue)
+            if early_responses is not None:
+                return early_responses
 
             # Process commands if the line starts with any configured prefix
             if command_parts:
+                command_start = time.time()
+                command_name, command_args = command_parts
+                command_label = "unknown"
                 try:
-                    command_start = time.time()
-                    command_name, command_args = command_parts
+                    handler = self.commands.resolve(command_name, language, self)
+                    command_label = self._command_label(handler)
+                    self.logger.debug("Executing command: %s with args: %s", command_name, command_args)
+                    res = self.commands.execute_resolved(handler, command_name, self, is_team, playername, command_args)
+                    if inspect.isawaitable(res):
+                        # Async commands still work on the threaded server.
+                        res = asyncio.run(res)
+                    self._collect_command_result(is_team, res, response_queue, command_start, command_label)
+                except Exception as e:
+                    self._log_command_error(e, command_label, command_start)
 
-                    self.logger.info(f"Executing command: {command_name} with args: {command_args}")
-                    res = self.commands.execute(command_name, self, is_team, playername, command_args)
+            return self._finish_request(normalized_session, response_queue, start_time)
+
+    async def process_message_async(self, is_team: bool, playername: str, chattext: str, language: str = "en_US", session_id: str = "default", platform: str = "unknown") -> List[Dict]:
+        """Async counterpart of process_message used by the ASGI server.
+
+        Blocking commands run on a bounded thread pool (slow commands on their own
+        pool); commands declared with ``async def`` run on the event loop.
+        """
+        handler = self._resolve_handler(chattext, language)
+        if not getattr(handler, "is_async", False):
+            executor = self._get_command_executor(slow=getattr(handler, "is_slow", False))
+            call = functools.partial(
+                self.process_message,
+                is_team,
+                playername,
+                chattext,
+                language=language,
+                session_id=session_id,
+                platform=platform,
+            )
+            return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+        normalized_session = session_id or "default"
+        start_time = time.time()
+
+        with unit_of_work(), self._request_scope(language, normalized_session, platform) as response_queue:
+            command_parts = self._extract_command(chattext)
+            early_responses = self._run_before_command(is_team, playername, chattext, command_parts, normalized_session, response_queue)
+            if early_responses is not None:
+                return early_responses
+
+            command_start = time.time()
+            command_label = "unknown"
+            try:
+                command_label = self._command_label(handler)
+                command_name, command_args = command_parts
+
+                self.logger.debug("Executing async command: %s with args: %s", command_name, command_args)
+                res = await handler(self, is_team, playername, command_args)
+                self._collect_command_result(is_team, res, response_queue, command_start, command_label)
+            except Exception as e:
+                self._log_command_error(e, command_label, command_start)
+
+            return self._finish_request(normalized_session, response_queue, start_time)
+
+    def _resolve_handler(self, chattext: str, language: str):
+        """Return the command handler a chat line would run, or None for plain text/unknown commands."""
+        command_parts = self._extract_command(chattext)
+        if not command_parts:
+            return None
+        try:
+            return self.commands.resolve(command_parts[0], language, self)
+        except Exception:
+            # Let process_message resolve again inside its own error handling.
+            self.logger.exception("Failed to resolve command %r", command_parts[0])
+            return None
 
-                    if isinstance(res, str):
-                        self._response_queue.append({
+    @staticmethod
+    def _command_label(handler) -> str:
+        """Metrics label for a resolved handler: its canonical command name, or "unknown"."""
+        return getattr(handler, "command_name", None) or "unknown"
+
+    def _get_command_executor(self, slow: bool = False) -> ThreadPoolExecutor:
+        """Return the bounded pool for blocking commands, creating it on first use."""
+        with self._executor_lock:
+            if slow:
+                if self._slow_command_executor is None:
+                    self._slow_command_executor = ThreadPoolExecutor(
+                        max_workers=self._slow_command_workers,
+                        thread_name_prefix="slow-command",
+                    )
+                return self._slow_command_executor
+
+            if self._command_executor is None:
+                self._command_executor = ThreadPoolExecutor(
+                    max_workers=self._command_workers,
+                    thread_name_prefix="command",
+                )
+            return self._command_executor
+
+    def _run_before_command(self, is_team, playername, chattext, command_parts, normalized_session, response_queue):
+        """Run ignore/anti-spam checks and input-reading modules.
+
+        Returns the final responses when processing should stop before the command runs, otherwise None.
+        """
+        # Plain text is only meaningful when a scramble session is active.
+        if not command_parts:
+            # Always record last non-command message for translate fallback.
+            stripped_chat = (chattext or "").strip()
+            if stripped_chat and not self._is_recent_bot_response(normalized_session, stripped_chat):
+                self.last_message[normalized_session] = stripped_chat
+            if not self._has_active_scramble_session(normalized_session):
+                self.logger.debug(f"Ignoring non-command message for inactive session: {normalized_session}")
+                return []
+
+        # Only commands count toward anti-spam cooldown.
+        if command_parts:
+            cooldown_seconds, should_warn = self._check_spam_cooldown(normalized_session, playername)
+            if cooldown_seconds > 0:
+                _spam_blocked.inc()
+                responses = []
+                if self._spam_remove_from_queue:
+                    responses.append({
+                        "is_team": is_team,
+                        "control": "remove_player_queue",
+                        "player": playername,
+                    })
+                if should_warn:
+                    responses.append({
+                        "is_team": is_team,
+                        "text": self.t("errors.spam_cooldown", player=playername, seconds=cooldown_seconds),
+                    })
+                self._remember_recent_responses(normalized_session, responses)
+                return responses
+
+        # Pass to modules that are reading input
+        for module_name, module_instance in self.modules.modules.items():
+            if hasattr(module_instance, "process") and getattr(module_instance, "reading_input", True):
+                if not command_parts and module_name != "scramble":
+                    continue
+                module_start = time.time()
+                try:
+                    try:
+                        if module_name == "scramble":
+                            response = module_instance.process(playername, is_team, chattext, session_id=normalized_session, t=self.t)
+                        else:
+                            response = module_instance.process(playername, is_team, chattext, t=self.t)
+                    except TypeError:
+                        if module_name == "scramble":
+                            response = module_instance.process(playername, is_team, chattext, session_id=normalized_session)
+                        else:
+                            response = module_instance.process(playername, is_team, chattext)
+                    if response:
+                        response_queue.append({
                             "is_team": is_team,
-                            "text": res
+                            "text": f"{playername}: {response}"
                         })
-                    command_time = time.time() - command_start
-                    self.logger.info(f"Command execution took {command_time:.4f}s")
                 except Exception as e:
-                    import traceback
-                    self.logger.error(f"Error executing command: {e}")
-                    self.logger.error(f"Traceback: {traceback.format_exc()}")
-
-            # Return collected responses
-            responses = self._response_queue
-            self._response_queue = []
-            self._remember_recent_responses(normalized_session, responses)
+                    _module_errors.labels(module_name).inc()
+                    self.logger.error(f"Error in module '{module_name}' while processing: {e}")
+                finally:
+                    _module_seconds.labels(module_name).observe(time.time() - module_start)
+        return None
 
-            total_time = time.time() - start_time
-            self.logger.info(f"Total processing time: {total_time:.4f}s (modules: {module_time:.4f}s)")
+    def _collect_command_result(
+        self, is_team: bool, res, response_queue: List[Dict], command_start: float, command_label: str = "unknown"
+    ) -> None:
+        """Queue a command's string return value and record its execution time."""
+        if isinstance(res, str):
+            response_queue.append({
+                "is_team": is_team,
+                "text": res
+            })
+        command_time = time.time() - command_start
+        _command_seconds.labels(command_label).observe(command_time)
+        self.logger.debug("Command execution took %.4fs", command_time)
+
+    def _log_command_error(self, error: Exception, command_label: str = "unknown", command_start: Optional[float] = None) -> None:
+        import traceback
+        _command_errors.labels(command_label).inc()
+        if command_start is not None:
+            _command_seconds.labels(command_label).observe(time.time() - command_start)
+        self.logger.error(f"Error executing command: {error}")
+        self.logger.error(f"Traceback: {traceback.format_exc()}")
+
+    def _finish_request(self, normalized_session: str, response_queue: List[Dict], start_time: float) -> List[Dict]:
+        """Record the request's responses for echo detection and return them."""
+        self._remember_recent_responses(normalized_session, response_queue)
+        total_time = time.time() - start_time
+        _request_seconds.labels(self.platform).observe(total_time)
+        self.logger.debug("Total processing time: %.4fs", total_time)
+        return response_queue
+
+    @property
+    def language(self) -> str:
+        """Language of the current request (en_US outside of a request)."""
+        return self._request_language.get()
 
-            return responses
-        finally:
-            self._request_language.reset(language_token)
-            self._request_session.reset(session_token)
+    @property
+    def platform(self) -> str:
+        """Platform of the current request ('unknown' outside of a request)."""
+        return self._request_platform.get()
 
     def get_request_language(self) -> str:
         """Get language for the current request context."""
@@ -345,6 +512,7 @@ class BotServer:
             timestamps.append(now)
             if len(timestamps) > self._spam_max_messages:
                 self._cooldown_until[player_key] = now + self._spam_cooldown_seconds
+                _spam_cooldowns.inc()
                 self._last_cooldown_warn_at[player_key] = now
                 timestamps.clear()
                 return self._spam_cooldown_seconds, True
@@ -370,12 +538,162 @@ class BotServer:
         
     def add_to_chat_queue(self, is_team: bool, chattext: str) -> None:
         """Compatibility method for commands that expect this method."""
-        # Commands call this to queue responses - we collect them in _response_queue
-        self._response_queue.append({
+        # Commands call this to queue responses - they are collected per request
+        response_queue = self._request_responses.get()
+        if response_queue is None:
+            self.logger.warning(f"Dropping response queued outside of a request: {chattext}")
+            return
+        response_queue.append({
             "is_team": is_team,
             "text": chattext
         })
     
+    def _parse_request(self, data) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Validate a /process_message payload; returns (error_payload, fields)."""
+        if not data:
+            return {"error": "No data provided"}, None
+
+        fields = {
+            "is_team": data.get('is_team', False),
+            "playername": data.get('playername', ''),
+            "chattext": data.get('chattext', ''),
+            "platform": data.get('platform', 'unknown'),
+            "language": data.get('language', 'en_US'),  # Get language from request, default to English
+            "session_id": data.get('session_id', 'default'),
+        }
+
+        self.logger.debug("Received request: language=%s, session=%s", fields["language"], fields["session_id"])
+
+        if not fields["playername"] or not fields["chattext"]:
+            return {"error": "Missing required fields"}, None
+        return None, fields
+
+    def _resolve_player(self, platform: str, playername: str) -> str:
+        """Get preferred identifier (Discord if linked, otherwise original)."""
+        account_linking = self.modules.get_module("account_linking")
+        if account_linking:
+            return account_linking.get_preferred_identifier(platform, playername)
+        return playername
+
+    def handle_request(self, data) -> Tuple[Dict[str, Any], int]:
+        """Handle a /process_message payload; returns (response_payload, status_code)."""
+        error, fields = self._parse_request(data)
+        if error:
+            return error, 400
+
+        # Identity lookup and command share one connection.
+        with unit_of_work():
+            fields["playername"] = self._resolve_player(fields["platform"], fields["playername"])
+            responses = self.process_message(**fields)
+        return {"responses": responses}, 200
+
+    async def handle_request_async(self, data) -> Tuple[Dict[str, Any], int]:
+        """Async counterpart of handle_request used by the ASGI server."""
+        error, fields = self._parse_request(data)
+        if error:
+            return error, 400
+
+        loop = asyncio.get_running_loop()
+        fields["playername"] = await loop.run_in_executor(
+            self._get_command_executor(),
+            self._resolve_player,
+            fields["platform"],
+            fields["playername"],
+        )
+        responses = await self.process_message_async(**fields)
+        return {"responses": responses}, 200
+
+    def _parse_batch_request(self, data) -> Tuple[Optional[Dict[str, Any]], Optional[List]]:
+        """Validate a /process_messages payload; returns (error_payload, messages)."""
+        messages = data.get("messages") if isinstance(data, dict) else None
+        if not isinstance(messages, list) or not messages:
+            return {"error": "No messages provided"}, None
+        if len(messages) > self._max_batch_size:
+            return {"error": f"Too many messages in batch (max {self._max_batch_size})"}, None
+        return None, messages
+
+    def _handle_batch_item(self, data) -> Dict[str, Any]:
+        """Process one message of a batch; errors are reported per message."""
+        try:
+            payload, status = self.handle_request(data if isinstance(data, dict) else None)
+        except Exception as e:
+            self.logger.error(f"Error processing batched message: {e}")
+            payload, status = {"error": str(e)}, 500
+        if status != 200:
+            payload = dict(payload, status=status)
+        return payload
+
+    def handle_batch_request(self, data) -> Tuple[Dict[str, Any], int]:
+        """Handle a /process_messages payload.
+
+        Messages are processed in the order given, so per-session ordering is kept.
+        Each entry of ``results`` matches the message at the same index.
+        """
+        error, messages = self._parse_batch_request(data)
+        if error:
+            return error, 400
+        # Reuse one connection for the whole batch; each message still commits on its own.
+        with unit_of_work():
+            results = [self._handle_batch_item(message) for message in messages]
+        return {"results": results}, 200
+
+    async def handle_batch_request_async(self, data) -> Tuple[Dict[str, Any], int]:
+        """Async counterpart of handle_batch_request.
+
+        Sessions are processed concurrently; messages of the same session still run
+        one after another in the order given.
+        """
+        error, messages = self._parse_batch_request(data)
+        if error:
+            return error, 400
+
+        by_session: Dict[str, List[int]] = {}
+        for index, message in enumerate(messages):
+            session_id = message.get("session_id", "default") if isinstance(message, dict) else "default"
+            by_session.setdefault(session_id or "default", []).append(index)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+
+        async def run_session(indexes: List[int]) -> None:
+            for index in indexes:
+                message = messages[index]
+                try:
+                    payload, status = await self.handle_request_async(message if isinstance(message, dict) else None)
+                except Exception as e:
+                    self.logger.error(f"Error processing batched message: {e}")
+                    payload, status = {"error": str(e)}, 500
+                results[index] = payload if status == 200 else dict(payload, status=status)
+
+        await asyncio.gather(*(run_session(indexes) for indexes in by_session.values()))
+        return {"results": results}, 200
+
+    def health(self) -> Dict[str, Any]:
+        """Health payload; includes connection pool usage and catalog warm-up state once they exist."""
+        payload: Dict[str, Any] = {"status": "ok"}
+        pool_stats = get_pool_stats()
+        if pool_stats is not None:
+            payload["database_pool"] = pool_stats
+        catalogs = catalog_warmer.status()
+        if catalogs:
+            payload["catalogs"] = catalogs
+        return payload
+
+    def shutdown(self) -> None:
+        """Stop command pools and background module threads, cancel catalog warm-up and close database connections."""
+        with self._executor_lock:
+            for executor in (self._command_executor, self._slow_command_executor):
+                if executor is not None:
+                    executor.shutdown(wait=False)
+            self._command_executor = None
+            self._slow_command_executor = None
+        catalog_warmer.shutdown()
+        status_effects = self.modules.get_module("status_effects")
+        if status_effects is not None:
+            status_effects.stop()
+        close_cs2_case_client()
+        close_pool()
+        self._log_pipeline.stop()
+
     def t(self, key: str, **kwargs) -> str:
         """
         Get a translated string by key.
@@ -395,54 +713,64 @@ app = Flask(__name__)
 bot_server = None
 
 
+def _read_payload():
+    """Decode the request body as JSON, or msgpack when the client sent it."""
+    if is_msgpack(request.content_type):
+        return decode_body(request.get_data(), request.content_type)
+    return request.get_json(silent=True)
+
+
+def _respond(payload: Dict[str, Any], status: int):
+    """Answer in msgpack when the client accepts it and it is installed, else JSON."""
+    if accepts_msgpack(request.headers.get("Accept")):
+        body, content_type = encode_body(payload, use_msgpack=True)
+        return Response(body, status=status, content_type=content_type)
+    return jsonify(payload), status
+
+
 @app.route('/process_message', methods=['POST'])
 def process_message():
     """Handle incoming messages from the client."""
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-            
-        is_team = data.get('is_team', False)
-        playername = data.get('playername', '')
-        chattext = data.get('chattext', '')
-        platform = data.get('platform', 'unknown')
-        language = data.get('language', 'en_US')  # Get language from request, default to English
-        session_id = data.get('session_id', 'default')
-        
-        bot_server.logger.info(f"DEBUG: Received language from request: {language}")
-        bot_server.logger.info(f"DEBUG: Received session from request: {session_id}")
-        
-        if not playername or not chattext:
-            return jsonify({"error": "Missing required fields"}), 400
-        
-        # Store platform info on the bot server for commands to access
-        bot_server.platform = platform
-        
-        # Get preferred identifier (Discord if linked, otherwise original)
-        account_linking = bot_server.modules.get_module("account_linking")
-        if account_linking:
-            playername = account_linking.get_preferred_identifier(platform, playername)
-            
-        # Process the message with the specified language
-        responses = bot_server.process_message(is_team, playername, chattext, language=language, session_id=session_id)
-        
-        return jsonify({"responses": responses}), 200
-        
+        with bot_server.request_slots:
+            payload, status = bot_server.handle_request(_read_payload())
+        return _respond(payload, status)
     except Exception as e:
         app.logger.error(f"Error processing message: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/process_messages', methods=['POST'])
+def process_messages():
+    """Handle an ordered batch of messages from the client in one round trip."""
+    try:
+        with bot_server.request_slots:
+            payload, status = bot_server.handle_batch_request(_read_payload())
+        return _respond(payload, status)
+    except Exception as e:
+        app.logger.error(f"Error processing message batch: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(metrics_registry.render(), status=200, content_type=METRICS_CONTENT_TYPE)
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint."""
-    return jsonify({"status": "ok"}), 200
+    if bot_server is None:
+        return jsonify({"status": "ok"}), 200
+    return jsonify(bot_server.health()), 200
 
 
 def run_server(host='127.0.0.1', port=8080):
-    """Run the Flask server.
+    """Run the bot server.
+
+    Serves with Flask by default; set ``mode = "asgi"`` under ``[server]`` in
+    config.toml (or ``BOT_SERVER_MODE=asgi``) to serve the same API with uvicorn.
     
     Args:
         host: Host address
@@ -450,8 +778,17 @@ def run_server(host='127.0.0.1', port=8080):
     """
     global bot_server
     bot_server = BotServer()
+    server_cfg = bot_server.config.get("server", {}) if isinstance(bot_server.config, dict) else {}
+    mode = str(os.getenv("BOT_SERVER_MODE") or server_cfg.get("mode", "wsgi")).strip().lower()
+
+    if mode == "asgi":
+        from server.asgi import run_asgi_server
+        run_asgi_server(bot_server, host=host, port=port)
+        return
+
     app.logger.info(f"Starting bot server on {host}:{port} (language: per-request, default: en_US)")
-    app.run(host=host, port=port, debug=False)
+    # Requests are isolated per context, so the server can handle them concurrently.
+    app.run(host=host, port=port, debug=False, threaded=True)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,154 @@
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
 from util.module_registry import module_registry
 
 
 def clear_module_registry():
     module_registry.modules.clear()
+
+
+class FakeModules:
+    def __init__(self):
+        self.modules = {}
+
+    def set_logger(self, logger):
+        pass
+
+    def get_module(self, module_name):
+        return self.modules.get(module_name)
+
+    def __len__(self):
+        return len(self.modules)
+
+
+@pytest.fixture
+def bot_server(monkeypatch):
+    """A BotServer with no database, no file logging and an empty command registry."""
+    import server.server as server_module
+    from server.server import BotServer
+    from util.commands import CommandRegistry
+
+    monkeypatch.setattr(server_module, "initialize_pool", lambda **_kwargs: None)
+    monkeypatch.setattr(server_module, "close_pool", lambda: None)
+    monkeypatch.setattr(server_module, "load_config", lambda: {"command_prefix": "!"})
+    monkeypatch.setattr(server_module.logging, "FileHandler", lambda *_args, **_kwargs: logging.NullHandler())
+    monkeypatch.setattr(BotServer, "load_commands", lambda self: None)
+    monkeypatch.setattr(BotServer, "load_modules", lambda self: None)
+
+    bot = BotServer()
+    bot.commands = CommandRegistry(logger=bot.logger)
+    bot.modules = FakeModules()
+    yield bot
+    bot.shutdown()
+
+
+class FakeCursor:
+    """Cursor whose ``execute`` asks ``respond(query, params)`` for the result rows.
+
+    ``query`` has its whitespace collapsed; ``rowcount`` is the number of rows
+    returned and ``executed`` counts round trips.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.executed = 0
+        self.rowcount = 0
+        self._rows = []
+
+    def execute(self, query, params=None):
+        self.executed += 1
+        self._rows = list(self.respond(" ".join(query.split()), params) or ())
+        self.rowcount = len(self._rows)
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_db_cursor(monkeypatch):
+    """Point a module's ``DatabaseConnection`` at a FakeCursor: ``fake_db_cursor(module, respond)``."""
+
+    def install(module, respond=lambda query, params: ()):
+        cursor = FakeCursor(respond)
+
+        class FakeDatabaseConnection:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def __enter__(self):
+                return cursor
+
+            def __exit__(self, *exc):
+                return False
+
+        monkeypatch.setattr(module, "DatabaseConnection", FakeDatabaseConnection)
+        return cursor
+
+    return install
+
+
+class StandInServer:
+    """Local HTTP server standing in for an upstream API.
+
+    ``routes`` maps a path to ``(status, json_body)`` or ``(status, json_body, delay_seconds)``;
+    unknown paths return 404. Every request path is appended to ``requests``.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urlparse(self.path).path
+                stand_in.requests.append(path)
+                status, body, *delay = stand_in.routes.get(path, (404, {"error": "not found"}))
+                if delay:
+                    time.sleep(delay[0])
+                encoded = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.host = f"127.0.0.1:{self._server.server_port}"
+        self.url = f"http://{self.host}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stand_in_server():
+    """An offline stand-in for the catalog APIs, with fresh breaker state."""
+    from util.http_client import reset_host_guards
+
+    reset_host_guards()
+    server = StandInServer()
+    yield server
+    server.close()
+    reset_host_guards()
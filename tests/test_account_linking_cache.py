@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import modules.account_linking as account_linking_module
+from modules.account_linking import AccountLinking
+from util.database import unit_of_work
+
+
+class LinkTables:
+    """In-memory link_codes and account_links tables answering the module's statements."""
+
+    def __init__(self, links=None):
+        self.links = dict(links or {})  # (platform, identifier) -> account_id
+        self.codes = {}  # code -> (platform, identifier, expires_at)
+
+    def link(self, account_id, *members):
+        for member in members:
+            self.links[member] = account_id
+
+    def respond(self, query, params):
+        if query.startswith("SELECT platform, identifier, expires_at FROM link_codes"):
+            return [self.codes[params[0]]] if params[0] in self.codes else []
+        if query.startswith("SELECT discord.identifier"):
+            if params not in self.links:
+                return []
+            account_id = self.links[params]
+            discord = [ident for (plat, ident), owner in self.links.items() if owner == account_id and plat == "discord"]
+            return [(discord[0] if discord else None,)]
+        if query.startswith("SELECT account_id FROM account_links"):
+            members = [params[i:i + 2] for i in range(0, len(params), 2)]
+            return [(self.links[member],) for member in members if member in self.links]
+        if query.startswith("SELECT platform, identifier FROM account_links"):
+            return [member for member, owner in self.links.items() if owner == params[0]]
+        if query.startswith("SELECT COALESCE(MAX(account_id), 0) + 1"):
+            return [(max(self.links.values(), default=0) + 1,)]
+        if query.startswith("INSERT INTO account_links"):
+            account_id, platform, identifier = params
+            self.links[(platform, identifier)] = account_id
+        elif query.startswith("DELETE FROM link_codes"):
+            self.codes.pop(params[0], None)
+        return []
+
+
+def build(fake_db_cursor, tables):
+    cursor = fake_db_cursor(account_linking_module, tables.respond)
+    return AccountLinking(), cursor
+
+
+def test_linked_player_resolves_to_discord_with_one_query(fake_db_cursor):
+    tables = LinkTables()
+    tables.link(1, ("cs2", "alice_cs"), ("discord", "alice#1"))
+    linking, cursor = build(fake_db_cursor, tables)
+
+    assert linking.get_preferred_identifier("cs2", "alice_cs") == "alice#1"
+    assert linking.get_preferred_identifier("cs2", "alice_cs") == "alice#1"
+    assert cursor.executed == 1
+
+
+def test_group_without_discord_keeps_original_identifier(fake_db_cursor):
+    linking, _ = build(fake_db_cursor, LinkTables({("cs2", "bob"): 1}))
+
+    assert linking.get_preferred_identifier("cs2", "bob") == "bob"
+
+
+def test_unlinked_players_are_negatively_cached(fake_db_cursor):
+    linking, cursor = build(fake_db_cursor, LinkTables())
+
+    for _ in range(3):
+        assert linking.get_preferred_identifier("cs2", "carol") == "carol"
+    assert cursor.executed == 1
+
+
+def test_expired_entries_and_invalidation_force_a_new_lookup(fake_db_cursor):
+    tables = LinkTables()
+    linking, cursor = build(fake_db_cursor, tables)
+    linking._unlinked_ttl_seconds = 0
+
+    linking.get_preferred_identifier("cs2", "carol")
+    linking.get_preferred_identifier("cs2", "carol")
+    assert cursor.executed == 2
+
+    linking._unlinked_ttl_seconds = 60
+    linking.get_preferred_identifier("cs2", "carol")
+    tables.link(9, ("cs2", "carol"), ("discord", "carol#9"))
+    linking.invalidate_identity_cache()
+    assert linking.get_preferred_identifier("cs2", "carol") == "carol#9"
+
+
+def test_cache_evicts_least_recently_used(fake_db_cursor):
+    linking, cursor = build(fake_db_cursor, LinkTables())
+    linking._identity_cache.max_size = 2
+
+    linking.get_preferred_identifier("cs2", "a")
+    linking.get_preferred_identifier("cs2", "b")
+    linking.get_preferred_identifier("cs2", "a")
+    linking.get_preferred_identifier("cs2", "c")
+    executed = cursor.executed
+    linking.get_preferred_identifier("cs2", "a")
+    assert cursor.executed == executed
+    linking.get_preferred_identifier("cs2", "b")
+    assert cursor.executed == executed + 1
+
+
+def test_link_invalidates_the_cache_again_when_the_unit_commits(fake_db_cursor, monkeypatch):
+    tables = LinkTables()
+    tables.codes["123456"] = ("cs2", "alice_cs", datetime.now() + timedelta(minutes=5))
+    linking, _ = build(fake_db_cursor, tables)
+    monkeypatch.setattr(linking, "_migrate_fishing_data", lambda *args: None)
+
+    with unit_of_work():
+        assert linking.use_code("123456", "discord", "alice#1")["account_id"] == 1
+        # A concurrent request reads the committed (pre-link) row and caches it.
+        linking._identity_cache.set(("cs2", "alice_cs"), "alice_cs", 600)
+        assert linking._identity_cache.get(("cs2", "alice_cs")) == "alice_cs"
+
+    assert linking._identity_cache.get(("cs2", "alice_cs")) is None
+    assert tables.links == {("cs2", "alice_cs"): 1, ("discord", "alice#1"): 1}
+    assert tables.codes == {}
@@ -0,0 +1,72 @@
+import json
+import time
+
+from util.card_store import CardStore, StoredCard
+from util.pokemon_tcg_api import PokemonTCGClient
+
+
+def card(name, good=False, price=1.0):
+    return StoredCard(name, "Ultra Rare" if good else "Common", "Base", price, good)
+
+
+def test_replace_set_indexes_good_pool_and_survives_reopen(tmp_path):
+    store = CardStore(tmp_path / "cards.sqlite3")
+    info = store.replace_set("pokemon", "base1", [card("A"), card("B", good=True), card("C")])
+
+    assert (info.card_count, info.good_count) == (3, 1)
+    assert store.random_card("pokemon", "base1", good=True).name == "B"
+    store.close()
+
+    reopened = CardStore(tmp_path / "cards.sqlite3")
+    assert reopened.set_info("pokemon", "base1").card_count == 3
+    assert [c.name for c in reopened.cards("pokemon", "base1")] == ["A", "B", "C"]
+
+
+def test_replacing_one_set_leaves_others_untouched(tmp_path):
+    store = CardStore(tmp_path / "cards.sqlite3")
+    store.replace_set("pokemon", "base1", [card("A")])
+    store.replace_set("pokemon", "base2", [card("X"), card("Y")])
+    store.replace_set("pokemon", "base2", [card("Z")])
+
+    assert [c.name for c in store.cards("pokemon", "base1")] == ["A"]
+    assert [c.name for c in store.cards("pokemon", "base2")] == ["Z"]
+    assert store.random_card("pokemon", "base2", good=True) is None
+    assert store.random_card("mtg", "base1") is None
+
+
+def test_freshness_uses_ttl(tmp_path):
+    store = CardStore(tmp_path / "cards.sqlite3")
+    store.replace_set("pokemon", "old", [card("A")], updated_at=time.time() - 100)
+
+    assert store.is_fresh("pokemon", "old", ttl_seconds=1000)
+    assert not store.is_fresh("pokemon", "old", ttl_seconds=10)
+    assert not store.is_fresh("pokemon", "missing", ttl_seconds=1000)
+
+
+def test_pokemon_client_imports_legacy_json_cache_compactly(tmp_path, monkeypatch):
+    legacy = tmp_path / "pokemon_tcg_cache.json"
+    raw_cards = [
+        {"name": "Pikachu", "rarity": "Common", "set": {"name": "Base"}, "attacks": [{"name": "Zap"}],
+         "cardmarket": {"prices": {"trendPrice": 0.5}}},
+        {"name": "Charizard ex", "rarity": "Special Illustration Rare", "set": {"name": "Base"},
+         "cardmarket": {"prices": {"averageSellPrice": 120.0}}},
+    ]
+    legacy.write_text(json.dumps({"base1": {"updated_at": time.time(), "cards": raw_cards}}), encoding="utf-8")
+    monkeypatch.setenv("POKEMON_TCG_CACHE_PATH", str(legacy))
+    monkeypatch.setenv("POKEMON_TCG_STORE_PATH", str(tmp_path / "cards.sqlite3"))
+
+    client = PokemonTCGClient()
+    client._session.get = lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("network used"))
+
+    assert client.pull_pack_card("base1", good_pull_chance=1.0) == {
+        "name": "Charizard ex",
+        "rarity": "Special Illustration Rare",
+        "set_name": "Base",
+        "price": 120.0,
+        "good_hit": True,
+    }
+    assert client._store.cards("pokemon", "base1")[0] == StoredCard("Pikachu", "Common", "Base", 0.5, False)
+
+    # The JSON file is retired after the import, so later startups skip parsing it.
+    assert not legacy.exists()
+    assert (tmp_path / "pokemon_tcg_cache.json.imported").exists()
@@ -15,7 +15,7 @@ class FakeEconomy:
 
     def deduct_balance(self, user_id, amount):
         if self.get_balance(user_id) < amount:
-            return {"error": "Insufficient funds."}
+            return {"error": "Insufficient funds.", "balance": self.get_balance(user_id)}
         self.balances[user_id] = round(self.get_balance(user_id) - amount, 2)
         return self.balances[user_id]
 
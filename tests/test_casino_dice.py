@@ -1,3 +1,5 @@
+import pytest
+
 from modules.casino import Casino
 from util.module_registry import module_registry
 
@@ -10,13 +12,14 @@ class FakeEconomy:
         return float(self.balances.get(user_id, 0.0))
 
     def add_balance(self, user_id, amount):
-        self.balances[user_id] = round(self.get_balance(user_id) + amount, 2)
+        self.balances[user_id] = round(self.balances.get(user_id, 0.0) + amount, 2)
         return self.balances[user_id]
 
     def deduct_balance(self, user_id, amount):
-        if self.get_balance(user_id) < amount:
-            return {"error": "Insufficient funds."}
-        self.balances[user_id] = round(self.get_balance(user_id) - amount, 2)
+        current = self.balances.get(user_id, 0.0)
+        if current < amount:
+            return {"error": "Insufficient funds.", "balance": current}
+        self.balances[user_id] = round(current - amount, 2)
         return self.balances[user_id]
 
 
@@ -93,3 +96,22 @@ def test_dice_rejects_insufficient_funds(monkeypatch):
 
     assert "Insufficient funds" in result
     assert economy.get_balance("alice") == 10.0
+
+
+def test_dice_reports_current_balance_from_failed_debit(monkeypatch):
+    casino, economy = build_casino_with_fakes(start_balance=10.0, user_id="alice")
+    monkeypatch.setattr(economy, "get_balance", lambda _user_id: pytest.fail("balance re-queried"))
+
+    result = casino.dice_roll("alice", amount=50, guess="high")
+
+    assert "Your current balance is $10.00" in result
+
+
+def test_dice_win_uses_returned_balance(monkeypatch):
+    casino, economy = build_casino_with_fakes(start_balance=1000.0, user_id="alice")
+    monkeypatch.setattr("modules.casino.random.randint", lambda _a, _b: 6)
+    monkeypatch.setattr(economy, "get_balance", lambda _user_id: pytest.fail("balance re-queried"))
+
+    result = casino.dice_roll("alice", amount=50, guess="high")
+
+    assert "Balance: $1050.00" in result
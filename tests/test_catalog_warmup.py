@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from util.catalog_warmup import CatalogWarmer, HostRateLimiter
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    limiter = HostRateLimiter(intervals={"api.example.com": 0.05})
+
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.wait("https://api.example.com/v2/cards")
+    elapsed = time.monotonic() - started
+
+    assert elapsed >= 0.1
+    # Hosts without a configured interval are never delayed.
+    assert limiter.wait("https://other.example.com/") == 0.0
+
+
+def test_rate_limiter_spaces_concurrent_callers(monkeypatch):
+    limiter = HostRateLimiter(intervals={"api.example.com": 0.03})
+    slots = []
+    lock = threading.Lock()
+    reserve = limiter.reserve
+
+    def recording_reserve(url_or_host):
+        slot = reserve(url_or_host)
+        with lock:
+            slots.append(slot)
+        return slot
+
+    monkeypatch.setattr(limiter, "reserve", recording_reserve)
+    threads = [threading.Thread(target=limiter.wait, args=("api.example.com",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert on the schedule the limiter handed out, not on when threads woke up.
+    slots.sort()
+    gaps = [later - earlier for earlier, later in zip(slots, slots[1:])]
+    assert min(gaps) == pytest.approx(0.03)
+
+
+def test_warmer_tracks_pending_keys_until_done():
+    warmer = CatalogWarmer(max_workers=2)
+    release = threading.Event()
+    warmed = []
+
+    def warm_one(key):
+        if key == "slow":
+            release.wait(2)
+        warmed.append(key)
+
+    warmer.warm("pokemon", ["fast", "slow"], warm_one)
+    assert warmer.wait("pokemon", timeout=0.05) is False
+    assert warmer.is_warming("pokemon", "slow")
+    assert not warmer.is_warming("mtg")
+
+    release.set()
+    assert warmer.wait("pokemon", timeout=2)
+    assert not warmer.is_warming("pokemon")
+    assert sorted(warmed) == ["fast", "slow"]
+    assert warmer.status() == {"pokemon": {"ready": True, "pending": 0, "failed": 0}}
+    warmer.shutdown()
+
+
+def test_warmer_records_failures_without_blocking_other_keys():
+    warmer = CatalogWarmer(max_workers=2)
+    warmed = []
+
+    def warm_one(key):
+        if key == "bad":
+            raise RuntimeError("upstream down")
+        warmed.append(key)
+
+    warmer.warm("cs2_cases", ["bad", "good", "good"], warm_one)
+
+    assert warmer.wait("cs2_cases", timeout=2)
+    assert warmed == ["good"]
+    assert warmer.status()["cs2_cases"] == {"ready": True, "pending": 0, "failed": 1}
+    warmer.shutdown()
+
+
+def test_warmer_forgets_a_failure_once_the_key_warms():
+    warmer = CatalogWarmer(max_workers=1)
+    upstream = {"down": True}
+
+    def warm_one(key):
+        if upstream["down"]:
+            raise RuntimeError("upstream down")
+
+    warmer.warm("pokemon", ["sv1"], warm_one)
+    assert warmer.wait("pokemon", timeout=2)
+    assert warmer.status()["pokemon"]["failed"] == 1
+
+    upstream["down"] = False
+    warmer.warm("pokemon", ["sv1"], warm_one)
+    assert warmer.wait("pokemon", timeout=2)
+    assert warmer.status()["pokemon"]["failed"] == 0
+    warmer.shutdown()
@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+
+from util.chat_output import ChatOutputScheduler
+
+
+class RecordingSink:
+    """Stands in for the cfg write and key presses; records each step."""
+
+    def __init__(self):
+        self.steps = []
+        self.sent = []
+        self.sent_event = threading.Event()
+        self._current = None
+
+    def write(self, is_team, chattext):
+        self.steps.append("write")
+        self._current = (is_team, chattext)
+
+    def load(self):
+        self.steps.append("load")
+
+    def send(self):
+        self.steps.append("send")
+        self.sent.append(self._current)
+        self.sent_event.set()
+
+
+def make_scheduler(sink, **kwargs):
+    kwargs.setdefault("write_delay", 0)
+    kwargs.setdefault("load_delay", 0)
+    kwargs.setdefault("send_delay", 0)
+    return ChatOutputScheduler(sink, **kwargs)
+
+
+@pytest.fixture
+def running():
+    """Start schedulers on worker threads and stop them after the test."""
+    started = []
+
+    def start(scheduler):
+        thread = threading.Thread(target=scheduler.run, daemon=True)
+        thread.start()
+        started.append((scheduler, thread))
+        return scheduler
+
+    yield start
+    for scheduler, thread in started:
+        scheduler.stop()
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+
+
+def drain(scheduler):
+    """Deliver queued lines synchronously, as the worker would."""
+    while len(scheduler):
+        scheduler.deliver(*scheduler._next_line())
+
+
+def test_consecutive_lines_merge_per_channel_up_to_the_limit():
+    sink = RecordingSink()
+    scheduler = make_scheduler(sink, max_line_length=30)
+    for is_team, text in [(False, "a: 1"), (False, "b: 2"), (True, "c: 3"), (True, "d: 4"), (True, "x" * 25)]:
+        scheduler.enqueue(is_team, text)
+
+    drain(scheduler)
+
+    assert sink.sent == [(False, "a: 1 | b: 2"), (True, "c: 3 | d: 4"), (True, "x" * 25)]
+    assert sink.steps == ["write", "load", "send"] * 3
+
+
+def test_duplicates_are_rejected_only_while_queued():
+    sink = RecordingSink()
+    scheduler = make_scheduler(sink)
+
+    assert scheduler.enqueue(False, "a: hi")
+    assert not scheduler.enqueue(False, "a: hi")
+    assert scheduler.enqueue(True, "a: hi")
+    drain(scheduler)
+    assert scheduler.enqueue(False, "a: hi")
+
+
+def test_remove_where_drops_matching_lines():
+    scheduler = make_scheduler(RecordingSink())
+    for text in ["alice: 1", "bob: 2", "alice: 3"]:
+        scheduler.enqueue(False, text)
+
+    assert scheduler.remove_where(lambda is_team, text: text.startswith("alice:")) == 2
+    assert len(scheduler) == 1
+    assert scheduler.enqueue(False, "alice: 1")
+
+
+def test_worker_wakes_on_enqueue_and_waits_while_paused(running):
+    sink = RecordingSink()
+    scheduler = running(make_scheduler(sink))
+
+    started = time.monotonic()
+    scheduler.enqueue(False, "a: hi")
+    assert sink.sent_event.wait(1)
+    assert time.monotonic() - started < 0.5
+
+    sink.sent_event.clear()
+    scheduler.set_paused(True)
+    scheduler.enqueue(False, "b: later")
+    assert not sink.sent_event.wait(0.2)
+    assert sink.steps[-1] == "write"  # the cfg is written, but no key is pressed while paused
+
+    scheduler.set_paused(False)
+    assert sink.sent_event.wait(1)
+    assert sink.sent[-1] == (False, "b: later")
+
+
+def test_echoes_speed_up_pacing_and_missing_echoes_slow_it_down():
+    scheduler = make_scheduler(RecordingSink(), min_pace=0.25, ack_timeout=0)
+    for text in ["a: one", "b: two"]:
+        scheduler.enqueue(False, text)
+        drain(scheduler)
+        # The console echo differs in spacing and sanitized characters.
+        assert scheduler.acknowledge(f"  {text.upper()}/​")
+    assert scheduler.pace == pytest.approx(0.64)
+    assert not scheduler.acknowledge("someone else: hello")
+
+    scheduler.enqueue(False, "c: dropped")
+    drain(scheduler)
+    scheduler._expire_unacked()
+    assert scheduler.pace == pytest.approx(0.96)
+
+    for _ in range(3):
+        scheduler.enqueue(False, "c: dropped")
+        drain(scheduler)
+    scheduler._expire_unacked()
+    assert scheduler.pace == 1.0  # never slower than the configured base delays
+
+
+def test_from_config_reads_chat_output_section():
+    scheduler = ChatOutputScheduler.from_config(
+        RecordingSink(), {"chat_output": {"send_delay_seconds": 0.2, "max_line_length": 64}}
+    )
+
+    assert scheduler.send_delay == 0.2
+    assert scheduler.max_line_length == 64
+    assert scheduler.write_delay == 0.5
+
+
+def test_replies_to_other_players_speed_up_pacing_and_learn_the_bot_account():
+    scheduler = make_scheduler(RecordingSink())
+
+    scheduler.enqueue(False, "alice: You caught a Carp!")
+    drain(scheduler)
+    # The console shows the reply posted from the bot's account, addressed to another player.
+    assert scheduler.acknowledge("alice: You caught a Carp!", sender="FishBot")
+    assert scheduler.pace < 1.0
+    assert scheduler.own_sender == "FishBot"
+
+    scheduler.enqueue(False, "bob: You caught a Pike!")
+    drain(scheduler)
+    # A player repeating the bot's line is not taken for its echo.
+    assert not scheduler.acknowledge("bob: You caught a Pike!", sender="mallory")
+    assert scheduler.acknowledge("bob: You caught a Pike!", sender="FishBot")
@@ -6,6 +6,9 @@ class FakeLocalization:
         self.last_key = None
         self.last_kwargs = None
 
+    def resolve_language(self, language):
+        return language if language in ("en_US", "pt_BR") else "en_US"
+
     def get_value(self, key, language=None, default=None):
         if key == "command_aliases" and language == "pt_BR":
             return {
@@ -65,3 +68,42 @@ def test_execute_returns_not_found_without_suggestion_for_garbage_input():
 
     assert result.startswith("errors.command_not_found")
     assert "zzzzzz" in result
+
+
+def test_unknown_command_suggestions_use_cached_index(monkeypatch):
+    registry = CommandRegistry()
+
+    @registry.register("balance")
+    def _balance(bot, is_team, playername, chattext):
+        return "ok"
+
+    bot = FakeBot(language="pt_BR")
+    first = registry.execute("balanse", bot, False, "alice", "")
+    index = registry._suggestion_index_cache["pt_BR"]
+    monkeypatch.setattr(index, "_search", lambda *args: (_ for _ in ()).throw(AssertionError("not memoized")))
+
+    assert registry.execute("balanse", bot, False, "alice", "") == first
+    assert bot._localization.last_key == "errors.command_not_found_with_suggestion"
+    assert bot._localization.last_kwargs["suggestion"] == "balance"
+
+    @registry.register("bait")
+    def _bait(bot, is_team, playername, chattext):
+        return "ok"
+
+    assert "pt_BR" not in registry._suggestion_index_cache
+    registry.execute("baitt", bot, False, "alice", "")
+    assert bot._localization.last_kwargs["suggestion"] == "bait"
+
+
+def test_unknown_client_languages_share_the_default_caches():
+    registry = CommandRegistry()
+
+    @registry.register("balance")
+    def _balance(bot, is_team, playername, chattext):
+        return "ok"
+
+    for code in ("xx_1", "xx_2", "zz-ZZ", "en_US"):
+        registry.execute("balanse", FakeBot(language=code), False, "alice", "")
+
+    assert set(registry._suggestion_index_cache) == {"en_US"}
+    assert set(registry._localized_alias_cache) == {"en_US"}
@@ -0,0 +1,97 @@
+import json
+import threading
+
+import pytest
+
+import util.cs2_case_api as cs2_case_api
+from util.cs2_case_api import CS2CaseAPIError, CS2CaseClient
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("CS2_CASE_CACHE_PATH", str(tmp_path / "cs2_crates_cache.json"))
+    return CS2CaseClient(save_delay=60)
+
+
+def test_concurrent_price_misses_share_one_fetch(client, monkeypatch):
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fake_fetch(name):
+        calls.append(name)
+        started.set()
+        release.wait(2)
+        return 2.5
+
+    monkeypatch.setattr(client, "_fetch_steam_price", fake_fetch)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(client.get_case_price("Kilowatt Case")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    started.wait(2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["Kilowatt Case"]
+    assert results == [2.5] * 5
+    assert client.get_case_price("kilowatt case") == 2.5
+
+
+def test_price_updates_are_batched_into_one_write(client, monkeypatch):
+    writes = []
+    monkeypatch.setattr(client, "_fetch_steam_price", lambda name: 1.0)
+    original_save = client._save_cached_crates
+
+    def counting_save():
+        writes.append(1)
+        original_save()
+
+    monkeypatch.setattr(client, "_save_cached_crates", counting_save)
+
+    for index in range(10):
+        client.get_item_price(f"Item {index}")
+    assert writes == []
+
+    client.flush()
+    client.flush()
+
+    assert writes == [1]
+    saved = json.loads(client._cache_path.read_text(encoding="utf-8"))
+    assert len(saved["item_prices"]) == 10
+
+
+def test_pull_case_item_uses_name_index(client, monkeypatch):
+    monkeypatch.setattr(client, "_fetch_steam_price", lambda name: None)
+    client._set_crates([
+        {"name": "Other Case", "contains": [{"name": "Nope", "rarity": {"name": "Mil-Spec Grade"}}]},
+        {"name": "Kilowatt Case", "contains": [{"name": "AK-47 | Inheritance", "rarity": {"name": "Covert"}}]},
+    ])
+
+    pull = client.pull_case_item("  KILOWATT case ", knife_pull_chance=0)
+
+    assert pull["name"] == "AK-47 | Inheritance"
+    assert pull["case_name"] == "Kilowatt Case"
+    with pytest.raises(CS2CaseAPIError):
+        client.pull_case_item("Missing Case")
+
+
+def test_shared_client_is_reused_and_flushed_on_close(tmp_path, monkeypatch):
+    monkeypatch.setenv("CS2_CASE_CACHE_PATH", str(tmp_path / "shared.json"))
+    monkeypatch.setattr(cs2_case_api, "_cs2_case_client", None)
+
+    shared = cs2_case_api.get_cs2_case_client()
+    assert cs2_case_api.get_cs2_case_client() is shared
+
+    monkeypatch.setattr(shared, "_fetch_steam_price", lambda name: 3.0)
+    shared.save_delay = 60
+    shared.get_case_price("Dreams & Nightmares Case")
+    cs2_case_api.close_cs2_case_client()
+
+    assert (tmp_path / "shared.json").exists()
+    assert cs2_case_api.get_cs2_case_client() is not shared
+    cs2_case_api.close_cs2_case_client()
@@ -0,0 +1,218 @@
+import threading
+import time
+
+import pytest
+from psycopg2 import extensions
+
+import server.server as server_module
+import util.database as database
+from util.database import BoundedConnectionPool, DatabaseConnection, PoolTimeoutError
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection unexpectedly")
+        self.conn.statements.append(query)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.statements = []
+        self.rollbacks = 0
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.status
+
+    def close(self):
+        self.closed = 1
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def factory():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    options = {"minconn": 0, "maxconn": 2, "timeout": 1.0}
+    options.update(kwargs)
+    return BoundedConnectionPool(connection_factory=factory, **options), created
+
+
+def test_pool_reuses_returned_connections():
+    db_pool, created = make_pool(minconn=1)
+
+    conn = db_pool.getconn()
+    db_pool.putconn(conn)
+
+    assert db_pool.getconn() is conn
+    assert len(created) == 1
+    assert db_pool.stats()["in_use"] == 1
+
+
+def test_exhausted_pool_waits_for_a_returned_connection():
+    db_pool, _ = make_pool(maxconn=1)
+    held = db_pool.getconn()
+
+    def release_later():
+        time.sleep(0.05)
+        db_pool.putconn(held)
+
+    threading.Thread(target=release_later).start()
+
+    assert db_pool.getconn(timeout=2) is held
+    stats = db_pool.stats()
+    assert stats["waits"] == 1
+    assert stats["wait_time_max"] > 0
+
+
+def test_exhausted_pool_times_out():
+    db_pool, _ = make_pool(maxconn=1)
+    db_pool.getconn()
+
+    with pytest.raises(PoolTimeoutError):
+        db_pool.getconn(timeout=0.01)
+    assert db_pool.stats()["timeouts"] == 1
+
+
+def test_concurrent_checkouts_never_exceed_max():
+    db_pool, created = make_pool(maxconn=3)
+    peak = []
+
+    def worker():
+        for _ in range(20):
+            conn = db_pool.getconn(timeout=5)
+            peak.append(db_pool.stats()["in_use"])
+            db_pool.putconn(conn)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) <= 3
+    assert len(created) <= 3
+    assert db_pool.stats()["in_use"] == 0
+
+
+def test_stale_idle_connection_is_validated_and_replaced_when_dead():
+    db_pool, created = make_pool(health_check_seconds=0)
+    conn = db_pool.getconn()
+    db_pool.putconn(conn)
+    conn.broken = True
+
+    replacement = db_pool.getconn()
+
+    assert replacement is not conn
+    assert conn.closed
+    assert len(created) == 2
+    assert db_pool.stats()["recycled"] == 1
+
+
+def test_closed_or_mid_transaction_connections_are_not_reused_dirty():
+    db_pool, created = make_pool()
+    dirty = db_pool.getconn()
+    dirty.status = extensions.TRANSACTION_STATUS_INTRANS
+    db_pool.putconn(dirty)
+    assert dirty.rollbacks == 1
+
+    dead = db_pool.getconn()
+    assert dead is dirty
+    dead.close()
+    db_pool.putconn(dead)
+
+    assert db_pool.getconn() is not dead
+    assert db_pool.stats()["total"] == 1
+
+
+def test_connections_past_max_lifetime_are_recycled():
+    db_pool, created = make_pool(max_lifetime_seconds=0)
+    conn = db_pool.getconn()
+    db_pool.putconn(conn)
+    time.sleep(0.01)
+
+    assert db_pool.getconn() is not conn
+    assert conn.closed
+
+
+@pytest.mark.parametrize("configured_max, workers, expected_max", [(10, 12, 12), (20, 12, 20)])
+def test_initialize_pool_covers_every_worker(monkeypatch, configured_max, workers, expected_max):
+    created = {}
+
+    class RecordingPool:
+        def __init__(self, **kwargs):
+            created.update(kwargs)
+
+        def closeall(self):
+            pass
+
+    monkeypatch.setattr(database, "BoundedConnectionPool", RecordingPool)
+    monkeypatch.setattr(database, "get_db_config", lambda: {"host": "db", "port": 5432, "database": "bot"})
+    monkeypatch.setattr(database, "get_pool_config", lambda: {"minconn": 1, "maxconn": configured_max, "timeout": 1.0})
+    monkeypatch.setattr(database, "_connection_pool", None)
+
+    database.initialize_pool(workers=workers)
+    database.close_pool()
+
+    assert created["maxconn"] == expected_max
+
+
+def test_more_concurrent_messages_than_connections_wait_for_a_slot(bot_server, monkeypatch):
+    db_pool, _ = make_pool(maxconn=2, timeout=0.2)
+    monkeypatch.setattr(database, "_connection_pool", db_pool)
+    monkeypatch.setattr(server_module, "bot_server", bot_server)
+    bot_server.request_slots = threading.BoundedSemaphore(db_pool.maxconn)
+
+    @bot_server.commands.register("open")
+    def _open(bot, is_team, playername, chattext):
+        with DatabaseConnection() as cursor:
+            cursor.execute("SELECT balance FROM user_balances")
+        time.sleep(0.15)  # A slow upstream call while the message holds its connection.
+        return f"{playername} opened a pack"
+
+    statuses, replies = [], []
+
+    def send(playername):
+        response = server_module.app.test_client().post(
+            "/process_message", json={"playername": playername, "chattext": "!open"}
+        )
+        statuses.append(response.status_code)
+        replies.extend(entry["text"] for entry in response.get_json()["responses"])
+
+    threads = [threading.Thread(target=send, args=(f"p{i}",)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [200] * 6
+    assert sorted(replies) == [f"p{i} opened a pack" for i in range(6)]
+    assert db_pool.stats()["timeouts"] == 0
@@ -0,0 +1,164 @@
+import pytest
+
+import util.database as database
+from util.database import DatabaseConnection, after_commit, after_rollback, atomic, unit_of_work
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.closed = False
+
+    def execute(self, query, params=None):
+        self.conn.statements.append(query)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    state = {"checked_out": [], "returned": []}
+
+    def get_connection():
+        conn = FakeConnection()
+        state["checked_out"].append(conn)
+        return conn
+
+    monkeypatch.setattr(database, "get_connection", get_connection)
+    monkeypatch.setattr(database, "return_connection", state["returned"].append)
+    return state
+
+
+def test_connection_without_unit_commits_each_block(fake_pool):
+    for _ in range(3):
+        with DatabaseConnection() as cursor:
+            cursor.execute("SELECT 1")
+
+    assert len(fake_pool["checked_out"]) == 3
+    assert [conn.commits for conn in fake_pool["checked_out"]] == [1, 1, 1]
+    assert fake_pool["returned"] == fake_pool["checked_out"]
+
+
+def test_unit_of_work_shares_one_connection_and_commits_once(fake_pool):
+    with unit_of_work():
+        for _ in range(5):
+            with DatabaseConnection() as cursor:
+                cursor.execute("SELECT 1")
+
+    assert len(fake_pool["checked_out"]) == 1
+    conn = fake_pool["checked_out"][0]
+    assert conn.statements == ["SELECT 1"] * 5
+    assert conn.commits == 1
+    assert fake_pool["returned"] == [conn]
+
+
+def test_failing_block_rolls_back_the_unit(fake_pool):
+    with unit_of_work():
+        with DatabaseConnection() as cursor:
+            cursor.execute("UPDATE user_balances SET balance = balance - 10")
+        with pytest.raises(RuntimeError):
+            with DatabaseConnection() as cursor:
+                cursor.execute("INSERT INTO user_inventory VALUES (1)")
+                raise RuntimeError("constraint violated")
+
+    conn = fake_pool["checked_out"][0]
+    assert conn.statements == ["UPDATE user_balances SET balance = balance - 10", "INSERT INTO user_inventory VALUES (1)"]
+    assert conn.rollbacks == 1
+
+
+def test_failing_block_inside_atomic_rolls_back_only_to_its_savepoint(fake_pool):
+    with unit_of_work():
+        with DatabaseConnection() as cursor:
+            cursor.execute("UPDATE user_balances SET balance = balance - 10")
+        with pytest.raises(RuntimeError):
+            with atomic():
+                with DatabaseConnection() as cursor:
+                    cursor.execute("INSERT INTO user_inventory VALUES (1)")
+                    raise RuntimeError("constraint violated")
+        with atomic():
+            with DatabaseConnection() as cursor:
+                cursor.execute("SELECT 1")
+
+    conn = fake_pool["checked_out"][0]
+    assert conn.statements == [
+        "UPDATE user_balances SET balance = balance - 10",
+        "SAVEPOINT unit_block_1",
+        "INSERT INTO user_inventory VALUES (1)",
+        "ROLLBACK TO SAVEPOINT unit_block_1",
+        "ROLLBACK TO SAVEPOINT unit_block_1",
+        "SAVEPOINT unit_block_2",
+        "SELECT 1",
+        "RELEASE SAVEPOINT unit_block_2",
+    ]
+    assert conn.rollbacks == 0
+    assert conn.commits == 1
+
+
+def test_unit_of_work_without_queries_never_checks_out(fake_pool):
+    with unit_of_work():
+        pass
+
+    assert fake_pool["checked_out"] == []
+
+
+def test_unit_of_work_rolls_back_when_scope_raises(fake_pool):
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            with DatabaseConnection() as cursor:
+                cursor.execute("UPDATE user_balances SET balance = 0")
+            raise RuntimeError("boom")
+
+    conn = fake_pool["checked_out"][0]
+    assert conn.commits == 0
+    assert conn.rollbacks == 1
+    assert fake_pool["returned"] == [conn]
+
+
+def test_nested_units_share_connection_but_commit_separately(fake_pool):
+    with unit_of_work():
+        for _ in range(3):
+            with unit_of_work():
+                with DatabaseConnection() as cursor:
+                    cursor.execute("SELECT 1")
+
+    assert len(fake_pool["checked_out"]) == 1
+    conn = fake_pool["checked_out"][0]
+    # One commit per nested unit plus the (empty) outer commit.
+    assert conn.commits == 4
+    assert fake_pool["returned"] == [conn]
+
+
+def test_hooks_follow_the_fate_of_the_work_they_describe(fake_pool):
+    events = []
+    after_commit(lambda: events.append("no unit: immediately"))
+
+    with unit_of_work():
+        with DatabaseConnection() as cursor:
+            cursor.execute("UPDATE kept")
+            after_commit(lambda: events.append("kept: committed"))
+        with pytest.raises(RuntimeError):
+            with atomic(), DatabaseConnection() as cursor:
+                cursor.execute("UPDATE undone")
+                after_commit(lambda: events.append("undone: committed"))
+                after_rollback(lambda: events.append("undone: rolled back"))
+                raise RuntimeError("boom")
+        events.append("before commit")
+
+    assert events == ["no unit: immediately", "undone: rolled back", "before commit", "kept: committed"]
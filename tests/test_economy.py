@@ -0,0 +1,35 @@
+from decimal import Decimal
+
+import modules.economy as economy_module
+from modules.economy import Economy
+
+
+def answer(row):
+    """Respond to every statement with ``row``, as the single-statement balance queries expect."""
+    return lambda query, params: [row]
+
+
+def test_add_balance_is_one_round_trip_returning_new_balance(fake_db_cursor):
+    cursor = fake_db_cursor(economy_module, answer((Decimal("110.50"),)))
+
+    assert Economy().add_balance("alice", 10.5) == 110.5
+    assert cursor.executed == 1
+
+
+def test_deduct_balance_returns_new_balance(fake_db_cursor):
+    cursor = fake_db_cursor(economy_module, answer((Decimal("40.00"), Decimal("90.00"))))
+
+    assert Economy().deduct_balance("alice", 50) == 40.0
+    assert cursor.executed == 1
+
+
+def test_deduct_balance_reports_insufficient_funds_with_current_balance(fake_db_cursor):
+    fake_db_cursor(economy_module, answer((None, Decimal("10.00"))))
+
+    assert Economy().deduct_balance("alice", 50) == {"error": "Insufficient funds.", "balance": 10.0}
+
+
+def test_deduct_balance_for_unknown_user_is_insufficient(fake_db_cursor):
+    fake_db_cursor(economy_module, answer((None, None)))
+
+    assert Economy().deduct_balance("nobody", 1) == {"error": "Insufficient funds.", "balance": 0.0}
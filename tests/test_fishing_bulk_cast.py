@@ -0,0 +1,155 @@
+import modules.fishing as fishing_module
+from cmds.fishing import CHAT_LINE_LIMIT, _format_bulk_cast
+from modules.fishing import Fishing
+from util.module_registry import module_registry
+
+
+FISH_DATA = [
+    {"name": "Carp", "type": "fish", "rarity": "Common", "catch_rate": 1,
+     "min_weight": 1, "max_weight": 1, "price_multiplier": 2},
+    {"name": "Pike", "type": "fish", "rarity": "Rare", "catch_rate": 1,
+     "min_weight": 2, "max_weight": 2, "price_multiplier": 5},
+    {"name": "Old Boot", "type": "item", "rarity": "Common", "catch_rate": 1},
+]
+
+
+class FakeDatabase:
+    """In-memory sack, baits and autosell list answering the module's statements."""
+
+    def __init__(self, sack_count=0, autosell=(), baits=()):
+        self.sack_count = sack_count
+        self.autosell = list(autosell)
+        self.baits = list(baits)  # names of the fish set as bait, oldest first
+        self.caught = []  # (user_id, name, weight, price) rows inserted
+        self.fish_inserts = 0
+
+    def respond(self, query, params):
+        if query.startswith("SELECT COUNT(*)"):
+            return [(self.sack_count,)]
+        if query.startswith("DELETE FROM caught_fish WHERE id IN"):
+            used, self.baits = self.baits[:params[1]], self.baits[params[1]:]
+            return [(name,) for name in used]
+        if "FROM autosell_fish" in query:
+            return [(name,) for name in self.autosell]
+        if query.startswith("INSERT INTO caught_fish"):
+            self.fish_inserts += 1
+            self.caught.extend(tuple(params[i:i + 4]) for i in range(0, len(params), 4))
+        return []
+
+
+class FakeInventory:
+    def __init__(self, sack_capacity=None):
+        self.sack_capacity = sack_capacity
+        self.added = []
+
+    def get_item_by_type(self, _user_id, item_type):
+        if item_type == "sack" and self.sack_capacity is not None:
+            return [("sack", {"attributes": {"fish_capacity": self.sack_capacity}})]
+        return []
+
+    def add_item(self, user_id, item_name, item_data, quantity=1):
+        self.added.append((item_name, quantity))
+
+
+class FakeEconomy:
+    def __init__(self):
+        self.credits = []
+
+    def add_balance(self, user_id, amount):
+        self.credits.append(amount)
+        return 100 + amount
+
+
+class FakeStatusEffects:
+    def get_effects(self, _user_id):
+        return []
+
+
+def build_fishing(monkeypatch, fake_db_cursor, rolls, db, sack_capacity=None):
+    module_registry.modules.clear()
+    inventory, economy = FakeInventory(sack_capacity), FakeEconomy()
+    module_registry.register("inventory", inventory)
+    module_registry.register("economy", economy)
+    module_registry.register("status_effects", FakeStatusEffects())
+    monkeypatch.setattr(Fishing, "load_fish_data", lambda self: [dict(item) for item in FISH_DATA])
+
+    fake_db_cursor(fishing_module, db.respond)
+    rolls = iter(rolls)
+    monkeypatch.setattr(fishing_module.random, "random", lambda: next(rolls))
+    return Fishing(), inventory, economy
+
+
+# Common table (miss chance 0.3): Carp [0, 1), Pike [1, 2), Old Boot [2, 3), miss [3, 3.9).
+CARP, PIKE, BOOT, MISS = 0.1 / 3.9, 1.5 / 3.9, 2.5 / 3.9, 3.5 / 3.9
+
+
+def test_bulk_cast_persists_everything_in_one_insert_and_one_credit(monkeypatch, fake_db_cursor):
+    db = FakeDatabase(autosell=["pike"])
+    fishing, inventory, economy = build_fishing(monkeypatch, fake_db_cursor, [CARP, PIKE, BOOT, BOOT, MISS, CARP], db)
+
+    result = fishing.fish("alice", count=6)
+
+    assert result["type"] == "bulk"
+    assert result["casts"] == 6
+    assert [fish["name"] for fish in result["fish"]] == ["Carp", "Carp"]
+    assert result["autosold"] == [{"name": "Pike", "weight": 2, "price": 10}]
+    assert result["items"] == [{"name": "Old Boot", "quantity": 2}]
+    assert result["misses"] == 1
+    assert db.caught == [("alice", "Carp", 1, 2), ("alice", "Carp", 1, 2)]
+    assert db.fish_inserts == 1
+    assert economy.credits == [10]
+    assert result["balance"] == 110
+    assert inventory.added == [("Old Boot", 2)]
+
+
+def test_bulk_cast_stops_when_sack_is_full(monkeypatch, fake_db_cursor):
+    db = FakeDatabase(sack_count=3)
+    fishing, _, _ = build_fishing(monkeypatch, fake_db_cursor, [BOOT, CARP, CARP, CARP], db, sack_capacity=4)
+
+    result = fishing.fish("alice", count=4)
+
+    assert result["casts"] == 2
+    assert result["sack_full"] is True
+    assert [row[1] for row in db.caught] == ["Carp"]
+
+
+def test_bulk_cast_is_capped(monkeypatch, fake_db_cursor):
+    db = FakeDatabase()
+    fishing, _, _ = build_fishing(monkeypatch, fake_db_cursor, [MISS] * 100, db)
+
+    result = fishing.fish("alice", count=100)
+
+    assert result["casts"] == Fishing.MAX_BULK_CASTS
+    assert db.caught == []
+
+
+def test_bulk_cast_uses_one_bait_per_cast(monkeypatch, fake_db_cursor):
+    db = FakeDatabase(sack_count=3, baits=["Pike", "Pike", "Pike"])
+    fishing, _, _ = build_fishing(monkeypatch, fake_db_cursor, [CARP] * 5, db, sack_capacity=5)
+
+    result = fishing.fish("alice", count=5)
+
+    # Rare bait lifts the first three casts to the Rare table; the rest use the player's own odds.
+    assert [fish["name"] for fish in result["fish"]] == ["Pike", "Pike", "Pike", "Carp", "Carp"]
+    assert db.baits == []
+    assert result["sack_full"] is False
+
+
+def test_bulk_cast_summary_is_localized_and_split_to_fit_chat(bot_server):
+    result = {
+        "casts": 10,
+        "fish": [{"name": "Largemouth Bass", "weight": 12.34, "price": 56.78}] * 6,
+        "autosold": [{"name": "Pike", "price": 10}],
+        "items": [{"name": "Old Boot", "quantity": 2}],
+        "misses": 1,
+        "sack_full": False,
+    }
+
+    lines = _format_bulk_cast(bot_server, "alice", result)
+
+    assert len(lines) > 1
+    assert all(len(line) <= CHAT_LINE_LIMIT for line in lines)
+    assert lines[0].startswith("alice cast 10 times: Largemouth Bass (12.34 lbs, $56.78)")
+    assert all(line.startswith("alice: ") for line in lines[1:])
+    assert lines[-1].endswith("Pike autosold for $10, Old Boot x2, 1 empty")
+    assert sum(line.count("Largemouth Bass") for line in lines) == 6
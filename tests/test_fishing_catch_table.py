@@ -0,0 +1,74 @@
+import random
+
+from modules.fishing import CatchTable, Fishing
+
+
+FISH_DATA = [
+    {"name": "Carp", "type": "fish", "rarity": "Common", "catch_rate": 10},
+    {"name": "Pike", "type": "fish", "rarity": "Rare", "catch_rate": 4},
+    {"name": "Kraken", "type": "fish", "rarity": "Legendary", "catch_rate": 1},
+    {"name": "Old Boot", "type": "item", "rarity": "Common", "catch_rate": 2},
+    {"name": "Relic", "type": "item", "rarity": "Legendary", "catch_rate": 1},
+]
+
+
+def table_weights(table, scales):
+    weights = {}
+    for scale, (_, _, items, cumulative) in zip(scales, table.groups):
+        previous = 0.0
+        for item, upto in zip(items, cumulative):
+            weights[item["name"]] = scale * (upto - previous)
+            previous = upto
+    return weights
+
+
+def test_tables_filter_fish_by_minimum_rarity_and_penalize_items():
+    tables = Fishing.build_catch_tables(FISH_DATA)
+
+    common = table_weights(tables["Common"], tables["Common"].scales())
+    rare = table_weights(tables["Rare"], tables["Rare"].scales())
+
+    assert common == {"Carp": 10, "Pike": 4, "Kraken": 1, "Old Boot": 2, "Relic": 1}
+    # Fish below Rare drop out; a Common item is halved once per rarity step.
+    assert rare == {"Pike": 4, "Kraken": 1, "Old Boot": 0.5, "Relic": 1}
+
+
+def test_effect_multipliers_scale_whole_groups():
+    table = Fishing.build_catch_tables(FISH_DATA)["Common"]
+    effects = [
+        {"module_id": "fishing", "effect_id": "legendary_rate_1", "mult": 3},
+        {"module_id": "fishing", "effect_id": "item_rate_1", "mult": 2},
+        {"module_id": "fishing", "effect_id": "catch_rate_1", "mult": 0.5},
+        {"module_id": "casino", "effect_id": "catch_rate_1", "mult": 100},
+    ]
+    catch_mult, legendary_mult, item_mult, price_mult = Fishing.catch_multipliers(effects)
+    scales = table.scales(catch_mult, legendary_mult, item_mult)
+
+    assert price_mult == 1.0
+    assert table_weights(table, scales) == {"Carp": 5, "Pike": 2, "Kraken": 1.5, "Old Boot": 2, "Relic": 3}
+    assert table.total(scales) == 13.5
+
+
+def test_pick_matches_cumulative_weights():
+    table = CatchTable([({"name": "a"}, 1), ({"name": "b"}, 3)])
+    scales = table.scales()
+
+    assert table.pick(0.0, scales)["name"] == "a"
+    assert table.pick(0.99, scales)["name"] == "a"
+    assert table.pick(1.0, scales)["name"] == "b"
+    assert table.pick(3.99, scales)["name"] == "b"
+    assert table.pick(4.0, scales) is None
+
+
+def test_pick_distribution_follows_weights():
+    table = Fishing.build_catch_tables(FISH_DATA)["Common"]
+    scales = table.scales()
+    total = table.total(scales)
+    rng = random.Random(1234)
+    counts = {}
+    for _ in range(20000):
+        name = table.pick(rng.uniform(0, total), scales)["name"]
+        counts[name] = counts.get(name, 0) + 1
+
+    assert abs(counts["Carp"] / 20000 - 10 / 18) < 0.02
+    assert abs(counts["Relic"] / 20000 - 1 / 18) < 0.01
@@ -0,0 +1,34 @@
+import random
+import string
+
+from thefuzz import fuzz, process
+
+from util.fuzzy_index import FuzzyIndex
+
+
+def test_best_match_agrees_with_extract_one():
+    rng = random.Random(7)
+    choices = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 12))) for _ in range(200)]
+    choices += ["balance", "blackjack", "Golden Trout", "AK-47 | Redline"]
+    index = FuzzyIndex(choices)
+
+    for _ in range(500):
+        query = "".join(rng.choices(string.ascii_lowercase + " ", k=rng.randint(1, 14))).strip() or "x"
+        assert index.best_match(query)[1] == process.extractOne(query, choices, scorer=fuzz.ratio)[1]
+
+
+def test_min_score_and_empty_queries():
+    index = FuzzyIndex(["fish", "cast"])
+
+    assert index.best_match("fisj") == ("fish", 75)
+    assert index.best_match("zzzzzzzz", min_score=55) == (None, 0)
+    assert index.best_match("!!!") == (None, 0)
+    assert FuzzyIndex([]).best_match("fish") == (None, 0)
+
+
+def test_results_are_cached_with_lru_eviction():
+    index = FuzzyIndex(["fish", "cast"], cache_size=2)
+    for query in ("fsh", "cst", "fisj"):
+        index.best_match(query)
+
+    assert list(index._cache) == [("cst", 0), ("fisj", 0)]
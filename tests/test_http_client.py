@@ -0,0 +1,152 @@
+import json
+import time
+
+import pytest
+
+import util.cs2_case_api as cs2_case_api
+import util.http_client as http_client
+from util.catalog_warmup import CatalogWarmer
+from util.cs2_case_api import CS2CaseClient
+from util.http_client import CircuitOpenError, HTTPClientError, HttpClient, get_host_guard
+
+
+@pytest.fixture
+def breaker_env(monkeypatch):
+    monkeypatch.setenv("HTTP_BREAKER_FAILURE_THRESHOLD", "2")
+    monkeypatch.setenv("HTTP_BREAKER_RESET_SECONDS", "0.2")
+
+
+def test_get_json_returns_payload(stand_in_server):
+    stand_in_server.routes["/sets/blb"] = (200, {"name": "Bloomburrow"})
+
+    assert HttpClient(timeout=2).get_json(f"{stand_in_server.url}/sets/blb") == {"name": "Bloomburrow"}
+
+
+def test_breaker_opens_after_failures_and_fails_fast(stand_in_server, breaker_env):
+    stand_in_server.routes["/cards"] = (503, {"error": "down"})
+    client = HttpClient(timeout=2, max_retries=5, retry_backoff=0)
+
+    with pytest.raises(HTTPClientError):
+        client.get_json(f"{stand_in_server.url}/cards")
+    # Retries stop as soon as the breaker opens rather than exhausting max_retries.
+    assert len(stand_in_server.requests) == 2
+
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        client.get_json(f"{stand_in_server.url}/cards")
+    assert time.monotonic() - started < 0.1
+    assert len(stand_in_server.requests) == 2
+
+
+def test_breaker_half_opens_and_closes_on_success(stand_in_server, breaker_env):
+    stand_in_server.routes["/cards"] = (500, {})
+    client = HttpClient(timeout=2, max_retries=0)
+    for _ in range(2):
+        with pytest.raises(HTTPClientError):
+            client.get_json(f"{stand_in_server.url}/cards")
+    with pytest.raises(CircuitOpenError):
+        client.get_json(f"{stand_in_server.url}/cards")
+
+    stand_in_server.routes["/cards"] = (200, {"data": []})
+    time.sleep(0.25)
+
+    assert client.get_json(f"{stand_in_server.url}/cards") == {"data": []}
+    assert get_host_guard("127.0.0.1").breaker.state == "closed"
+
+
+def test_client_errors_do_not_trip_the_breaker(stand_in_server, breaker_env):
+    client = HttpClient(timeout=2, max_retries=3, retry_backoff=0)
+
+    for _ in range(3):
+        with pytest.raises(HTTPClientError) as excinfo:
+            client.get_json(f"{stand_in_server.url}/missing")
+        assert excinfo.value.status_code == 404
+
+    assert len(stand_in_server.requests) == 3
+    assert get_host_guard("127.0.0.1").breaker.state == "closed"
+
+
+def test_concurrency_cap_rejects_when_host_is_saturated(stand_in_server, monkeypatch):
+    monkeypatch.setenv("HTTP_MAX_CONCURRENCY_PER_HOST", "1")
+    stand_in_server.routes["/cards"] = (200, {})
+    guard = get_host_guard("127.0.0.1")
+    guard.slots.acquire()
+    try:
+        with pytest.raises(HTTPClientError, match="concurrent"):
+            HttpClient(timeout=0.05).get_json(f"{stand_in_server.url}/cards")
+    finally:
+        guard.slots.release()
+
+    assert stand_in_server.requests == []
+
+
+def test_cs2_client_serves_stale_crates_while_upstream_is_down(stand_in_server, breaker_env, tmp_path, monkeypatch):
+    cache_path = tmp_path / "cs2_crates_cache.json"
+    crates = [{"name": "Kilowatt Case", "contains": [{"name": "AK-47 | Inheritance", "rarity": {"name": "Covert"}}]}]
+    cache_path.write_text(
+        json.dumps({"updated_at": time.time() - 10 * 86400, "crates": crates, "item_prices": {"ak-47 | inheritance": 99.0}}),
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("CS2_CASE_CACHE_PATH", str(cache_path))
+    monkeypatch.setattr(CS2CaseClient, "CRATES_URL", f"{stand_in_server.url}/crates.json")
+    monkeypatch.setattr(CS2CaseClient, "STEAM_PRICE_URL", f"{stand_in_server.url}/market/priceoverview/")
+    stand_in_server.routes["/crates.json"] = (503, {})
+    stand_in_server.routes["/market/priceoverview/"] = (503, {})
+    warmer = CatalogWarmer(max_workers=2)
+    monkeypatch.setattr(cs2_case_api, "catalog_warmer", warmer)
+    client = CS2CaseClient(max_retries=0, save_delay=60)
+
+    pull = client.pull_case_item("Kilowatt Case", knife_pull_chance=0)
+
+    assert pull["name"] == "AK-47 | Inheritance"
+    assert pull["price"] == 99.0
+    assert warmer.wait("cs2_crates", timeout=2)
+    assert warmer.wait("cs2_prices", timeout=2)
+    assert "/crates.json" in stand_in_server.requests
+    assert client.has_crates()
+    warmer.shutdown()
+
+
+def test_only_warmup_fetches_are_rate_limited_and_never_while_holding_a_slot(stand_in_server, monkeypatch):
+    monkeypatch.setenv("HTTP_MAX_CONCURRENCY_PER_HOST", "1")
+    stand_in_server.routes["/cards"] = (200, {})
+    waits = []
+
+    def recording_wait(url):
+        guard = get_host_guard("127.0.0.1")
+        slot_free = guard.slots.acquire(timeout=0)
+        if slot_free:
+            guard.slots.release()
+        waits.append(slot_free)
+        return 0.0
+
+    monkeypatch.setattr(http_client.host_rate_limiter, "wait", recording_wait)
+    client = HttpClient(timeout=2)
+
+    client.get_json(f"{stand_in_server.url}/cards")
+    assert waits == []
+
+    warmer = CatalogWarmer(max_workers=1)
+    warmer.warm("cards", ["one"], lambda key: client.get_json(f"{stand_in_server.url}/cards"))
+    assert warmer.wait("cards", timeout=2)
+    warmer.shutdown()
+    assert waits == [True]
+
+
+def test_unexpected_error_in_a_half_open_trial_does_not_wedge_the_breaker(stand_in_server, breaker_env):
+    stand_in_server.routes["/cards"] = (500, {})
+    client = HttpClient(timeout=2, max_retries=0)
+    for _ in range(2):
+        with pytest.raises(HTTPClientError):
+            client.get_json(f"{stand_in_server.url}/cards")
+    time.sleep(0.25)
+
+    real_get = client.session.get
+    client.session.get = lambda *args, **kwargs: (_ for _ in ()).throw(KeyError("adapter bug"))
+    with pytest.raises(KeyError):
+        client.get_json(f"{stand_in_server.url}/cards")
+
+    client.session.get = real_get
+    stand_in_server.routes["/cards"] = (200, {"data": []})
+    time.sleep(0.25)
+    assert client.get_json(f"{stand_in_server.url}/cards") == {"data": []}
@@ -0,0 +1,73 @@
+import json
+import logging
+
+import pytest
+
+from util.localization import LocalizationManager
+
+
+@pytest.fixture
+def strings_dir(tmp_path):
+    (tmp_path / "en_US.json").write_text(json.dumps({
+        "commands": {
+            "greet": "Hello, {name}!",
+            "plain": "Nothing to format {{here}}",
+            "only_english": "English only",
+        },
+        "command_aliases": {"flip": ["coin"]},
+    }), encoding="utf-8")
+    (tmp_path / "pt_BR.json").write_text(json.dumps({
+        "commands": {"greet": "Olá, {name}!", "plain": "Nada"},
+    }), encoding="utf-8")
+    return str(tmp_path)
+
+
+def test_lookups_use_flat_catalog_with_default_merged(strings_dir):
+    manager = LocalizationManager(strings_dir)
+
+    assert manager.get_string("commands.greet", language="pt_BR", name="Ana") == "Olá, Ana!"
+    assert manager.get_string("commands.only_english", language="pt_BR") == "English only"
+    assert manager.get_value("command_aliases", language="pt_BR") == {"flip": ["coin"]}
+    assert manager.get_value("command_aliases.flip", language="pt_BR") == ["coin"]
+    assert manager.get_value("commands.missing", language="pt_BR", default="x") == "x"
+
+
+def test_placeholder_free_templates_skip_formatting(strings_dir):
+    manager = LocalizationManager(strings_dir)
+
+    assert manager.get_string("commands.plain", language="pt_BR", unused=1) == "Nada"
+    assert manager._strings["pt_BR"]["commands.plain"].needs_format is False
+    assert manager._strings["en_US"]["commands.greet"].needs_format is True
+    # Without arguments templates are returned as written, as before.
+    assert manager.get_string("commands.plain") == "Nothing to format {{here}}"
+    assert manager.get_string("commands.greet") == "Hello, {name}!"
+
+
+def test_unknown_language_falls_back_without_rereading_disk(strings_dir, monkeypatch):
+    manager = LocalizationManager(strings_dir)
+    assert manager.get_string("commands.greet", language="xx_XX", name="Bo") == "Hello, Bo!"
+
+    monkeypatch.setattr(manager, "_load_language", lambda code: pytest.fail("reloaded from disk"))
+    assert manager.get_string("commands.greet", language="xx_XX", name="Bo") == "Hello, Bo!"
+
+
+def test_client_language_codes_are_normalized_and_never_cached_when_unknown(strings_dir):
+    manager = LocalizationManager(strings_dir)
+
+    assert manager.get_string("commands.greet", language="pt-br", name="Ana") == "Olá, Ana!"
+    for code in [f"zz_{n}" for n in range(50)] + ["../../etc/passwd", "pt_BR/../en_US"]:
+        assert manager.get_string("commands.greet", language=code, name="Bo") == "Hello, Bo!"
+
+    assert set(manager._strings) == {"en_US", "pt_BR"}
+    assert set(manager._values) == {"en_US", "pt_BR"}
+    assert manager.resolve_language(" PT_br ") == "pt_BR"
+
+
+def test_missing_key_warning_is_rate_limited(strings_dir, caplog):
+    manager = LocalizationManager(strings_dir)
+
+    with caplog.at_level(logging.WARNING, logger="util.localization"):
+        for _ in range(5):
+            assert manager.get_string("commands.nope") == "commands.nope"
+
+    assert [r.getMessage() for r in caplog.records] == ["Translation key not found: commands.nope"]
@@ -0,0 +1,138 @@
+import json
+import logging
+import threading
+
+from util.log_pipeline import JsonFormatter, LogPipeline, SamplingFilter
+
+
+class RecordingHandler(logging.Handler):
+    """Collects formatted lines and the thread that emitted them."""
+
+    def __init__(self, formatter=None):
+        super().__init__()
+        self.lines = []
+        self.threads = set()
+        self.setFormatter(formatter or logging.Formatter("%(levelname)s %(message)s"))
+
+    def emit(self, record):
+        self.threads.add(threading.current_thread().name)
+        self.lines.append(self.format(record))
+
+
+def make_record(name, level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_records_are_written_by_the_listener_thread():
+    handler = RecordingHandler()
+    pipeline = LogPipeline([handler])
+    logger = logging.getLogger("tests.log_pipeline.listener")
+    pipeline.attach(logger)
+    pipeline.start()
+
+    logger.info("hello %s", "world")
+    logger.debug("not enabled %s", "at INFO")
+    pipeline.stop()
+    logger.info("after stop")
+
+    assert handler.lines == ["INFO hello world"]
+    assert threading.current_thread().name not in handler.threads
+    assert pipeline.handler not in logger.handlers
+
+
+def test_exceptions_survive_the_queue():
+    handler = RecordingHandler(JsonFormatter())
+    pipeline = LogPipeline([handler])
+    logger = logging.getLogger("tests.log_pipeline.exceptions")
+    pipeline.attach(logger)
+    pipeline.start()
+
+    try:
+        raise ValueError("bad fish")
+    except ValueError:
+        logger.exception("command failed")
+    pipeline.stop()
+
+    entry = json.loads(handler.lines[0])
+    assert entry["message"] == "command failed"
+    assert entry["level"] == "ERROR"
+    assert "ValueError: bad fish" in entry["exc_info"]
+
+
+def test_json_formatter_includes_extra_fields():
+    entry = json.loads(JsonFormatter().format(make_record("server.server", session="s1", platform="cs2")))
+
+    assert entry["message"] == "hello world"
+    assert entry["logger"] == "server.server"
+    assert (entry["session"], entry["platform"]) == ("s1", "cs2")
+    assert "args" not in entry
+
+
+def test_sampling_keeps_one_in_n_per_logger_and_never_drops_warnings():
+    sampler = SamplingFilter({"chatty": 3, "quiet": 1})
+
+    kept = [sampler.filter(make_record("chatty.child")) for _ in range(6)]
+    assert kept == [True, False, False, True, False, False]
+    assert all(sampler.filter(make_record("chatty", level=logging.WARNING)) for _ in range(3))
+    assert all(sampler.filter(make_record(name)) for name in ("quiet", "other", "chattyish") for _ in range(3))
+
+
+def test_from_config_reads_logging_section(monkeypatch):
+    monkeypatch.setattr(logging, "FileHandler", lambda *_args, **_kwargs: logging.NullHandler())
+
+    pipeline = LogPipeline.from_config(
+        {"logging": {"level": "debug", "format": "json", "sample_every": {"server.server": 10}}}, "unused.log"
+    )
+
+    assert pipeline.level == logging.DEBUG
+    assert all(isinstance(handler.formatter, JsonFormatter) for handler in pipeline.handlers)
+    assert isinstance(pipeline.handler.filters[0], SamplingFilter)
+    assert LogPipeline.from_config({}, "unused.log").level == logging.INFO
+
+
+def test_bot_server_tags_records_with_the_request_session(bot_server):
+    handler = RecordingHandler(JsonFormatter())
+    handler.setLevel(logging.DEBUG)
+    bot_server._log_pipeline.listener.handlers += (handler,)
+    bot_server.logger.setLevel(logging.DEBUG)
+
+    @bot_server.commands.register("echo")
+    def _echo(bot, is_team, playername, chattext):
+        return chattext
+
+    bot_server.process_message(False, "alice", "!echo hi", session_id="room-7", platform="discord")
+    bot_server._log_pipeline.stop()
+
+    entries = [json.loads(line) for line in handler.lines]
+    executing = [entry for entry in entries if entry["message"].startswith("Executing command: echo")]
+    assert executing and executing[0]["session"] == "room-7"
+    assert executing[0]["platform"] == "discord"
+
+
+def test_bot_server_pipeline_covers_module_loggers_and_samples_by_fixed_name(bot_server):
+    handler = RecordingHandler()
+    bot_server._log_pipeline.listener.handlers += (handler,)
+    bot_server._log_pipeline.handler.addFilter(SamplingFilter({"server.server": 2}))
+
+    for _ in range(4):
+        bot_server.logger.info("server line")
+    logging.getLogger("util.http_client").info("client line")
+    bot_server._log_pipeline.stop()
+
+    assert bot_server.logger.name == "server.server"
+    assert handler.lines.count("INFO server line") == 2
+    assert "INFO client line" in handler.lines
+
+
+def test_stop_restores_the_attached_logger_level():
+    logger = logging.getLogger("tests.log_pipeline.level")
+    logger.setLevel(logging.WARNING)
+    pipeline = LogPipeline([RecordingHandler()], level=logging.DEBUG)
+    pipeline.attach(logger)
+    pipeline.start()
+
+    assert logger.level == logging.DEBUG
+    pipeline.stop()
+    assert logger.level == logging.WARNING
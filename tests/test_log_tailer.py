@@ -0,0 +1,141 @@
+import os
+import queue
+import sys
+import threading
+
+import pytest
+
+from util.log_tailer import InotifyWatcher, LogTailer, PollingWatcher, create_watcher
+
+
+def start_tailer(path, watcher=None, parse=None):
+    """Run a tailer in a background thread; returns (received queue, stop function)."""
+    received = queue.Queue()
+    stop_event = threading.Event()
+    tailer = LogTailer(str(path), watcher=watcher or PollingWatcher(max_interval=0.05), stop_event=stop_event)
+    assert tailer.read_available() == []  # opens at the end, skipping what is already there
+
+    def consume():
+        batches = tailer.parsed_batches(parse) if parse else tailer.batches()
+        for batch in batches:
+            for item in batch:
+                received.put(item)
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+
+    def stop(nudge=None):
+        stop_event.set()
+        if nudge:
+            nudge()  # wake a watcher that is blocked on notifications
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+
+    return received, stop
+
+
+def append(path, text):
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "console.log"
+    path.write_text("old line\n", encoding="utf-8")
+    return path
+
+
+def test_follows_appended_lines_after_existing_content(log_path):
+    received, stop = start_tailer(log_path)
+    try:
+        append(log_path, "first\nsecond\n")
+
+        assert received.get(timeout=2) == "first\n"
+        assert received.get(timeout=2) == "second\n"
+    finally:
+        stop()
+
+
+def test_partial_lines_wait_for_their_newline(log_path):
+    received, stop = start_tailer(log_path)
+    try:
+        append(log_path, "half a ")
+        with pytest.raises(queue.Empty):
+            received.get(timeout=0.2)
+        append(log_path, "line\n")
+
+        assert received.get(timeout=2) == "half a line\n"
+    finally:
+        stop()
+
+
+def test_truncation_restarts_from_the_beginning(log_path):
+    received, stop = start_tailer(log_path)
+    try:
+        # Shorter than the read position, as when the game restarts and rewrites the log.
+        log_path.write_text("new\n", encoding="utf-8")
+
+        assert received.get(timeout=2) == "new\n"
+    finally:
+        stop()
+
+
+def test_rotation_switches_to_the_new_file(log_path):
+    received, stop = start_tailer(log_path)
+    try:
+        append(log_path, "before rotate\n")
+        os.replace(log_path, str(log_path) + ".1")
+        log_path.write_text("after rotate\n", encoding="utf-8")
+
+        assert received.get(timeout=2) == "before rotate\n"
+        assert received.get(timeout=2) == "after rotate\n"
+    finally:
+        stop()
+
+
+def test_parsed_batches_drop_unparsed_lines(log_path):
+    def parse(line):
+        name, _, text = line.strip().partition(": ")
+        return (name, text) if text else None
+
+    received, stop = start_tailer(log_path, parse=parse)
+    try:
+        append(log_path, "noise\nBo: !fish\n")
+        assert received.get(timeout=2) == ("Bo", "!fish")
+    finally:
+        stop()
+
+
+def test_polling_backs_off_while_idle_and_resets():
+    watcher = PollingWatcher(min_interval=0.01, max_interval=0.04)
+    stop_event = threading.Event()
+    stop_event.set()  # wait() returns immediately but still advances the backoff
+
+    for _ in range(4):
+        watcher.wait(stop_event)
+    assert watcher._interval == 0.04
+
+    watcher.reset()
+    assert watcher._interval == 0.01
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_inotify_backend_wakes_on_append(log_path):
+    watcher = create_watcher(str(log_path), "inotify", max_interval=30)
+    assert isinstance(watcher, InotifyWatcher)
+
+    received, stop = start_tailer(log_path, watcher=watcher)
+    try:
+        append(log_path, "notified\n")
+
+        # Far quicker than the 30s fallback timeout, so the wakeup came from inotify.
+        assert received.get(timeout=5) == "notified\n"
+    finally:
+        stop(nudge=lambda: append(log_path, "wake\n"))
+
+
+def test_unavailable_backend_falls_back_to_polling(log_path):
+    assert isinstance(create_watcher(str(log_path), "poll"), PollingWatcher)
+    assert isinstance(create_watcher(str(log_path / "missing" / "console.log"), "inotify"), PollingWatcher)
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+import server.server as server_module
+from server.asgi import create_asgi_app
+from util.database import _QueryTimingMixin
+from util.localization import LocalizationManager
+from util.metrics import MetricsRegistry, cache_requests, registry
+
+
+def sample(text, series):
+    """Value of one series line (``name{labels}``) in rendered metrics, or None."""
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_render_counters_histograms_and_callbacks():
+    metrics = MetricsRegistry()
+    requests = metrics.counter("demo_requests_total", "Requests.", ("path",))
+    latency = metrics.histogram("demo_seconds", "Latency.", buckets=(0.1, 1.0))
+    metrics.callback("demo_pool", "Pool.", lambda: {("idle",): 2, ("in_use",): 1}, labelnames=("state",))
+    metrics.callback("demo_absent", "Omitted when the callback returns None.", lambda: None)
+
+    requests.labels('a"b\\c').inc()
+    requests.labels('a"b\\c').inc(2)
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+
+    text = metrics.render()
+    assert "# TYPE demo_requests_total counter" in text
+    assert sample(text, 'demo_requests_total{path="a\\"b\\\\c"}') == 3
+    assert sample(text, 'demo_seconds_bucket{le="0.1"}') == 1
+    assert sample(text, 'demo_seconds_bucket{le="1"}') == 2
+    assert sample(text, 'demo_seconds_bucket{le="+Inf"}') == 3
+    assert sample(text, "demo_seconds_count") == 3
+    assert sample(text, "demo_seconds_sum") == pytest.approx(5.55)
+    assert sample(text, 'demo_pool{state="idle"}') == 2
+    assert "demo_absent" not in text
+
+
+def test_registration_is_idempotent_and_series_are_capped():
+    metrics = MetricsRegistry()
+    counter = metrics.counter("demo_total", "Demo.", ("session",), max_series=2)
+
+    assert metrics.counter("demo_total", "Demo.", ("session",)) is counter
+    with pytest.raises(ValueError):
+        metrics.histogram("demo_total", "Demo.", ("session",))
+
+    for session in ("a", "b", "c", "d"):
+        counter.labels(session).inc()
+    text = metrics.render()
+    assert sample(text, 'demo_total{session="other"}') == 2
+    assert sample(text, 'demo_total{session="c"}') is None
+
+
+def test_metrics_endpoint_reports_commands_messages_and_spam(bot_server, monkeypatch):
+    monkeypatch.setattr(server_module, "bot_server", bot_server)
+    bot_server._spam_max_messages = 1
+
+    @bot_server.commands.register("echo", aliases=["say"])
+    def _echo(bot, is_team, playername, chattext):
+        return f"{playername}: {chattext}"
+
+    @bot_server.commands.register("boom")
+    def _boom(bot, is_team, playername, chattext):
+        raise RuntimeError("boom")
+
+    client = server_module.app.test_client()
+    before = client.get("/metrics").get_data(as_text=True)
+    for playername, chattext in [("alice", "!say hi"), ("bob", "!boom"), ("bob", "!boom")]:
+        client.post("/process_message", json={
+            "playername": playername, "chattext": chattext, "platform": "cs2", "session_id": "metrics-test",
+        })
+    response = client.get("/metrics")
+    after = response.get_data(as_text=True)
+
+    def delta(series):
+        return (sample(after, series) or 0) - (sample(before, series) or 0)
+
+    assert response.content_type.startswith("text/plain")
+    assert delta('bot_messages_total{platform="cs2",session="metrics-test"}') == 3
+    assert delta('bot_command_duration_seconds_count{command="echo"}') == 1
+    assert delta('bot_command_errors_total{command="boom"}') == 1
+    assert delta("bot_antispam_cooldowns_total") == 1
+    assert delta("bot_antispam_blocked_total") == 1
+    assert delta('bot_request_duration_seconds_count{platform="cs2"}') == 2
+
+
+
+def test_failing_command_lookup_is_counted_as_a_command_error(bot_server, monkeypatch):
+    def broken_resolve(*_args, **_kwargs):
+        raise RuntimeError("alias table unavailable")
+
+    monkeypatch.setattr(bot_server.commands, "resolve", broken_resolve)
+    errors = server_module._command_errors.labels("unknown")
+    before = errors.value
+
+    assert isinstance(bot_server.process_message(False, "alice", "!balance"), list)
+    assert isinstance(asyncio.run(bot_server.process_message_async(False, "alice", "!balance")), list)
+    assert errors.value - before == 2
+
+def test_asgi_serves_metrics_as_text(bot_server):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(create_asgi_app(bot_server)({"type": "http", "method": "GET", "path": "/metrics"}, receive, send))
+
+    assert sent[0]["status"] == 200
+    assert dict(sent[0]["headers"])[b"content-type"].startswith(b"text/plain")
+    assert b"# TYPE bot_cache_requests_total counter" in sent[1]["body"]
+
+
+def test_database_cursors_record_query_counts_and_errors():
+    class FakeCursor:
+        def execute(self, query, vars=None):
+            if "fail" in query:
+                raise RuntimeError("syntax error")
+
+    class Cursor(_QueryTimingMixin, FakeCursor):
+        pass
+
+    before = registry.render()
+    cursor = Cursor()
+    cursor.execute("SELECT 1")
+    cursor.execute("  update fish set caught = caught + 1")
+    with pytest.raises(RuntimeError):
+        cursor.execute("select fail")
+    after = registry.render()
+
+    def delta(series):
+        return (sample(after, series) or 0) - (sample(before, series) or 0)
+
+    assert delta('bot_db_query_duration_seconds_count{operation="select"}') == 2
+    assert delta('bot_db_query_duration_seconds_count{operation="update"}') == 1
+    assert delta('bot_db_query_errors_total{operation="select"}') == 1
+
+
+def test_localization_lookups_count_hits_and_misses(tmp_path):
+    (tmp_path / "en_US.json").write_text('{"greeting": "hi"}', encoding="utf-8")
+    manager = LocalizationManager(str(tmp_path))
+    hits = cache_requests.labels("localization", "hit")
+    misses = cache_requests.labels("localization", "miss")
+    hits_before, misses_before = hits.value, misses.value
+
+    manager.get_string("greeting")
+    manager.get_string("missing.key")
+
+    assert hits.value - hits_before == 1
+    assert misses.value - misses_before == 1
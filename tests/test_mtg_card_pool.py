@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+import util.mtg_tcg_api as mtg_tcg_api
+from util.mtg_tcg_api import MTGTCGClient
+
+
+def scryfall_card(name, rarity="common", usd="0.10"):
+    return {"name": name, "rarity": rarity, "set_name": "Bloomburrow", "prices": {"usd": usd}}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("MTG_TCG_CACHE_PATH", str(tmp_path / "mtg_tcg_cache.json"))
+    monkeypatch.setenv("MTG_TCG_STORE_PATH", str(tmp_path / "mtg_tcg_cards.sqlite3"))
+    client = MTGTCGClient()
+    client.requests = []
+
+    pages = {
+        1: {"data": [scryfall_card("Forest"), scryfall_card("Maha", "mythic", "12.00")], "has_more": True},
+        2: {"data": [scryfall_card("Pawpatch Recruit", "rare", "15.50"), scryfall_card("Island")], "has_more": False},
+    }
+
+    def fake_get(path, params=None):
+        client.requests.append((path, dict(params or {})))
+        if path == "/sets/blb":
+            return {"name": "Bloomburrow"}
+        if path == "/cards/search":
+            return pages[params["page"]]
+        raise AssertionError(f"unexpected request {path}")
+
+    monkeypatch.setattr(client, "_get", fake_get)
+    return client
+
+
+def test_set_is_fetched_once_with_pagination_then_served_locally(client):
+    client.prewarm_set("BLB")
+    fetched = len(client.requests)
+
+    pulls = [client.pull_pack_card("blb", good_pull_chance=0) for _ in range(20)]
+
+    assert [path for path, _ in client.requests] == ["/sets/blb", "/cards/search", "/cards/search"]
+    assert len(client.requests) == fetched
+    assert client.is_set_cached("blb")
+    assert {pull["name"] for pull in pulls} <= {"Forest", "Maha", "Pawpatch Recruit", "Island"}
+    assert all(pull["set_name"] == "Bloomburrow" for pull in pulls)
+
+
+def test_good_pulls_come_from_mythic_and_high_price_pool(client):
+    client.prewarm_set("blb")
+
+    pulls = [client.pull_pack_card("blb", good_pull_chance=1) for _ in range(20)]
+
+    assert {pull["name"] for pull in pulls} <= {"Maha", "Pawpatch Recruit"}
+    assert all(pull["good_hit"] for pull in pulls)
+    assert {pull["rarity"] for pull in pulls} <= {"Mythic", "Rare"}
+
+
+def test_stale_pool_is_served_and_refreshed_in_background(client, monkeypatch):
+    client.prewarm_set("blb")
+    client._store.replace_set(
+        "mtg", "blb", client._store.cards("mtg", "blb"), updated_at=time.time() - client._cache_ttl_seconds - 1
+    )
+    scheduled = []
+    monkeypatch.setattr(
+        mtg_tcg_api.catalog_warmer, "warm", lambda catalog, keys, warm_one: scheduled.append((catalog, list(keys)))
+    )
+    requests_before = len(client.requests)
+
+    pull = client.pull_pack_card("blb", good_pull_chance=0)
+
+    assert pull["name"] in {"Forest", "Maha", "Pawpatch Recruit", "Island"}
+    assert len(client.requests) == requests_before
+    assert scheduled == [("mtg", ["blb"])]
+
+
+def test_uncached_set_is_warmed_in_background_and_pulled_with_one_request(client, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(
+        mtg_tcg_api.catalog_warmer, "warm", lambda catalog, keys, warm_one: scheduled.append((catalog, list(keys)))
+    )
+    monkeypatch.setattr(client, "_pull_random_card", lambda query: scryfall_card("Plains"))
+
+    pull = client.pull_pack_card("blb", good_pull_chance=0)
+
+    assert pull["name"] == "Plains"
+    assert scheduled == [("mtg", ["blb"])]
+    assert [path for path, _ in client.requests] == ["/sets/blb"]
@@ -0,0 +1,62 @@
+import json
+
+from util.name_index import NameIndex
+
+
+CASES = [
+    {"name": "Kilowatt Case", "aliases": ["kilo", "kw"]},
+    {"name": "Scarlet & Violet Booster", "aliases": ["sv"]},
+    {"name": "Bloomburrow Pack", "aliases": []},
+]
+
+
+def case_index():
+    return NameIndex(((case["name"], case["aliases"], case) for case in CASES), fuzzy_aliases=True)
+
+
+def test_tiers_resolve_in_order():
+    index = case_index()
+
+    assert index.resolve("  KILOWATT   case ")["name"] == "Kilowatt Case"
+    assert index.resolve("kw")["name"] == "Kilowatt Case"
+    assert index.resolve("violet", substring=True)["name"] == "Scarlet & Violet Booster"
+    assert index.resolve("violet") is None
+    assert index.resolve("bloomburow pack", fuzzy_min=75)["name"] == "Bloomburrow Pack"
+    assert index.resolve("kilk", fuzzy_min=75)["name"] == "Kilowatt Case"
+    assert index.resolve("zzzz", substring=True, fuzzy_min=75) is None
+    assert index.get("kw") is None
+
+
+def test_accept_filters_every_tier_and_skips_cache():
+    index = case_index()
+    allowed = {"Bloomburrow Pack"}
+
+    assert index.resolve("kilowatt case", fuzzy_min=60, accept=lambda case: case["name"] in allowed) is None
+    assert index.resolve("bloomburrow", substring=True, accept=lambda case: case["name"] in allowed)["name"] == "Bloomburrow Pack"
+    assert not index._cache
+
+
+def test_results_are_cached():
+    index = case_index()
+    index.resolve("kilowat case", fuzzy_min=75)
+    index._fuzzy = None  # a cached query must not reach the fuzzy tier again
+
+    assert index.resolve("kilowat case", fuzzy_min=75)["name"] == "Kilowatt Case"
+
+
+def test_indexes_build_from_shipped_catalogs():
+    with open("modules/data/shop.json", encoding="utf-8") as handle:
+        shop = json.load(handle)
+    with open("modules/data/fish.json", encoding="utf-8") as handle:
+        fish = json.load(handle)
+
+    shop_index = NameIndex(
+        (item["name"], item.get("aliases", []), (category, item))
+        for category, items in shop.items()
+        for item in items
+    )
+    fish_index = NameIndex((item["name"], (), item) for item in fish)
+
+    first_category, items = next(iter(shop.items()))
+    assert shop_index.resolve(items[0]["name"].upper())[0] == first_category
+    assert fish_index.get(fish[0]["name"].lower()) is fish[0]
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import threading
+
+from server.asgi import create_asgi_app
+
+
+def call_app(app, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    asyncio.run(app(scope, receive, send))
+    status = sent[0]["status"]
+    return status, json.loads(sent[1]["body"])
+
+
+def test_health_endpoint(bot_server):
+    app = create_asgi_app(bot_server)
+
+    assert call_app(app, "GET", "/health") == (200, {"status": "ok"})
+    assert call_app(app, "POST", "/health")[0] == 405
+    assert call_app(app, "GET", "/missing")[0] == 404
+
+
+def test_process_message_runs_blocking_command_in_pool(bot_server):
+    app = create_asgi_app(bot_server)
+    main_thread = threading.get_ident()
+
+    @bot_server.commands.register("balance")
+    def _balance(bot, is_team, playername, chattext):
+        assert threading.get_ident() != main_thread
+        bot.add_to_chat_queue(is_team, f"{playername}: $10 ({bot.language})")
+
+    status, body = call_app(app, "POST", "/process_message", {
+        "is_team": True,
+        "playername": "alice",
+        "chattext": "!balance",
+        "platform": "cs2",
+        "language": "pt_BR",
+    })
+
+    assert status == 200
+    assert body == {"responses": [{"is_team": True, "text": "alice: $10 (pt_BR)"}]}
+
+
+def test_process_message_awaits_async_command_on_event_loop(bot_server):
+    app = create_asgi_app(bot_server)
+
+    @bot_server.commands.register("ping")
+    async def _ping(bot, is_team, playername, chattext):
+        await asyncio.sleep(0)
+        bot.add_to_chat_queue(is_team, f"{playername}: pong from {bot.platform}")
+        return f"{playername}: done"
+
+    status, body = call_app(app, "POST", "/process_message", {
+        "playername": "bob",
+        "chattext": "!ping",
+        "platform": "discord",
+    })
+
+    assert status == 200
+    assert [r["text"] for r in body["responses"]] == ["bob: pong from discord", "bob: done"]
+
+
+def test_slow_command_does_not_block_cheap_commands(bot_server):
+    release = threading.Event()
+
+    @bot_server.commands.register("open", slow=True)
+    def _open(bot, is_team, playername, chattext):
+        release.wait(timeout=5)
+        return "opened"
+
+    @bot_server.commands.register("balance")
+    def _balance(bot, is_team, playername, chattext):
+        return "balance"
+
+    async def scenario():
+        slow_calls = [
+            asyncio.ensure_future(bot_server.process_message_async(False, f"p{i}", "!open", session_id=f"s{i}"))
+            for i in range(bot_server._slow_command_workers + 2)
+        ]
+        await asyncio.sleep(0.05)
+        cheap = await asyncio.wait_for(bot_server.process_message_async(False, "alice", "!balance"), timeout=2)
+        release.set()
+        await asyncio.gather(*slow_calls)
+        return cheap
+
+    assert asyncio.run(scenario()) == [{"is_team": False, "text": "balance"}]
+
+
+def test_missing_fields_are_rejected(bot_server):
+    app = create_asgi_app(bot_server)
+
+    assert call_app(app, "POST", "/process_message", {"playername": "alice"}) == (400, {"error": "Missing required fields"})
+    assert call_app(app, "POST", "/process_message") == (400, {"error": "No data provided"})
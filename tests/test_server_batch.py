@@ -0,0 +1,68 @@
+import asyncio
+
+import server.server as server_module
+
+
+def register_echo(bot_server, calls):
+    @bot_server.commands.register("echo")
+    def _echo(bot, is_team, playername, chattext):
+        calls.append((bot.get_request_session(), chattext))
+        return f"{playername}: {chattext}"
+
+
+def test_batch_endpoint_returns_results_in_request_order(bot_server, monkeypatch):
+    monkeypatch.setattr(server_module, "bot_server", bot_server)
+    calls = []
+    register_echo(bot_server, calls)
+    client = server_module.app.test_client()
+
+    response = client.post("/process_messages", json={"messages": [
+        {"playername": "alice", "chattext": "!echo 1", "session_id": "a"},
+        {"playername": "bob", "chattext": "!echo 2", "session_id": "b"},
+        {"playername": "alice", "chattext": "!echo 3", "session_id": "a"},
+    ]})
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [r["responses"][0]["text"] for r in results] == ["alice: 1", "bob: 2", "alice: 3"]
+    assert calls == [("a", "1"), ("b", "2"), ("a", "3")]
+
+
+def test_batch_endpoint_reports_errors_per_message(bot_server, monkeypatch):
+    monkeypatch.setattr(server_module, "bot_server", bot_server)
+    register_echo(bot_server, [])
+    client = server_module.app.test_client()
+
+    response = client.post("/process_messages", json={"messages": [
+        {"playername": "alice", "chattext": "!echo ok"},
+        {"playername": "", "chattext": "!echo missing player"},
+    ]})
+
+    results = response.get_json()["results"]
+    assert results[0] == {"responses": [{"is_team": False, "text": "alice: ok"}]}
+    assert results[1] == {"error": "Missing required fields", "status": 400}
+
+
+def test_batch_endpoint_rejects_empty_and_oversized_batches(bot_server, monkeypatch):
+    monkeypatch.setattr(server_module, "bot_server", bot_server)
+    client = server_module.app.test_client()
+
+    assert client.post("/process_messages", json={"messages": []}).status_code == 400
+    too_many = [{"playername": "alice", "chattext": "hi"}] * (bot_server._max_batch_size + 1)
+    assert client.post("/process_messages", json={"messages": too_many}).status_code == 400
+
+
+def test_async_batch_keeps_per_session_order(bot_server):
+    calls = []
+    register_echo(bot_server, calls)
+    messages = [
+        {"playername": "alice", "chattext": f"!echo {i}", "session_id": "a" if i % 2 else "b"}
+        for i in range(6)
+    ]
+
+    payload, status = asyncio.run(bot_server.handle_batch_request_async({"messages": messages}))
+
+    assert status == 200
+    assert [r["responses"][0]["text"] for r in payload["results"]] == [f"alice: {i}" for i in range(6)]
+    assert [text for session, text in calls if session == "a"] == ["1", "3", "5"]
+    assert [text for session, text in calls if session == "b"] == ["0", "2", "4"]
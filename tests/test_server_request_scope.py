@@ -0,0 +1,45 @@
+import threading
+
+
+def test_concurrent_requests_keep_their_own_responses(bot_server):
+    bot = bot_server
+    barrier = threading.Barrier(2, timeout=5)
+
+    @bot.commands.register("echo")
+    def _echo(bot, is_team, playername, chattext):
+        bot.add_to_chat_queue(is_team, f"{playername}: first {chattext}")
+        # Both requests are mid-command here; neither may see the other's output.
+        barrier.wait()
+        bot.add_to_chat_queue(is_team, f"{playername}: second {bot.platform}")
+
+    results = {}
+
+    def run(player, platform):
+        results[player] = bot.process_message(False, player, "!echo hi", session_id=player, platform=platform)
+
+    threads = [
+        threading.Thread(target=run, args=("alice", "cs2")),
+        threading.Thread(target=run, args=("bob", "discord")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [r["text"] for r in results["alice"]] == ["alice: first hi", "alice: second cs2"]
+    assert [r["text"] for r in results["bob"]] == ["bob: first hi", "bob: second discord"]
+
+
+def test_responses_do_not_leak_into_next_request(bot_server):
+    bot = bot_server
+
+    @bot.commands.register("ping")
+    def _ping(bot, is_team, playername, chattext):
+        bot.add_to_chat_queue(is_team, "pong")
+
+    assert bot.process_message(True, "alice", "!ping") == [{"is_team": True, "text": "pong"}]
+    assert bot.process_message(True, "alice", "!ping") == [{"is_team": True, "text": "pong"}]
+
+    # Outside of a request there is no collector; the response is dropped, not shared.
+    bot.add_to_chat_queue(True, "stray")
+    assert bot.process_message(True, "alice", "!ping") == [{"is_team": True, "text": "pong"}]
@@ -0,0 +1,122 @@
+import pytest
+
+import util.database as database
+from modules.shop import Shop
+from util.database import DatabaseConnection, unit_of_work
+
+
+class LedgerCursor:
+    """Understands savepoint statements plus symbolic ``("DEBIT"|"GRANT", params)`` writes."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        conn = self.conn
+        if query.startswith("SAVEPOINT "):
+            conn.savepoints.append((query.split()[-1], len(conn.pending)))
+        elif query.startswith("RELEASE SAVEPOINT "):
+            name = query.split()[-1]
+            while conn.savepoints.pop()[0] != name:
+                pass
+        elif query.startswith("ROLLBACK TO SAVEPOINT "):
+            name = query.split()[-1]
+            while conn.savepoints[-1][0] != name:
+                conn.savepoints.pop()
+            del conn.pending[conn.savepoints[-1][1]:]
+        else:
+            conn.pending.append((query, params))
+
+    def close(self):
+        pass
+
+
+class LedgerConnection:
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self.pending = []
+        self.savepoints = []
+
+    def cursor(self):
+        return LedgerCursor(self)
+
+    def commit(self):
+        for query, (user, value) in self.pending:
+            if query == "DEBIT":
+                self.ledger.balances[user] -= value
+            else:
+                self.ledger.items.append((user, value))
+        self.pending.clear()
+
+    def rollback(self):
+        self.pending.clear()
+        self.savepoints.clear()
+
+
+class Ledger:
+    def __init__(self):
+        self.balances = {"alice": 100}
+        self.items = []
+
+
+class LedgerEconomy:
+    def __init__(self, ledger):
+        self.ledger = ledger
+
+    def deduct_balance(self, user, amount):
+        if self.ledger.balances[user] < amount:
+            return {"error": "insufficient funds", "balance": self.ledger.balances[user]}
+        with DatabaseConnection() as cursor:
+            cursor.execute("DEBIT", (user, amount))
+        return self.ledger.balances[user] - amount
+
+    def add_balance(self, user, amount):
+        raise AssertionError("a failed purchase must not be refunded by hand")
+
+
+class BrokenInventory:
+    """Records the item write, then fails the way a constraint violation would."""
+
+    def list_inventory(self, user):
+        return []
+
+    def add_item(self, user, item_name, item_data, quantity=1):
+        with DatabaseConnection() as cursor:
+            cursor.execute("GRANT", (user, item_name))
+            raise RuntimeError("inventory write failed")
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    ledger = Ledger()
+    monkeypatch.setattr(database, "get_connection", lambda: LedgerConnection(ledger))
+    monkeypatch.setattr(database, "return_connection", lambda conn: None)
+    return ledger
+
+
+def make_shop(ledger):
+    shop = Shop.__new__(Shop)
+    shop.shop = {"Rods": [{"name": "Wooden Rod", "price": 30}]}
+    shop.load_shop_categories()
+    shop.economy = LedgerEconomy(ledger)
+    shop.inventory = BrokenInventory()
+    return shop
+
+
+def test_failed_delivery_leaves_the_balance_unchanged(ledger):
+    result = make_shop(ledger).buy("alice", "wooden rod")
+
+    assert "inventory write failed" in result["error"]
+    assert ledger.balances == {"alice": 100}
+    assert ledger.items == []
+
+
+def test_failed_delivery_inside_a_message_unit_keeps_earlier_writes(ledger):
+    with unit_of_work():
+        with DatabaseConnection() as cursor:
+            cursor.execute("GRANT", ("alice", "Daily Bait"))
+        result = make_shop(ledger).buy("alice", "wooden rod")
+
+    assert "error" in result
+    assert ledger.balances == {"alice": 100}
+    assert ledger.items == [("alice", "Daily Bait")]
@@ -0,0 +1,131 @@
+import threading
+
+import pytest
+
+import modules.status_effects as status_effects_module
+from modules.status_effects import StatusEffects
+from util.database import unit_of_work
+
+
+EFFECT_DATA = {
+    "fishing": {"price_50": {"mult": 1.5, "duration": 120, "description": "Fish Sell Price +50%"}},
+    "casino": {"luck_10": {"mult": 1.1, "duration": 60, "description": "Luck +10%"}},
+}
+
+
+class EffectsTable:
+    """In-memory status_effects table answering the module's statements."""
+
+    def __init__(self, rows=None):
+        self.rows = dict(rows or {})  # (user_id, effect_name) -> expiration_time
+        self.reads = 0
+
+    def respond(self, query, params):
+        if query.startswith("SELECT"):
+            self.reads += 1
+            user, now = params
+            return [(name, expires) for (owner, name), expires in self.rows.items() if owner == user and expires > now]
+        if query.startswith("INSERT"):
+            user, name, expires = params
+            self.rows[(user, name)] = expires
+        elif query.startswith("UPDATE"):
+            expires, user, name = params
+            self.rows[(user, name)] = expires
+        elif query.startswith("DELETE") and len(params) == 2:
+            return [self.rows.pop(params)] if params in self.rows else []
+        elif query.startswith("DELETE"):
+            (now,) = params
+            expired = [key for key, expires in self.rows.items() if expires <= now]
+            return [self.rows.pop(key) for key in expired]
+        return []
+
+
+def build(monkeypatch, fake_db_cursor, rows=None, now=1000):
+    table = EffectsTable(rows)
+    fake_db_cursor(status_effects_module, table.respond)
+    clock = {"now": now}
+    monkeypatch.setattr(status_effects_module, "time", lambda: clock["now"])
+    monkeypatch.setattr(StatusEffects, "load_status_effects", lambda self: EFFECT_DATA)
+    return StatusEffects(start_sweeper=False), table, clock
+
+
+def test_effects_are_read_once_and_served_from_cache(monkeypatch, fake_db_cursor):
+    effects, table, _ = build(monkeypatch, fake_db_cursor, rows={("alice", "fishing.price_50"): 1100})
+
+    first = effects.get_effects("alice")
+    second = effects.get_effects("alice")
+
+    assert [e["effect_id"] for e in first] == ["price_50"]
+    assert second[0]["duration"] == 100
+    assert table.reads == 1
+
+
+def test_expired_effects_drop_out_without_touching_the_database(monkeypatch, fake_db_cursor):
+    rows = {("alice", "fishing.price_50"): 1100, ("alice", "casino.luck_10"): 1050}
+    effects, table, clock = build(monkeypatch, fake_db_cursor, rows=rows)
+    effects.get_effects("alice")
+
+    clock["now"] = 1050
+    remaining = effects.get_effects("alice")
+
+    assert [e["effect_id"] for e in remaining] == ["price_50"]
+    assert table.rows == rows
+    assert table.reads == 1
+
+
+def test_add_effect_writes_through_and_extends_existing_effect(monkeypatch, fake_db_cursor):
+    effects, table, clock = build(monkeypatch, fake_db_cursor)
+
+    assert effects.add_effect("alice", "fishing.price_50") is True
+    assert effects.get_effects("alice")[0]["duration"] == 120
+    assert table.rows == {("alice", "fishing.price_50"): 1120}
+
+    clock["now"] = 1100
+    effects.add_effect("alice", "fishing.price_50")
+
+    # 20s left plus another 120s; the first expiry no longer removes it.
+    clock["now"] = 1121
+    assert effects.get_effects("alice")[0]["duration"] == 119
+    assert table.rows == {("alice", "fishing.price_50"): 1240}
+    assert table.reads == 1
+
+
+def test_definitions_are_not_mutated_by_callers(monkeypatch, fake_db_cursor):
+    effects, _, _ = build(monkeypatch, fake_db_cursor, rows={("alice", "fishing.price_50"): 1100})
+
+    effects.get_effects("alice")[0]["mult"] = 99
+
+    assert EFFECT_DATA["fishing"]["price_50"]["mult"] == 1.5
+
+
+def test_sweep_deletes_every_expired_row(monkeypatch, fake_db_cursor):
+    rows = {("alice", "fishing.price_50"): 900, ("bob", "casino.luck_10"): 1000, ("carol", "casino.luck_10"): 1100}
+    effects, table, _ = build(monkeypatch, fake_db_cursor, rows=rows)
+
+    assert effects.sweep_expired() == 2
+    assert table.rows == {("carol", "casino.luck_10"): 1100}
+
+
+def test_rolled_back_write_drops_the_cached_user(monkeypatch, fake_db_cursor):
+    effects, table, _ = build(monkeypatch, fake_db_cursor)
+    effects.get_effects("alice")
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            effects.add_effect("alice", "fishing.price_50")
+            assert effects.get_effects("alice")[0]["effect_id"] == "price_50"
+            raise RuntimeError("message failed")
+
+    # The cached copy of the rolled-back write is gone; the next lookup reads again.
+    effects.get_effects("alice")
+    assert table.reads == 2
+
+
+def test_server_shutdown_stops_the_sweeper(bot_server):
+    effects = StatusEffects.__new__(StatusEffects)
+    effects._stop_event = threading.Event()
+    bot_server.modules.modules["status_effects"] = effects
+
+    bot_server.shutdown()
+
+    assert effects._stop_event.is_set()
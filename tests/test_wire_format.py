@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+import server.server as server_module
+import util.wire_format as wire_format
+from server.asgi import create_asgi_app
+from util.wire_format import MSGPACK_CONTENT_TYPE, decode_body, encode_body
+
+
+def register_echo(bot_server):
+    @bot_server.commands.register("echo")
+    def _echo(bot, is_team, playername, chattext):
+        return f"{playername}: {chattext}"
+
+
+def call_asgi(app, body, headers):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/process_message", "headers": headers}
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], dict(sent[0]["headers"])[b"content-type"].decode(), sent[1]["body"]
+
+
+def test_json_round_trip_and_malformed_bodies():
+    body, content_type = encode_body({"responses": [{"text": "hi"}]})
+
+    assert content_type == "application/json"
+    assert decode_body(body, "application/json; charset=utf-8") == {"responses": [{"text": "hi"}]}
+    assert decode_body(b"{not json", "application/json") is None
+    assert decode_body(b"", "application/json") is None
+
+
+def test_server_answers_json_when_msgpack_is_unavailable(bot_server, monkeypatch):
+    monkeypatch.setattr(wire_format, "msgpack", None)
+    monkeypatch.setattr(server_module, "bot_server", bot_server)
+    register_echo(bot_server)
+    client = server_module.app.test_client()
+
+    response = client.post(
+        "/process_message",
+        json={"playername": "alice", "chattext": "!echo hi"},
+        headers={"Accept": f"{MSGPACK_CONTENT_TYPE}, application/json"},
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"responses": [{"is_team": False, "text": "alice: hi"}]}
+    # A msgpack body the server cannot decode is rejected like any malformed payload.
+    assert client.post("/process_message", data=b"\x81", content_type=MSGPACK_CONTENT_TYPE).status_code == 400
+
+
+def test_flask_and_asgi_speak_msgpack_when_installed(bot_server, monkeypatch):
+    msgpack = pytest.importorskip("msgpack")
+    monkeypatch.setattr(server_module, "bot_server", bot_server)
+    register_echo(bot_server)
+    request_body = msgpack.packb({"playername": "bob", "chattext": "!echo yo"})
+    expected = {"responses": [{"is_team": False, "text": "bob: yo"}]}
+
+    response = server_module.app.test_client().post(
+        "/process_message",
+        data=request_body,
+        content_type=MSGPACK_CONTENT_TYPE,
+        headers={"Accept": MSGPACK_CONTENT_TYPE},
+    )
+    assert response.mimetype == MSGPACK_CONTENT_TYPE
+    assert msgpack.unpackb(response.data) == expected
+
+    status, content_type, body = call_asgi(
+        create_asgi_app(bot_server),
+        request_body,
+        [(b"content-type", MSGPACK_CONTENT_TYPE.encode()), (b"accept", MSGPACK_CONTENT_TYPE.encode())],
+    )
+    assert (status, content_type) == (200, MSGPACK_CONTENT_TYPE)
+    assert msgpack.unpackb(body) == expected
+
+
+def test_asgi_defaults_to_json(bot_server):
+    register_echo(bot_server)
+
+    status, content_type, body = call_asgi(
+        create_asgi_app(bot_server), b'{"playername": "cy", "chattext": "!echo hey"}', []
+    )
+
+    assert (status, content_type) == (200, "application/json")
+    assert decode_body(body) == {"responses": [{"is_team": False, "text": "cy: hey"}]}
@@ -0,0 +1,170 @@
+"""
+Compact on-disk card store shared by the trading card catalog clients.
+
+Each set is stored as rows holding only what a pack pull needs (name, rarity,
+set name, resolved price and the good-card flag) in a SQLite file. Cards are
+numbered within their set and within the set's good-card pool, so a random
+pull is a single indexed lookup and nothing but per-set counts is kept in
+memory. Sets are replaced individually, so warming one set never rewrites
+the others.
+"""
+import logging
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+
+class StoredCard(NamedTuple):
+    name: str
+    rarity: str
+    set_name: str
+    price: float
+    good: bool
+
+
+class SetInfo(NamedTuple):
+    set_name: str
+    updated_at: float
+    card_count: int
+    good_count: int
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS card_sets (
+    catalog TEXT NOT NULL,
+    set_id TEXT NOT NULL,
+    set_name TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    card_count INTEGER NOT NULL,
+    good_count INTEGER NOT NULL,
+    PRIMARY KEY (catalog, set_id)
+);
+CREATE TABLE IF NOT EXISTS cards (
+    catalog TEXT NOT NULL,
+    set_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    good_position INTEGER,
+    name TEXT NOT NULL,
+    rarity TEXT NOT NULL,
+    set_name TEXT NOT NULL,
+    price REAL NOT NULL,
+    PRIMARY KEY (catalog, set_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_cards_good_position ON cards(catalog, set_id, good_position);
+"""
+
+
+class CardStore:
+    """SQLite-backed store of compact cards, keyed by catalog (e.g. 'pokemon') and set id."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._set_info: Dict[Tuple[str, str], SetInfo] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            for row in self._conn.execute(
+                "SELECT catalog, set_id, set_name, updated_at, card_count, good_count FROM card_sets"
+            ):
+                self._set_info[(row[0], row[1])] = SetInfo(*row[2:])
+
+    def set_info(self, catalog: str, set_id: str) -> Optional[SetInfo]:
+        """Return metadata for a stored set, or None if the set is not stored."""
+        return self._set_info.get((catalog, set_id))
+
+    def is_fresh(self, catalog: str, set_id: str, ttl_seconds: float) -> bool:
+        """True if the set is stored, non-empty and younger than ``ttl_seconds``."""
+        info = self.set_info(catalog, set_id)
+        return bool(info and info.card_count and (time.time() - info.updated_at) <= ttl_seconds)
+
+    def replace_set(
+        self,
+        catalog: str,
+        set_id: str,
+        cards: Iterable[StoredCard],
+        set_name: Optional[str] = None,
+        updated_at: Optional[float] = None,
+    ) -> SetInfo:
+        """Store ``cards`` as the full contents of a set, replacing whatever was there."""
+        cards = list(cards)
+        updated_at = time.time() if updated_at is None else updated_at
+        set_name = set_name or (cards[0].set_name if cards else set_id)
+
+        rows = []
+        good_count = 0
+        for position, card in enumerate(cards):
+            good_position = None
+            if card.good:
+                good_position = good_count
+                good_count += 1
+            rows.append((catalog, set_id, position, good_position, card.name, card.rarity, card.set_name, float(card.price)))
+
+        info = SetInfo(set_name, updated_at, len(rows), good_count)
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM cards WHERE catalog = ? AND set_id = ?", (catalog, set_id))
+                self._conn.executemany(
+                    "INSERT INTO cards (catalog, set_id, position, good_position, name, rarity, set_name, price) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO card_sets (catalog, set_id, set_name, updated_at, card_count, good_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (catalog, set_id, *info),
+                )
+            self._set_info[(catalog, set_id)] = info
+        return info
+
+    def random_card(self, catalog: str, set_id: str, good: bool = False) -> Optional[StoredCard]:
+        """Pick a uniformly random card from the set (or from its good-card pool)."""
+        info = self.set_info(catalog, set_id)
+        if info is None:
+            return None
+        pool_size = info.good_count if good else info.card_count
+        if pool_size <= 0:
+            return None
+
+        column = "good_position" if good else "position"
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT name, rarity, set_name, price, good_position IS NOT NULL FROM cards "
+                f"WHERE catalog = ? AND set_id = ? AND {column} = ?",
+                (catalog, set_id, random.randrange(pool_size)),
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredCard(row[0], row[1], row[2], row[3], bool(row[4]))
+
+    def cards(self, catalog: str, set_id: str) -> Tuple[StoredCard, ...]:
+        """Return every stored card of a set, in stored order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, rarity, set_name, price, good_position IS NOT NULL FROM cards "
+                "WHERE catalog = ? AND set_id = ? ORDER BY position",
+                (catalog, set_id),
+            ).fetchall()
+        return tuple(StoredCard(row[0], row[1], row[2], row[3], bool(row[4])) for row in rows)
+
+    @staticmethod
+    def to_pull(card: StoredCard) -> Dict[str, Any]:
+        """Shape a stored card like the dicts returned by pack pulls."""
+        return {
+            "name": card.name,
+            "rarity": card.rarity,
+            "set_name": card.set_name,
+            "price": round(card.price, 2),
+            "good_hit": card.good,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,172 @@
+"""
+Background prewarming for the external catalog clients (Pokemon, MTG, CS2).
+
+Catalogs are warmed one key (set, case) per task on a small shared thread pool,
+so the server can start serving immediately. Callers ask ``catalog_warmer``
+whether a key is still warming and can answer with a "try again shortly"
+message instead of blocking on the network. ``host_rate_limiter`` spaces out
+warm-up requests per host so parallel warming does not trip upstream rate
+limits; requests made while answering a chat command (``in_warmup()`` is
+False) are not delayed by it.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+
+_in_warmup: ContextVar[bool] = ContextVar("catalog_in_warmup", default=False)
+
+
+def in_warmup() -> bool:
+    """True while running a CatalogWarmer task."""
+    return _in_warmup.get()
+
+
+class HostRateLimiter:
+    """Enforce a minimum interval between requests to the same host."""
+
+    def __init__(self, intervals: Optional[Dict[str, float]] = None, default_interval: float = 0.0):
+        self.intervals = dict(intervals or {})
+        self.default_interval = default_interval
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url_or_host: str) -> str:
+        return (urlparse(url_or_host).hostname if "://" in url_or_host else url_or_host).lower()
+
+    def reserve(self, url_or_host: str) -> Optional[float]:
+        """Claim the next request slot for this host; returns its ``time.monotonic()`` time.
+
+        Returns None for hosts without an interval.
+        """
+        host = self._host(url_or_host)
+        interval = self.intervals.get(host, self.default_interval)
+        if interval <= 0:
+            return None
+
+        with self._lock:
+            slot = max(time.monotonic(), self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = slot + interval
+        return slot
+
+    def wait(self, url_or_host: str) -> float:
+        """Block until a request to this host is allowed; returns the time slept."""
+        slot = self.reserve(url_or_host)
+        if slot is None:
+            return 0.0
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+            return delay
+        return 0.0
+
+
+class CatalogWarmer:
+    """Warm catalog entries concurrently on a bounded pool and track which are ready."""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, int(max_workers))
+        self._logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, set] = {}
+        self._failed: Dict[str, set] = {}
+        self._ready: Dict[str, threading.Event] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="catalog-warmup")
+        return self._executor
+
+    def warm(self, catalog: str, keys: Iterable[Any], warm_one: Callable[[Any], Any]) -> None:
+        """Run ``warm_one(key)`` for each key in the background; the catalog is ready once all finish."""
+        keys = list(dict.fromkeys(keys))
+        with self._lock:
+            pending = self._pending.setdefault(catalog, set())
+            self._failed.setdefault(catalog, set())
+            ready = self._ready.setdefault(catalog, threading.Event())
+            new_keys = [key for key in keys if key not in pending]
+            pending.update(new_keys)
+            if pending:
+                ready.clear()
+            else:
+                ready.set()
+            executor = self._get_executor()
+
+        for key in new_keys:
+            executor.submit(self._run, catalog, key, warm_one)
+
+    def _run(self, catalog: str, key: Any, warm_one: Callable[[Any], Any]) -> None:
+        started = time.monotonic()
+        token = _in_warmup.set(True)
+        try:
+            warm_one(key)
+        except Exception:
+            self._logger.exception("Catalog prewarm failed catalog=%s key=%s", catalog, key)
+            with self._lock:
+                self._failed[catalog].add(key)
+        else:
+            with self._lock:
+                self._failed[catalog].discard(key)
+        finally:
+            _in_warmup.reset(token)
+            with self._lock:
+                pending = self._pending[catalog]
+                pending.discard(key)
+                if not pending:
+                    self._ready[catalog].set()
+            self._logger.debug(
+                "Catalog prewarm finished catalog=%s key=%s elapsed=%.3fs",
+                catalog,
+                key,
+                time.monotonic() - started,
+            )
+
+    def is_warming(self, catalog: str, key: Any = None) -> bool:
+        """True while the catalog (or one specific key of it) is still being warmed."""
+        with self._lock:
+            pending = self._pending.get(catalog)
+            if not pending:
+                return False
+            return key is None or key in pending
+
+    def wait(self, catalog: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a catalog to finish warming; returns False on timeout."""
+        with self._lock:
+            ready = self._ready.get(catalog)
+        return True if ready is None else ready.wait(timeout)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-catalog warming state for health output."""
+        with self._lock:
+            return {
+                catalog: {
+                    "ready": not self._pending[catalog],
+                    "pending": len(self._pending[catalog]),
+                    "failed": len(self._failed.get(catalog, ())),
+                }
+                for catalog in self._pending
+            }
+
+    def shutdown(self) -> None:
+        """Cancel queued warm-up work; entries in flight finish in the background."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+host_rate_limiter = HostRateLimiter(
+    intervals={
+        "api.pokemontcg.io": float(os.getenv("POKEMON_TCG_MIN_INTERVAL_SECONDS", "0.1")),
+        "api.scryfall.com": float(os.getenv("MTG_TCG_MIN_INTERVAL_SECONDS", "0.1")),
+        "steamcommunity.com": float(os.getenv("STEAM_MARKET_MIN_INTERVAL_SECONDS", "3.0")),
+    }
+)
+catalog_warmer = CatalogWarmer(max_workers=int(os.getenv("CATALOG_PREWARM_WORKERS", "4")))
@@ -0,0 +1,215 @@
+"""
+Paced delivery of bot responses into CS2 chat.
+
+Each chat line costs three steps on the game side: write the bind into the
+exec cfg, press the load key, press the send key. ``ChatOutputScheduler``
+owns the outgoing queue and the worker that performs those steps through a
+sink (``CS2ChatSink`` in ``util.chat_utils`` on Windows, a recorder in tests):
+
+* the queue is a deque with a set of queued ``(is_team, text)`` pairs, so
+  duplicate checks are O(1), and the worker sleeps on a condition variable
+  instead of polling;
+* consecutive short lines for the same channel (team or all) are merged into
+  one chat line up to ``max_line_length``;
+* the delays after each step are scaled by a pace factor that adapts to the
+  game's echo of sent lines: a line seen in console.log shortens the delays,
+  a line that never shows up (dropped by chat flood protection) lengthens
+  them again, never beyond the configured base delays.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ChatLine = Tuple[bool, str]
+
+
+def _ack_key(text: str) -> str:
+    # Compare on letters and digits only: the console echo can differ in spacing and sanitized punctuation.
+    return "".join(c for c in text.casefold() if c.isalnum())
+
+
+class ChatOutputScheduler:
+    """Queue, merge and pace outgoing chat lines for a write/load/send sink."""
+
+    def __init__(
+        self,
+        sink,
+        stop_event: Optional[threading.Event] = None,
+        max_line_length: int = 127,
+        separator: str = " | ",
+        write_delay: float = 0.5,
+        load_delay: float = 0.5,
+        send_delay: float = 0.5,
+        min_pace: float = 0.2,
+        ack_timeout: float = 3.0,
+    ):
+        self.sink = sink
+        self.stop_event = stop_event or threading.Event()
+        self.max_line_length = max_line_length
+        self.separator = separator
+        self.write_delay = write_delay
+        self.load_delay = load_delay
+        self.send_delay = send_delay
+        self.min_pace = min(1.0, max(0.0, min_pace))
+        self.ack_timeout = ack_timeout
+        self.pace = 1.0
+        self.paused = False
+        # The account our lines are echoed from, learned from the first acknowledged echo.
+        self.own_sender: Optional[str] = None
+
+        self._queue: Deque[ChatLine] = deque()
+        self._queued: Set[ChatLine] = set()
+        self._unacked: Deque[Tuple[str, float]] = deque()
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_config(cls, sink, config: dict, stop_event: Optional[threading.Event] = None) -> "ChatOutputScheduler":
+        """Build a scheduler from the ``[chat_output]`` section of config.toml."""
+        section = config.get("chat_output", {}) if isinstance(config, dict) else {}
+        return cls(
+            sink,
+            stop_event=stop_event,
+            max_line_length=int(section.get("max_line_length", 127)),
+            write_delay=float(section.get("write_delay_seconds", 0.5)),
+            load_delay=float(section.get("load_delay_seconds", 0.5)),
+            send_delay=float(section.get("send_delay_seconds", 0.5)),
+            min_pace=float(section.get("min_pace", 0.2)),
+            ack_timeout=float(section.get("ack_timeout_seconds", 3.0)),
+        )
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def enqueue(self, is_team: bool, text: str) -> bool:
+        """Queue a line; returns False if the same line is already waiting for that channel."""
+        line = (bool(is_team), text)
+        with self._condition:
+            if line in self._queued:
+                return False
+            self._queue.append(line)
+            self._queued.add(line)
+            self._condition.notify()
+        return True
+
+    def remove_where(self, predicate: Callable[[bool, str], bool]) -> int:
+        """Drop queued lines for which ``predicate(is_team, text)`` is true; returns how many."""
+        with self._condition:
+            kept = deque(line for line in self._queue if not predicate(*line))
+            removed = len(self._queue) - len(kept)
+            self._queue = kept
+            self._queued = set(kept)
+        return removed
+
+    def set_paused(self, paused: bool) -> None:
+        with self._condition:
+            self.paused = paused
+            self._condition.notify_all()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def _next_line(self) -> Optional[ChatLine]:
+        """Wait for queued output and pop it, merged with following lines for the same channel."""
+        with self._condition:
+            while not self._queue and not self.stop_event.is_set():
+                self._condition.wait()
+            if not self._queue:
+                return None
+
+            is_team, text = self._queue.popleft()
+            self._queued.discard((is_team, text))
+            while self._queue:
+                next_is_team, next_text = self._queue[0]
+                merged = f"{text}{self.separator}{next_text}"
+                if next_is_team != is_team or len(merged) > self.max_line_length:
+                    break
+                self._queue.popleft()
+                self._queued.discard((next_is_team, next_text))
+                text = merged
+            return is_team, text
+
+    def _wait_until_resumed(self) -> None:
+        with self._condition:
+            while self.paused and not self.stop_event.is_set():
+                self._condition.wait()
+
+    def _pause_for(self, delay: float) -> None:
+        if delay > 0:
+            self.stop_event.wait(delay * self.pace)
+
+    def acknowledge(self, text: str, sender: Optional[str] = None) -> bool:
+        """Report a chat line seen in the console; returns True if it was one of ours.
+
+        ``sender`` is the account the line was posted from. Once an echo has
+        shown which account is ours, lines from anyone else never match, even
+        when a player repeats a line the bot just sent. Sent lines older than
+        the match were never echoed and count as dropped.
+        """
+        key = _ack_key(text)
+        if not key:
+            return False
+        with self._condition:
+            if sender is not None and self.own_sender is not None and sender != self.own_sender:
+                return False
+            for index, (sent_key, _) in enumerate(self._unacked):
+                if sent_key == key:
+                    for _ in range(index + 1):
+                        self._unacked.popleft()
+                    self._adjust_pace(missed=index)
+                    self.pace = max(self.min_pace, self.pace * 0.8)
+                    if sender is not None:
+                        self.own_sender = sender
+                    return True
+        return False
+
+    def _expire_unacked(self) -> None:
+        cutoff = time.monotonic() - self.ack_timeout
+        with self._condition:
+            missed = 0
+            while self._unacked and self._unacked[0][1] < cutoff:
+                self._unacked.popleft()
+                missed += 1
+            self._adjust_pace(missed)
+
+    def _adjust_pace(self, missed: int) -> None:
+        if missed:
+            self.pace = min(1.0, self.pace * 1.5 ** missed)
+
+    def deliver(self, is_team: bool, text: str) -> None:
+        """Run the write/load/send sequence for one chat line."""
+        self._expire_unacked()
+        self.sink.write(is_team, text)
+        self._pause_for(self.write_delay)
+
+        self._wait_until_resumed()
+        self.sink.load()
+        self._pause_for(self.load_delay)
+
+        self._wait_until_resumed()
+        self.sink.send()
+        with self._condition:
+            self._unacked.append((_ack_key(text), time.monotonic()))
+            # Keep the window bounded when nothing is ever echoed back.
+            while len(self._unacked) > 32:
+                self._unacked.popleft()
+        self._pause_for(self.send_delay)
+
+    def run(self) -> None:
+        """Worker loop: deliver queued lines until ``stop_event`` is set."""
+        while not self.stop_event.is_set():
+            line = self._next_line()
+            if line is None:
+                return
+            is_team, text = line
+            logger.info(f"Sending chat message: {text} (team: {is_team})")
+            try:
+                self.deliver(is_team, text)
+            except Exception as e:
+                logger.error(f"Error processing chat message: {e}")
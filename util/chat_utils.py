@@ -20,4 +20,23 @@ def load_chat(load_chat_key_win32):
 def send_chat(send_chat_key_win32):
     """Simulate pressing the send chat key."""
     win32api.keybd_event(send_chat_key_win32, 0, 0, 0)
-    win32api.keybd_event(send_chat_key_win32, 0, win32con.KEYEVENTF_KEYUP, 0)
\ No newline at end of file
+    win32api.keybd_event(send_chat_key_win32, 0, win32con.KEYEVENTF_KEYUP, 0)
+
+
+class CS2ChatSink:
+    """Chat output sink for ChatOutputScheduler: writes the exec cfg and presses the bound keys."""
+
+    def __init__(self, exec_path, send_chat_key, load_chat_key_win32, send_chat_key_win32):
+        self.exec_path = exec_path
+        self.send_chat_key = send_chat_key
+        self.load_chat_key_win32 = load_chat_key_win32
+        self.send_chat_key_win32 = send_chat_key_win32
+
+    def write(self, is_team, chattext):
+        write_chat_to_cfg(self.exec_path, self.send_chat_key, is_team, chattext)
+
+    def load(self):
+        load_chat(self.load_chat_key_win32)
+
+    def send(self):
+        send_chat(self.send_chat_key_win32)
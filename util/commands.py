@@ -1,5 +1,6 @@
 import functools
-from thefuzz import process, fuzz
+import inspect
+from util.fuzzy_index import FuzzyIndex
 from util.localization import get_localization_manager
 
 class CommandRegistry:
@@ -16,13 +17,24 @@ class CommandRegistry:
         self.logger = logger
         self.commands = {}
         self._localized_alias_cache = {}
+        self._suggestion_index_cache = {}
 
-    def register(self, command_name, aliases=None, aliases_pt=None):
-        """Decorator to register a command."""
+    def register(self, command_name, aliases=None, aliases_pt=None, slow=False):
+        """Decorator to register a command.
+
+        Commands may be declared with ``async def`` to run natively on the async
+        server; ``slow=True`` marks blocking commands (network calls, case openings)
+        so the server can keep them off the pool used by cheap commands.
+        """
         def decorator(func):
-            @functools.wraps(func)
-            def wrapper(*args, **kwargs):
-                return func(*args, **kwargs)
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def wrapper(*args, **kwargs):
+                    return await func(*args, **kwargs)
+            else:
+                @functools.wraps(func)
+                def wrapper(*args, **kwargs):
+                    return func(*args, **kwargs)
 
             english_aliases = aliases if aliases else []
             portuguese_aliases = aliases_pt if aliases_pt else []
@@ -31,11 +43,14 @@ class CommandRegistry:
             wrapper.command_name = command_name
             wrapper.is_bot_command = True
             wrapper.aliases = all_aliases
+            wrapper.is_async = inspect.iscoroutinefunction(func)
+            wrapper.is_slow = bool(slow)
 
-            self.commands[command_name] = func
+            self.commands[command_name] = wrapper
+            self._suggestion_index_cache.clear()
             if all_aliases:
                 for alias in all_aliases:
-                    self.commands[alias] = func
+                    self.commands[alias] = wrapper
                     self.logger.info(f"Command '{alias}' registered as an alias for '{command_name}'.")
             else:
                 self.logger.info(f"Command '{command_name}' registered.")
@@ -45,13 +60,13 @@ class CommandRegistry:
 
     def _get_localized_alias_map(self, language: str, bot=None) -> dict:
         """Build a localized alias->canonical command map from translation files."""
-        if not language:
-            language = "en_US"
+        localization = getattr(bot, "_localization", None) or get_localization_manager()
+        # Cache by known locale only, so arbitrary client language codes cannot grow the cache.
+        language = localization.resolve_language(language or "en_US")
 
         if language in self._localized_alias_cache:
             return self._localized_alias_cache[language]
 
-        localization = getattr(bot, "_localization", None) or get_localization_manager()
         alias_config = localization.get_value("command_aliases", language=language, default={})
 
         alias_map = {}
@@ -67,6 +82,17 @@ class CommandRegistry:
         self._localized_alias_cache[language] = alias_map
         return alias_map
 
+    def _get_suggestion_index(self, language: str, bot=None) -> FuzzyIndex:
+        """Fuzzy index over command names and this language's aliases, built once per language."""
+        localization = getattr(bot, "_localization", None) or get_localization_manager()
+        language = localization.resolve_language(language or "en_US")
+        index = self._suggestion_index_cache.get(language)
+        if index is None:
+            localized_aliases = self._get_localized_alias_map(language, bot)
+            index = FuzzyIndex(list(self.commands.keys()) + list(localized_aliases.keys()))
+            self._suggestion_index_cache[language] = index
+        return index
+
     def load_commands(self, commands_dir):
         """Load all commands from the specified directory."""
         import os
@@ -86,30 +112,38 @@ class CommandRegistry:
                     self.logger.info(f"Attempting to load command: {obj.__name__}")
                     if getattr(obj, "is_bot_command", False):
                         self.commands[obj.command_name] = obj
+        self._suggestion_index_cache.clear()
 
-    def execute(self, command_name, *args, **kwargs):
-        """Execute a registered command."""
+    def resolve(self, command_name, language=None, bot=None):
+        """Return the handler for a command name or localized alias, or None."""
         command_lower = command_name.lower()
         if command_lower in self.commands:
-            return self.commands[command_lower](*args, **kwargs)
+            return self.commands[command_lower]
 
-        bot = args[0] if args else None
-        if bot and hasattr(bot, "get_request_language"):
-            language = bot.get_request_language()
-        else:
-            language = getattr(bot, "language", "en_US")
-        localization = getattr(bot, "_localization", None) or get_localization_manager()
         localized_aliases = self._get_localized_alias_map(language, bot)
-
         canonical = localized_aliases.get(command_lower)
         if canonical and canonical in self.commands:
-            return self.commands[canonical](*args, **kwargs)
+            return self.commands[canonical]
+        return None
+
+    def execute(self, command_name, *args, **kwargs):
+        """Execute a registered command.
+
+        Async commands return an awaitable; callers are expected to await it.
+        """
+        bot = args[0] if args else None
+        handler = self.resolve(command_name, self._request_language(bot), bot)
+        return self.execute_resolved(handler, command_name, *args, **kwargs)
 
-        suggestion_space = list(self.commands.keys()) + list(localized_aliases.keys())
-        if suggestion_space:
-            best_match, score = process.extractOne(command_name, suggestion_space, scorer=fuzz.ratio)
-        else:
-            best_match, score = None, 0
+    def execute_resolved(self, handler, command_name, *args, **kwargs):
+        """Run a handler already returned by ``resolve``; a None handler gets the not-found reply."""
+        if handler is not None:
+            return handler(*args, **kwargs)
+
+        bot = args[0] if args else None
+        language = self._request_language(bot)
+        localization = getattr(bot, "_localization", None) or get_localization_manager()
+        best_match, score = self._get_suggestion_index(language, bot).best_match(command_name)
 
         self.logger.warning(f"Command '{command_name}' not found. Did you mean '{best_match}'? (Score: {score})")
         # Commands are typically invoked positionally: (bot, is_team, playername, chattext)
@@ -135,9 +169,16 @@ class CommandRegistry:
             command=command_name,
         )
 
+    @staticmethod
+    def _request_language(bot):
+        if bot and hasattr(bot, "get_request_language"):
+            return bot.get_request_language()
+        return getattr(bot, "language", "en_US")
+
     def set_logger(self, logger):
         """Set a custom logger."""
-        if self.logger:
+        # Drop the default console handler, but never one from the logger being installed (e.g. a second BotServer).
+        if self.logger and self.logger is not logger and self.logger.handlers:
             self.logger.removeHandler(self.logger.handlers[0])
         self.logger = logger
 
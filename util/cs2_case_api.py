@@ -2,13 +2,18 @@ import json
 import logging
 import os
 import random
+import threading
 import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import requests
 
+from util.catalog_warmup import catalog_warmer
 from util.config import get_config_path
+from util.http_client import HTTPClientError, HttpClient
+from util.metrics import cache_result
 
 
 class CS2CaseAPIError(Exception):
@@ -16,16 +21,24 @@ class CS2CaseAPIError(Exception):
 
 
 class CS2CaseClient:
-    """Simple client for pulling CS2 case items from a public crate API."""
+    """Client for pulling CS2 case items from a public crate API.
+
+    Use ``get_cs2_case_client()`` to share one instance (and one price map)
+    across modules. Concurrent lookups of the same price are coalesced into a
+    single Steam request, and cache writes are batched: changes mark the cache
+    dirty and are written at most once per ``save_delay`` seconds. Entries
+    past the cache TTL are served stale while a background refresh runs.
+    """
 
     CRATES_URL = "https://raw.githubusercontent.com/ByMykel/CSGO-API/main/public/api/en/crates.json"
     STEAM_PRICE_URL = "https://steamcommunity.com/market/priceoverview/"
 
-    def __init__(self, timeout: float = 8.0, max_retries: int = 1):
+    def __init__(self, timeout: float = 8.0, max_retries: int = 1, save_delay: Optional[float] = None):
         self.timeout = timeout
         self.max_retries = max(0, int(max_retries))
         self._logger = logging.getLogger(__name__)
         self._session = requests.Session()
+        self._http = HttpClient(self._session, timeout=timeout, max_retries=self.max_retries, retry_backoff=0.25)
 
         self._cache_ttl_seconds = int(os.getenv("CS2_CASE_CACHE_TTL_SECONDS", "86400"))
         configured_cache_path = os.getenv("CS2_CASE_CACHE_PATH", "").strip()
@@ -35,9 +48,22 @@ class CS2CaseClient:
             config_dir = Path(get_config_path()).parent
             self._cache_path = config_dir / "cache" / "cs2_crates_cache.json"
 
+        if save_delay is None:
+            save_delay = float(os.getenv("CS2_CASE_CACHE_SAVE_DELAY_SECONDS", "5"))
+        self.save_delay = max(0.0, save_delay)
+
         self._crates: List[Dict[str, Any]] = []
+        self._crates_updated_at = 0.0
+        self._crate_index: Dict[str, Dict[str, Any]] = {}
         self._case_price_cache: Dict[str, float] = {}
         self._item_price_cache: Dict[str, float] = {}
+        self._price_fetched_at: Dict[str, float] = {}
+        self._crates_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._inflight_lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
         self._load_cached_crates()
 
     @staticmethod
@@ -87,33 +113,84 @@ class CS2CaseClient:
             item_prices = payload.get("item_prices", {})
             if not isinstance(crates, list):
                 return
-            if (time.time() - updated_at) > self._cache_ttl_seconds:
-                return
-            self._crates = crates
+            # Expired entries are kept and served stale until a refresh replaces them.
+            self._set_crates(crates, updated_at=float(payload.get("crates_updated_at", updated_at)))
+            fetched_at = payload.get("price_fetched_at", {})
+            if isinstance(fetched_at, dict):
+                self._price_fetched_at = {
+                    str(k): float(v) for k, v in fetched_at.items() if self._safe_float(v) is not None
+                }
             if isinstance(case_prices, dict):
                 self._case_price_cache = {
                     str(k).strip().lower(): v
                     for k, v in case_prices.items()
                     if self._safe_float(v) is not None
                 }
+                for key in self._case_price_cache:
+                    self._price_fetched_at.setdefault(f"case:{key}", updated_at)
             if isinstance(item_prices, dict):
                 self._item_price_cache = {
                     str(k).strip().lower(): v
                     for k, v in item_prices.items()
                     if self._safe_float(v) is not None
                 }
+                for key in self._item_price_cache:
+                    self._price_fetched_at.setdefault(f"item:{key}", updated_at)
             self._logger.info("Loaded CS2 crates cache entries=%s path=%s", len(crates), self._cache_path)
         except Exception:
             self._logger.exception("Failed loading CS2 crates cache from %s", self._cache_path)
 
+    def _set_crates(self, crates: List[Dict[str, Any]], updated_at: Optional[float] = None) -> None:
+        index: Dict[str, Dict[str, Any]] = {}
+        for crate in crates:
+            if isinstance(crate, dict):
+                index.setdefault((crate.get("name") or "").strip().lower(), crate)
+        self._crate_index = index
+        self._crates = crates
+        self._crates_updated_at = time.time() if updated_at is None else updated_at
+
+    def _is_stale(self, fetched_at: float) -> bool:
+        return (time.time() - fetched_at) > self._cache_ttl_seconds
+
+    def _schedule_save(self) -> None:
+        """Mark the cache dirty and write it once the debounce window closes."""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                return
+            if self.save_delay <= 0:
+                timer = None
+            else:
+                timer = threading.Timer(self.save_delay, self.flush)
+                timer.daemon = True
+                self._save_timer = timer
+        if timer is None:
+            self.flush()
+        else:
+            timer.start()
+
+    def flush(self) -> None:
+        """Write pending cache changes to disk now."""
+        with self._save_lock:
+            timer, self._save_timer = self._save_timer, None
+            if timer is not None:
+                timer.cancel()
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._save_cached_crates()
+
     def _save_cached_crates(self) -> None:
+        # Called from flush() with _save_lock held.
         try:
             self._cache_path.parent.mkdir(parents=True, exist_ok=True)
             payload = {
                 "updated_at": time.time(),
+                "crates_updated_at": self._crates_updated_at,
                 "crates": self._crates,
-                "case_prices": self._case_price_cache,
-                "item_prices": self._item_price_cache,
+                "case_prices": dict(self._case_price_cache),
+                "item_prices": dict(self._item_price_cache),
+                "price_fetched_at": dict(self._price_fetched_at),
             }
             self._cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
         except Exception:
@@ -124,105 +201,134 @@ class CS2CaseClient:
         if not name:
             return None
 
-        attempts = self.max_retries + 1
-        for attempt in range(1, attempts + 1):
-            try:
-                response = self._session.get(
-                    self.STEAM_PRICE_URL,
-                    params={
-                        "appid": 730,
-                        "currency": 1,
-                        "market_hash_name": name,
-                    },
-                    timeout=self.timeout,
-                )
-                response.raise_for_status()
-                payload = response.json()
-                if not isinstance(payload, dict) or not payload.get("success"):
-                    return None
-
-                price = self._parse_steam_price(payload.get("lowest_price"))
-                if price is None:
-                    price = self._parse_steam_price(payload.get("median_price"))
-                return price
-            except Exception as exc:
-                self._logger.warning(
-                    "Steam price fetch failed name=%s (attempt %s/%s): %s",
-                    name,
-                    attempt,
-                    attempts,
-                    exc,
-                )
-                if attempt >= attempts:
-                    return None
-                time.sleep(0.25 * attempt)
-
-        return None
-
-    def get_case_price(self, case_name: str, refresh: bool = False) -> Optional[float]:
-        key = (case_name or "").strip().lower()
-        if not key:
+        try:
+            payload = self._http.get_json(
+                self.STEAM_PRICE_URL,
+                params={
+                    "appid": 730,
+                    "currency": 1,
+                    "market_hash_name": name,
+                },
+            )
+        except HTTPClientError as exc:
+            self._logger.warning("Steam price fetch failed name=%s: %s", name, exc)
             return None
 
-        if not refresh and key in self._case_price_cache:
-            return self._safe_float(self._case_price_cache[key])
+        if not isinstance(payload, dict) or not payload.get("success"):
+            return None
 
-        price = self._fetch_steam_price(case_name)
+        price = self._parse_steam_price(payload.get("lowest_price"))
         if price is None:
-            return self._safe_float(self._case_price_cache.get(key))
-
-        self._case_price_cache[key] = price
-        self._save_cached_crates()
+            price = self._parse_steam_price(payload.get("median_price"))
         return price
 
-    def get_item_price(self, item_name: str, refresh: bool = False) -> Optional[float]:
-        key = (item_name or "").strip().lower()
+    def _coalesced(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Run ``fetch`` once per key; concurrent callers for the same key share its result."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fetch()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _cached_price(self, cache: Dict[str, float], kind: str, name: str, refresh: bool) -> Optional[float]:
+        key = (name or "").strip().lower()
         if not key:
             return None
 
-        if not refresh and key in self._item_price_cache:
-            return self._safe_float(self._item_price_cache[key])
+        inflight_key = f"{kind}:{key}"
+
+        def fetch() -> Optional[float]:
+            price = self._fetch_steam_price(name)
+            if price is None:
+                return self._safe_float(cache.get(key))
+            cache[key] = price
+            self._price_fetched_at[inflight_key] = time.time()
+            self._schedule_save()
+            return price
+
+        cache_name = f"cs2_{kind}_prices"
+        if not refresh and key in cache:
+            if self._is_stale(self._price_fetched_at.get(inflight_key, 0.0)):
+                cache_result(cache_name, "stale")
+                catalog_warmer.warm("cs2_prices", [inflight_key], lambda _key: self._coalesced(inflight_key, fetch))
+            else:
+                cache_result(cache_name, "hit")
+            return self._safe_float(cache[key])
+
+        cache_result(cache_name, "miss")
+        return self._coalesced(inflight_key, fetch)
 
-        price = self._fetch_steam_price(item_name)
-        if price is None:
-            return self._safe_float(self._item_price_cache.get(key))
+    def get_case_price(self, case_name: str, refresh: bool = False) -> Optional[float]:
+        return self._cached_price(self._case_price_cache, "case", case_name, refresh)
 
-        self._item_price_cache[key] = price
-        self._save_cached_crates()
-        return price
+    def get_item_price(self, item_name: str, refresh: bool = False) -> Optional[float]:
+        return self._cached_price(self._item_price_cache, "item", item_name, refresh)
 
     def _fetch_crates(self) -> List[Dict[str, Any]]:
-        attempts = self.max_retries + 1
-        for attempt in range(1, attempts + 1):
-            try:
-                response = self._session.get(self.CRATES_URL, timeout=self.timeout)
-                response.raise_for_status()
-                data = response.json()
-                if not isinstance(data, list):
-                    raise CS2CaseAPIError("Unexpected crates payload shape")
-                self._crates = data
-                self._save_cached_crates()
-                return data
-            except Exception as exc:
-                self._logger.warning(
-                    "CS2 crates fetch failed (attempt %s/%s): %s",
-                    attempt,
-                    attempts,
-                    exc,
-                )
-                if attempt >= attempts:
-                    raise CS2CaseAPIError(str(exc)) from exc
-                time.sleep(0.35 * attempt)
-        raise CS2CaseAPIError("Failed to fetch CS2 crates")
+        try:
+            data = self._http.get_json(self.CRATES_URL)
+        except HTTPClientError as exc:
+            self._logger.warning("CS2 crates fetch failed: %s", exc)
+            raise CS2CaseAPIError(str(exc)) from exc
+        if not isinstance(data, list):
+            raise CS2CaseAPIError("Unexpected crates payload shape")
+        self._set_crates(data)
+        self._schedule_save()
+        return data
+
+    def _refresh_crates(self, _key: Any = None) -> None:
+        with self._crates_lock:
+            if self._crates and not self._is_stale(self._crates_updated_at):
+                return
+            self._fetch_crates()
 
     def _ensure_crates(self) -> List[Dict[str, Any]]:
         if self._crates:
+            if self._is_stale(self._crates_updated_at):
+                cache_result("cs2_crates", "stale")
+                catalog_warmer.warm("cs2_crates", ["crates"], self._refresh_crates)
+            else:
+                cache_result("cs2_crates", "hit")
             return self._crates
-        return self._fetch_crates()
+        cache_result("cs2_crates", "miss")
+        # Several warm-up workers may need the crate list at once; fetch it only once.
+        with self._crates_lock:
+            if self._crates:
+                return self._crates
+            return self._fetch_crates()
+
+    def has_crates(self) -> bool:
+        """True if the crate catalog is loaded and pulls won't need a network fetch."""
+        return bool(self._crates)
+
+    def prewarm_case(self, case_name: str) -> None:
+        """Load the crate catalog if needed and cache the Steam price for one case."""
+        try:
+            self._ensure_crates()
+        except CS2CaseAPIError:
+            self._logger.exception("CS2 case prewarm failed case=%s", case_name)
+            return
+        self.get_case_price(case_name.strip())
 
     def prewarm_cases(self, case_names: List[str]) -> None:
         try:
-            crates = self._ensure_crates()
+            self._ensure_crates()
         except CS2CaseAPIError:
             self._logger.exception("CS2 case prewarm failed")
             return
@@ -230,7 +336,7 @@ class CS2CaseClient:
         names = [n.strip().lower() for n in case_names if isinstance(n, str) and n.strip()]
         if not names:
             return
-        found = sum(1 for c in crates if c.get("name", "").strip().lower() in names)
+        found = sum(1 for name in set(names) if name in self._crate_index)
         priced = 0
         for name in case_names:
             if not isinstance(name, str) or not name.strip():
@@ -265,9 +371,8 @@ class CS2CaseClient:
         if not case_name:
             raise CS2CaseAPIError("Missing case_name")
 
-        crates = self._ensure_crates()
-        case_name_l = case_name.strip().lower()
-        crate = next((c for c in crates if c.get("name", "").strip().lower() == case_name_l), None)
+        self._ensure_crates()
+        crate = self._crate_index.get(case_name.strip().lower())
         if not crate:
             raise CS2CaseAPIError(f"Case '{case_name}' not found in API")
 
@@ -295,3 +400,25 @@ class CS2CaseClient:
             "knife_hit": knife_hit,
             "case_name": crate.get("name", case_name),
         }
+
+
+_cs2_case_client: Optional[CS2CaseClient] = None
+_cs2_case_client_lock = threading.Lock()
+
+
+def get_cs2_case_client() -> CS2CaseClient:
+    """Get the process-wide CS2 case client shared by the inventory and shop."""
+    global _cs2_case_client
+    with _cs2_case_client_lock:
+        if _cs2_case_client is None:
+            _cs2_case_client = CS2CaseClient()
+        return _cs2_case_client
+
+
+def close_cs2_case_client() -> None:
+    """Write any pending cache changes and drop the shared client."""
+    global _cs2_case_client
+    with _cs2_case_client_lock:
+        client, _cs2_case_client = _cs2_case_client, None
+    if client is not None:
+        client.flush()
@@ -1,14 +1,281 @@
 """Database connection management for PostgreSQL."""
 import os
+import time
+import threading
 import psycopg2
+from collections import deque
 from psycopg2 import pool
-from typing import Optional
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 import logging
 
+from util.metrics import registry
+
 logger = logging.getLogger(__name__)
 
+_query_seconds = registry.histogram(
+    "bot_db_query_duration_seconds",
+    "Duration of database queries by statement type.",
+    ("operation",),
+)
+_query_errors = registry.counter(
+    "bot_db_query_errors_total",
+    "Database queries that raised, by statement type.",
+    ("operation",),
+)
+
 # Connection pool
-_connection_pool: Optional[pool.SimpleConnectionPool] = None
+_connection_pool: Optional["BoundedConnectionPool"] = None
+_pool_init_lock = threading.Lock()
+
+
+class PoolTimeoutError(pool.PoolError):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class BoundedConnectionPool:
+    """Thread-safe connection pool with a bounded size and a wait queue.
+
+    Callers block (up to ``timeout`` seconds) when every connection is in use.
+    Idle connections are validated before reuse once they have been idle for
+    ``health_check_seconds``, and connections older than ``max_lifetime_seconds``
+    or found closed/broken are replaced instead of being handed out.
+    """
+
+    def __init__(
+        self,
+        minconn: int,
+        maxconn: int,
+        timeout: float = 10.0,
+        health_check_seconds: float = 30.0,
+        max_lifetime_seconds: float = 3600.0,
+        connection_factory: Optional[Callable[[], Any]] = None,
+        **connect_kwargs,
+    ):
+        if maxconn < 1 or minconn < 0 or minconn > maxconn:
+            raise ValueError(f"Invalid pool size min={minconn} max={maxconn}")
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_seconds = health_check_seconds
+        self.max_lifetime_seconds = max_lifetime_seconds
+        self._connect = connection_factory or (lambda: psycopg2.connect(**connect_kwargs))
+
+        self._cond = threading.Condition()
+        self._idle: Deque[Tuple[Any, float]] = deque()  # (connection, returned_at)
+        self._created_at: Dict[int, float] = {}
+        self._in_use = 0
+        self._total = 0
+        self._waiting = 0
+        self._closed = False
+
+        # Counters reported by stats().
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._recycled = 0
+
+        for _ in range(minconn):
+            conn = self._new_connection()
+            with self._cond:
+                self._total += 1
+                self._idle.append((conn, time.monotonic()))
+
+    def _new_connection(self):
+        conn = self._connect()
+        self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn) -> None:
+        """Close a connection that must not be reused. Caller has already released its slot."""
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, conn) -> bool:
+        if getattr(conn, "closed", 0):
+            return True
+        created_at = self._created_at.get(id(conn))
+        return created_at is not None and time.monotonic() - created_at > self.max_lifetime_seconds
+
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        """Round-trip check for connections that have been idle for a while."""
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self, timeout: Optional[float] = None):
+        """Check out a connection, waiting up to ``timeout`` seconds if the pool is exhausted."""
+        timeout = self.timeout if timeout is None else timeout
+        requested_at = time.monotonic()
+        deadline = requested_at + timeout
+        waited = False
+
+        while True:
+            conn = None
+            idle_since = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise pool.PoolError("connection pool is closed")
+                while not self._idle and self._total >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available after {timeout:.1f}s "
+                            f"(in use: {self._in_use}, max: {self.maxconn})"
+                        )
+                    waited = True
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                    if self._closed:
+                        raise pool.PoolError("connection pool is closed")
+
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                else:
+                    create = True
+                self._in_use += 1
+                if create:
+                    self._total += 1
+
+            # Connect and validate outside the lock so other threads are not held up.
+            try:
+                if create:
+                    conn = self._new_connection()
+                elif self._is_expired(conn) or (
+                    time.monotonic() - idle_since > self.health_check_seconds and not self._is_alive(conn)
+                ):
+                    self._release_slot(conn, recycled=True)
+                    continue
+            except Exception:
+                self._release_slot(None)
+                raise
+
+            self._record_checkout(time.monotonic() - requested_at if waited else None)
+            return conn
+
+    def _release_slot(self, conn, recycled: bool = False) -> None:
+        """Give up a checked-out slot without returning a connection to the idle list."""
+        if conn is not None:
+            self._discard(conn)
+        with self._cond:
+            self._in_use -= 1
+            self._total -= 1
+            if recycled:
+                self._recycled += 1
+            self._cond.notify()
+
+    def _record_checkout(self, wait_time: Optional[float]) -> None:
+        with self._cond:
+            self._checkouts += 1
+            if wait_time is not None:
+                self._waits += 1
+                self._wait_time_total += wait_time
+                self._wait_time_max = max(self._wait_time_max, wait_time)
+
+    def putconn(self, conn, close: bool = False) -> None:
+        """Return a connection; broken or mid-transaction connections are reset or discarded."""
+        reusable = not close and not self._closed and not getattr(conn, "closed", 0)
+        if reusable:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                reusable = False
+
+        if not reusable:
+            self._release_slot(conn, recycled=not close and not self._closed)
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self) -> None:
+        """Close idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of pool usage and wait statistics."""
+        with self._cond:
+            return {
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "total": self._total,
+                "max": self.maxconn,
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time_total": round(self._wait_time_total, 6),
+                "wait_time_max": round(self._wait_time_max, 6),
+                "timeouts": self._timeouts,
+                "recycled": self._recycled,
+            }
+
+
+def _query_operation(query) -> str:
+    """Statement type label for a query (select, insert, ...), without parsing the SQL."""
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", errors="replace")
+    if not isinstance(query, str):
+        return "other"
+    words = query.split(None, 1)
+    keyword = words[0].lower() if words else ""
+    return keyword if keyword in ("select", "insert", "update", "delete", "with") else "other"
+
+
+class _QueryTimingMixin:
+    """Cursor mixin that records query counts and durations in the metrics registry."""
+
+    def _timed(self, method, query, *args):
+        operation = _query_operation(query)
+        started = time.perf_counter()
+        try:
+            return method(query, *args)
+        except Exception:
+            _query_errors.labels(operation).inc()
+            raise
+        finally:
+            _query_seconds.labels(operation).observe(time.perf_counter() - started)
+
+    def execute(self, query, vars=None):
+        return self._timed(super().execute, query, vars)
+
+    def executemany(self, query, vars_list):
+        return self._timed(super().executemany, query, vars_list)
+
+
+class TimedCursor(_QueryTimingMixin, extensions.cursor):
+    """Default cursor for pooled connections."""
+
+
+class TimedRealDictCursor(_QueryTimingMixin, RealDictCursor):
+    """RealDictCursor that is timed like TimedCursor."""
 
 
 def get_db_config():
@@ -22,62 +289,360 @@ def get_db_config():
     }
 
 
-def initialize_pool(minconn=1, maxconn=10):
-    """Initialize the connection pool."""
+def get_pool_config():
+    """Get pool sizing from config.toml [database], overridden by POSTGRES_POOL_* environment variables."""
+    from util.config import load_config
+
+    try:
+        db_cfg = load_config().get("database", {})
+    except Exception:
+        db_cfg = {}
+    if not isinstance(db_cfg, dict):
+        db_cfg = {}
+
+    def setting(key, env_name, default, cast):
+        raw = os.getenv(env_name, db_cfg.get(key, default))
+        try:
+            return cast(raw)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid database pool setting {key}={raw!r}; using {default}")
+            return default
+
+    return {
+        'minconn': setting('pool_min_connections', 'POSTGRES_POOL_MIN', 1, int),
+        'maxconn': setting('pool_max_connections', 'POSTGRES_POOL_MAX', 10, int),
+        'timeout': setting('pool_timeout_seconds', 'POSTGRES_POOL_TIMEOUT', 10.0, float),
+        'health_check_seconds': setting('pool_health_check_seconds', 'POSTGRES_POOL_HEALTH_CHECK', 30.0, float),
+        'max_lifetime_seconds': setting('pool_max_lifetime_seconds', 'POSTGRES_POOL_MAX_LIFETIME', 3600.0, float),
+    }
+
+
+def initialize_pool(minconn=None, maxconn=None, workers=None):
+    """Initialize the connection pool.
+
+    ``workers`` is the number of threads that may each hold a connection for a
+    whole unit of work; the pool is grown to at least that size so they never
+    wait on one another for a connection.
+    """
     global _connection_pool
-    if _connection_pool is None:
-        config = get_db_config()
-        logger.info(f"Initializing connection pool to {config['host']}:{config['port']}/{config['database']}")
-        _connection_pool = pool.SimpleConnectionPool(
-            minconn,
-            maxconn,
-            **config
-        )
-        logger.info("Connection pool initialized successfully")
+    with _pool_init_lock:
+        if _connection_pool is None:
+            config = get_db_config()
+            pool_config = get_pool_config()
+            if minconn is not None:
+                pool_config['minconn'] = minconn
+            if maxconn is not None:
+                pool_config['maxconn'] = maxconn
+            if workers is not None and pool_config['maxconn'] < workers:
+                logger.info(f"Raising pool max connections from {pool_config['maxconn']} to {workers} (one per worker)")
+                pool_config['maxconn'] = workers
+            logger.info(
+                f"Initializing connection pool to {config['host']}:{config['port']}/{config['database']} "
+                f"(min={pool_config['minconn']}, max={pool_config['maxconn']}, timeout={pool_config['timeout']}s)"
+            )
+            _connection_pool = BoundedConnectionPool(**pool_config, cursor_factory=TimedCursor, **config)
+            logger.info("Connection pool initialized successfully")
 
 
 def get_connection():
-    """Get a connection from the pool."""
+    """Get a connection from the pool, waiting up to the pool timeout if it is exhausted."""
     if _connection_pool is None:
         initialize_pool()
     return _connection_pool.getconn()
 
 
-def return_connection(conn):
+def return_connection(conn, close=False):
     """Return a connection to the pool."""
     if _connection_pool is not None:
-        _connection_pool.putconn(conn)
+        _connection_pool.putconn(conn, close=close)
+
+
+def get_pool_stats() -> Optional[Dict[str, Any]]:
+    """Return connection pool statistics, or None if the pool is not initialized."""
+    if _connection_pool is None:
+        return None
+    return _connection_pool.stats()
+
+
+def _pool_metric(*keys: str):
+    """Read pool stats for /metrics; returns None (metric omitted) without a pool."""
+    def read():
+        stats = get_pool_stats()
+        if stats is None:
+            return None
+        if len(keys) == 1:
+            return stats[keys[0]]
+        return {(key,): stats[key] for key in keys}
+    return read
+
+
+registry.callback(
+    "bot_db_pool_connections",
+    "Database pool connections by state.",
+    _pool_metric("in_use", "idle", "total", "max", "waiting"),
+    labelnames=("state",),
+)
+registry.callback("bot_db_pool_checkouts_total", "Connections checked out of the pool.", _pool_metric("checkouts"), kind="counter")
+registry.callback("bot_db_pool_waits_total", "Checkouts that had to wait for a free connection.", _pool_metric("waits"), kind="counter")
+registry.callback("bot_db_pool_wait_seconds_total", "Total time spent waiting for a connection.", _pool_metric("wait_time_total"), kind="counter")
+registry.callback("bot_db_pool_timeouts_total", "Checkouts that gave up waiting for a connection.", _pool_metric("timeouts"), kind="counter")
 
 
 def close_pool():
     """Close all connections in the pool."""
     global _connection_pool
-    if _connection_pool is not None:
-        _connection_pool.closeall()
-        _connection_pool = None
-        logger.info("Connection pool closed")
+    with _pool_init_lock:
+        if _connection_pool is not None:
+            _connection_pool.closeall()
+            _connection_pool = None
+            logger.info("Connection pool closed")
+
+
+class UnitOfWork:
+    """One pooled connection and transaction shared by every DatabaseConnection in a scope.
+
+    The connection is checked out on first use. A nested unit shares its parent's
+    connection but still commits when it ends, so a batch can reuse one connection
+    while committing each message separately.
+    """
+
+    def __init__(self, parent: Optional["UnitOfWork"] = None):
+        self.parent = parent
+        self._conn = None
+        self._savepoints = 0
+        # Savepoints open on the shared connection: (name, owning unit, hook mark).
+        self._open_savepoints: List[Tuple[str, "UnitOfWork", int]] = []
+        # (on_commit, on_rollback) callbacks registered through after_commit()/after_rollback().
+        self._hooks: List[Tuple[Optional[Callable[[], None]], Optional[Callable[[], None]]]] = []
+
+    def connection(self):
+        """Return the shared connection, checking one out of the pool on first use."""
+        if self.parent is not None:
+            return self.parent.connection()
+        if self._conn is None:
+            self._conn = get_connection()
+        return self._conn
+
+    def _root(self) -> "UnitOfWork":
+        unit = self
+        while unit.parent is not None:
+            unit = unit.parent
+        return unit
+
+    def begin_savepoint(self, cursor) -> str:
+        """Open a savepoint on the shared connection and return its name."""
+        root = self._root()
+        root._savepoints += 1
+        name = f"unit_block_{root._savepoints}"
+        cursor.execute(f"SAVEPOINT {name}")
+        root._open_savepoints.append((name, self, len(self._hooks)))
+        return name
+
+    def end_savepoint(self, cursor, name: str, success: bool) -> None:
+        """Release the savepoint ``name``, or roll back to it if its block failed."""
+        if success:
+            cursor.execute(f"RELEASE SAVEPOINT {name}")
+        else:
+            self._rollback_to(cursor, name)
+        open_savepoints = self._root()._open_savepoints
+        while open_savepoints:
+            if open_savepoints.pop()[0] == name:
+                break
+
+    def rollback_block(self, cursor) -> None:
+        """Undo a failed block: back to the innermost savepoint, or the whole transaction."""
+        open_savepoints = self._root()._open_savepoints
+        if open_savepoints:
+            self._rollback_to(cursor, open_savepoints[-1][0])
+        else:
+            self.rollback()
+
+    def _rollback_to(self, cursor, name: str) -> None:
+        open_savepoints = self._root()._open_savepoints
+        entry = next((entry for entry in open_savepoints if entry[0] == name), None)
+        if entry is None:
+            # Already gone with a full rollback after an earlier failure.
+            return
+        _, unit, hook_mark = entry
+        try:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+        except psycopg2.Error as e:
+            logger.warning(f"Rollback to savepoint failed; rolling back the unit: {e}")
+            open_savepoints.clear()
+            self.rollback()
+        else:
+            unit._run_hooks(hook_mark, committed=False)
+
+    def _open_connection(self):
+        if self.parent is not None:
+            return self.parent._open_connection()
+        return self._conn
+
+    def commit(self):
+        conn = self._open_connection()
+        if conn is not None:
+            try:
+                conn.commit()
+            except BaseException:
+                self._run_hooks(0, committed=False)
+                raise
+        self._run_hooks(0, committed=True)
+
+    def rollback(self):
+        conn = self._open_connection()
+        if conn is not None:
+            _safe_rollback(conn)
+        self._run_hooks(0, committed=False)
+
+    def _run_hooks(self, since: int, committed: bool) -> None:
+        """Run and forget the commit (or rollback) callbacks registered from index ``since`` on."""
+        hooks = self._hooks[since:]
+        del self._hooks[since:]
+        for on_commit, on_rollback in hooks:
+            callback = on_commit if committed else on_rollback
+            if callback is None:
+                continue
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Unit of work {'commit' if committed else 'rollback'} hook failed: {e}")
+
+    def close(self):
+        """Return the connection to the pool (top-level units only)."""
+        if self.parent is None and self._conn is not None:
+            return_connection(self._conn)
+            self._conn = None
+
+
+def _safe_rollback(conn) -> None:
+    """Roll back, ignoring errors from connections the server has already dropped."""
+    try:
+        conn.rollback()
+    except psycopg2.Error as e:
+        logger.warning(f"Rollback failed; connection will be discarded: {e}")
+
+
+_current_unit: ContextVar[Optional[UnitOfWork]] = ContextVar("database_unit_of_work", default=None)
+
+
+@contextmanager
+def unit_of_work():
+    """Run all DatabaseConnection blocks in this scope on one connection and transaction.
+
+    Commits once when the scope ends and rolls back if it raises. Blocks share
+    the transaction without extra statements, so a failing block rolls back the
+    work done so far (Postgres cannot continue an aborted transaction); wrap
+    steps that may fail on their own in atomic() to undo only those.
+    """
+    unit = UnitOfWork(parent=_current_unit.get())
+    token = _current_unit.set(unit)
+    try:
+        yield unit
+    except BaseException:
+        unit.rollback()
+        raise
+    else:
+        unit.commit()
+    finally:
+        _current_unit.reset(token)
+        unit.close()
+
+
+@contextmanager
+def atomic():
+    """Make every DatabaseConnection block in this scope succeed or fail together.
+
+    Inside a unit_of_work() the scope is one savepoint of the unit's transaction;
+    outside one it is a unit of its own, committed when the scope ends.
+    """
+    if _current_unit.get() is None:
+        with unit_of_work():
+            yield
+    else:
+        with DatabaseConnection(savepoint=True):
+            yield
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the current unit_of_work() commits, or right away outside one.
+
+    Use it for side effects such as cache updates that must not become visible
+    before the data they describe; the callback is dropped if the write is rolled back.
+    """
+    unit = _current_unit.get()
+    if unit is None:
+        callback()
+    else:
+        unit._hooks.append((callback, None))
+
+
+def after_rollback(callback: Callable[[], None]) -> None:
+    """Run ``callback`` if the work done so far in the current unit_of_work() is rolled back.
+
+    Fires when the unit rolls back or when an enclosing atomic() scope rolls
+    back to its savepoint; does nothing outside a unit.
+    """
+    unit = _current_unit.get()
+    if unit is not None:
+        unit._hooks.append((None, callback))
 
 
 class DatabaseConnection:
-    """Context manager for database connections."""
+    """Context manager for database connections.
+
+    Inside a unit_of_work() the shared connection is used and the transaction is
+    left open for the unit to commit; a failing block rolls back to the innermost
+    atomic() savepoint, or the whole transaction if there is none. Pass
+    ``savepoint=True`` to run the block in a savepoint of its own. Outside a unit
+    a pooled connection is checked out and committed for this block alone.
+    """
     
-    def __init__(self):
+    def __init__(self, cursor_factory=None, savepoint=False):
         self.conn = None
         self.cursor = None
+        self._unit = None
+        self._use_savepoint = savepoint
+        self._savepoint = None
+        self._cursor_factory = cursor_factory
     
     def __enter__(self):
-        self.conn = get_connection()
-        self.cursor = self.conn.cursor()
+        self._unit = _current_unit.get()
+        if self._unit is not None:
+            self.conn = self._unit.connection()
+        else:
+            self.conn = get_connection()
+        if self._cursor_factory is not None:
+            self.cursor = self.conn.cursor(cursor_factory=self._cursor_factory)
+        else:
+            self.cursor = self.conn.cursor()
+        if self._unit is not None and self._use_savepoint:
+            self._savepoint = self._unit.begin_savepoint(self.cursor)
         return self.cursor
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if exc_type is not None:
-            self.conn.rollback()
-        else:
-            self.conn.commit()
-        
+        if self._unit is not None:
+            try:
+                if self._savepoint is not None:
+                    self._unit.end_savepoint(self.cursor, self._savepoint, success=exc_type is None)
+                elif exc_type is not None:
+                    self._unit.rollback_block(self.cursor)
+            finally:
+                self._close_cursor()
+            return
+
+        try:
+            if exc_type is not None:
+                _safe_rollback(self.conn)
+            else:
+                self.conn.commit()
+        finally:
+            self._close_cursor()
+            if self.conn:
+                return_connection(self.conn)
+
+    def _close_cursor(self):
         if self.cursor:
-            self.cursor.close()
-        
-        if self.conn:
-            return_connection(self.conn)
+            try:
+                self.cursor.close()
+            except psycopg2.Error:
+                pass
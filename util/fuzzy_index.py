@@ -0,0 +1,80 @@
+"""
+Prebuilt fuzzy-match index over a fixed set of names.
+
+Equivalent to ``thefuzz.process.extractOne(query, choices, scorer=fuzz.ratio)``
+but built once: choices are normalized up front and bucketed by length.
+``fuzz.ratio`` can never exceed ``200 * min(len_a, len_b) / (len_a + len_b)``,
+so buckets are searched in order of that bound (closest lengths first) and
+the search stops once no remaining bucket can beat the best score found.
+Results for repeated queries (typos, chat spam) come from a small LRU.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from thefuzz import fuzz, utils
+
+
+class FuzzyIndex:
+    """Best-match lookups over a fixed list of choices, scored with ``fuzz.ratio``."""
+
+    def __init__(self, choices: Iterable[str], cache_size: int = 1024):
+        self.choices: List[str] = list(dict.fromkeys(c for c in choices if isinstance(c, str)))
+        self.cache_size = max(0, int(cache_size))
+        self._buckets: Dict[int, List[Tuple[int, str]]] = {}
+        for position, choice in enumerate(self.choices):
+            processed = utils.full_process(choice)
+            if processed:
+                self._buckets.setdefault(len(processed), []).append((position, processed))
+        self._lengths = sorted(self._buckets)
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[Optional[str], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    @staticmethod
+    def _max_ratio(query_length: int, choice_length: int) -> int:
+        return int(round(200.0 * min(query_length, choice_length) / (query_length + choice_length)))
+
+    def best_match(self, query: str, min_score: int = 0) -> Tuple[Optional[str], int]:
+        """Return ``(choice, score)`` for the best-scoring choice, or ``(None, 0)`` below ``min_score``."""
+        key = (query, min_score)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        result = self._search(query, min_score)
+
+        if self.cache_size:
+            with self._lock:
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def _search(self, query: str, min_score: int) -> Tuple[Optional[str], int]:
+        processed = utils.full_process(query or "")
+        if not processed or not self._lengths:
+            return None, 0
+
+        query_length = len(processed)
+        ordered = sorted(
+            ((self._max_ratio(query_length, length), length) for length in self._lengths),
+            reverse=True,
+        )
+        best_position, best_score = None, -1
+        for bound, length in ordered:
+            if bound < best_score or bound < min_score:
+                break
+            for position, candidate in self._buckets[length]:
+                score = fuzz.ratio(processed, candidate)
+                if score > best_score or (score == best_score and position < best_position):
+                    best_position, best_score = position, score
+
+        if best_position is None or best_score < min_score:
+            return None, 0
+        return self.choices[best_position], best_score
@@ -0,0 +1,200 @@
+"""
+Shared HTTP layer for the external catalog clients (Pokemon TCG, Scryfall,
+CS2 crates, Steam market).
+
+Every request goes through a per-host guard that combines:
+
+- a circuit breaker: after ``failure_threshold`` consecutive failures the host
+  is considered down and requests fail fast with ``CircuitOpenError`` until
+  ``reset_timeout`` has passed, when a single trial request is let through;
+- a concurrency cap, so a slow host can tie up at most ``max_concurrency``
+  threads;
+- for background warm-up fetches only, the per-host rate limiter from
+  ``util.catalog_warmup``, applied before a concurrency slot is taken so a
+  throttled warm-up never holds a slot while it sleeps.
+
+Retries are bounded by both ``max_retries`` and the breaker, so a dead
+upstream costs one fast failure instead of a full retry ladder per request.
+Callers pair this with stale-while-revalidate caches: serve what they have
+and refresh in the background.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from util.catalog_warmup import host_rate_limiter, in_warmup
+
+
+class HTTPClientError(Exception):
+    """Raised when a request fails after retries, or can't be attempted."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpenError(HTTPClientError):
+    """Raised without touching the network while a host's circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a half-open trial request."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """True if a request may be sent now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class HostGuard:
+    """Circuit breaker and concurrency cap for one host."""
+
+    def __init__(self, max_concurrency: int, failure_threshold: int, reset_timeout: float):
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.slots = threading.BoundedSemaphore(max(1, int(max_concurrency)))
+
+
+_host_guards: Dict[str, HostGuard] = {}
+_host_guards_lock = threading.Lock()
+
+
+def get_host_guard(host: str) -> HostGuard:
+    """Get the process-wide guard for a host, creating it on first use."""
+    with _host_guards_lock:
+        guard = _host_guards.get(host)
+        if guard is None:
+            guard = HostGuard(
+                max_concurrency=int(os.getenv("HTTP_MAX_CONCURRENCY_PER_HOST", "4")),
+                failure_threshold=int(os.getenv("HTTP_BREAKER_FAILURE_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("HTTP_BREAKER_RESET_SECONDS", "30")),
+            )
+            _host_guards[host] = guard
+        return guard
+
+
+def reset_host_guards() -> None:
+    """Forget all breaker state (used by tests and after config changes)."""
+    with _host_guards_lock:
+        _host_guards.clear()
+
+
+class HttpClient:
+    """JSON-over-HTTP GETs through the shared per-host guards."""
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        timeout: float = 8.0,
+        max_retries: int = 1,
+        retry_backoff: float = 0.25,
+    ):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.max_retries = max(0, int(max_retries))
+        self.retry_backoff = retry_backoff
+        self._logger = logging.getLogger(__name__)
+
+    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET ``url`` and decode the JSON body.
+
+        Connection errors, timeouts, 429 and 5xx responses count against the
+        host's breaker and are retried; other 4xx responses are raised at once.
+        """
+        host = (urlparse(url).hostname or url).lower()
+        guard = get_host_guard(host)
+        attempts = self.max_retries + 1
+
+        for attempt in range(1, attempts + 1):
+            if guard.breaker.state == CircuitBreaker.OPEN:
+                raise CircuitOpenError(f"Circuit open for {host}")
+            if in_warmup():
+                host_rate_limiter.wait(url)
+            if not guard.slots.acquire(timeout=self.timeout):
+                raise HTTPClientError(f"Too many concurrent requests to {host}")
+
+            try:
+                if not guard.breaker.allow():
+                    raise CircuitOpenError(f"Circuit open for {host}")
+                try:
+                    response = self.session.get(url, params=params or {}, timeout=self.timeout)
+                    status = response.status_code
+                except requests.exceptions.RequestException:
+                    raise
+                except Exception:
+                    # Still settle the attempt, or a half-open trial would stay in flight forever.
+                    guard.breaker.record_failure()
+                    raise
+                if status == 429 or status >= 500:
+                    error: Exception = HTTPClientError(f"{host} returned HTTP {status}", status_code=status)
+                else:
+                    # The host answered; a 4xx is the caller's problem, not an outage.
+                    guard.breaker.record_success()
+                    if status >= 400:
+                        raise HTTPClientError(f"{host} returned HTTP {status}", status_code=status)
+                    try:
+                        return response.json()
+                    except ValueError as exc:
+                        raise HTTPClientError(f"{host} returned invalid JSON") from exc
+            except requests.exceptions.RequestException as exc:
+                error = exc
+            finally:
+                guard.slots.release()
+
+            guard.breaker.record_failure()
+            self._logger.warning(
+                "HTTP request failed host=%s (attempt %s/%s) error=%s",
+                host,
+                attempt,
+                attempts,
+                error,
+            )
+            if attempt >= attempts or guard.breaker.state != CircuitBreaker.CLOSED:
+                raise HTTPClientError(str(error)) from error
+            time.sleep(self.retry_backoff * attempt)
+
+        raise HTTPClientError(f"Request to {host} failed")
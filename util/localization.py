@@ -5,12 +5,40 @@ Manages loading, retrieving, and formatting translated strings.
 
 import json
 import os
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, NamedTuple
 import logging
 
+from util.metrics import cache_requests
+
+_lookup_hits = cache_requests.labels("localization", "hit")
+_lookup_misses = cache_requests.labels("localization", "miss")
+
+
+class CompiledString(NamedTuple):
+    """A translation template plus whether it has placeholders to format."""
+    template: str
+    needs_format: bool
+
+
+def _flatten(node: Any, prefix: str, values: Dict[str, Any]) -> None:
+    """Record every dot-separated path in a nested translation dict."""
+    for key, value in node.items():
+        path = f"{prefix}.{key}" if prefix else key
+        values[path] = value
+        if isinstance(value, dict):
+            _flatten(value, path, values)
+
 
 class LocalizationManager:
-    """Manages translations for the bot across multiple languages."""
+    """Manages translations for the bot across multiple languages.
+
+    Each language is compiled once into flat key -> value maps with the
+    default language already merged in, so lookups are a single dict access.
+    """
+
+    # Log each missing key at most once per this many seconds.
+    missing_key_log_interval = 300.0
     
     def __init__(self, strings_dir: str = "strings", default_language: str = "en_US"):
         """
@@ -24,7 +52,14 @@ class LocalizationManager:
         self.default_language = default_language
         self.current_language = default_language
         self.translations: Dict[str, Dict] = {}
+        self._strings: Dict[str, Dict[str, CompiledString]] = {}
+        self._values: Dict[str, Dict[str, Any]] = {}
+        self._missing_logged_at: Dict[str, float] = {}
         self.logger = logging.getLogger(__name__)
+        # Request languages come from clients; only codes with a strings file are ever loaded or cached.
+        self._known_languages: Dict[str, str] = {
+            self._language_key(code): code for code in self.get_available_languages()
+        }
         
         # Load default language and current language
         self._load_language(default_language)
@@ -43,6 +78,9 @@ class LocalizationManager:
         """
         if language_code in self.translations:
             return True  # Already loaded
+        if self._known_languages.get(self._language_key(language_code)) != language_code:
+            self.logger.warning(f"Unknown language: {language_code!r}")
+            return False
         
         file_path = os.path.join(self.strings_dir, f"{language_code}.json")
         
@@ -53,6 +91,7 @@ class LocalizationManager:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 self.translations[language_code] = json.load(f)
+            self._compile(language_code)
             self.logger.info(f"Loaded translations for {language_code}")
             return True
         except Exception as e:
@@ -77,6 +116,54 @@ class LocalizationManager:
         self.logger.info(f"Language changed to {language_code}")
         return True
     
+    def _compile(self, language_code: str) -> None:
+        """Build the flat lookup maps for a loaded language, merged over the default language."""
+        own: Dict[str, Any] = {}
+        _flatten(self.translations[language_code], "", own)
+        values: Dict[str, Any] = {}
+        strings: Dict[str, CompiledString] = {}
+        if language_code != self.default_language and self._load_language(self.default_language):
+            values.update(self._values[self.default_language])
+            strings.update(self._strings[self.default_language])
+        values.update(own)
+        strings.update(
+            (key, CompiledString(value, "{" in value or "}" in value))
+            for key, value in own.items()
+            if isinstance(value, str)
+        )
+        self._values[language_code] = values
+        self._strings[language_code] = strings
+
+    @staticmethod
+    def _language_key(language_code: str) -> str:
+        return str(language_code).strip().replace("-", "_").casefold()
+
+    def resolve_language(self, language: str) -> str:
+        """Map a client-supplied code onto a known locale ("pt-br" -> "pt_BR"), else the default language."""
+        return self._known_languages.get(self._language_key(language), self.default_language)
+
+    def _catalog(self, language: str):
+        """Flat maps for a language, loading it on first use; unknown languages use the default."""
+        strings = self._strings.get(language)
+        if strings is None:
+            language = self.resolve_language(language)
+            strings = self._strings.get(language)
+            if strings is None:
+                if not self._load_language(language):
+                    # A known locale whose file failed to load; fall back without caching under its name.
+                    self._load_language(self.default_language)
+                    return self._strings.get(self.default_language, {}), self._values.get(self.default_language, {})
+                strings = self._strings[language]
+        return strings, self._values[language]
+
+    def _log_missing(self, key: str) -> None:
+        now = time.monotonic()
+        last = self._missing_logged_at.get(key)
+        if last is not None and now - last < self.missing_key_log_interval:
+            return
+        self._missing_logged_at[key] = now
+        self.logger.warning(f"Translation key not found: {key}")
+
     def get_string(self, key: str, language: Optional[str] = None, **kwargs) -> str:
         """
         Get a translated string by key.
@@ -89,92 +176,27 @@ class LocalizationManager:
         Returns:
             Translated string, or the key itself if not found (with fallback to default language)
         """
-        lang = language or self.current_language
-
-        # Load requested language lazily if it hasn't been loaded yet.
-        if lang not in self.translations:
-            self._load_language(lang)
-        
-        # Try to get string from requested language
-        string = self._get_nested_value(lang, key)
-        
-        # Fallback to default language if not found
-        if string is None and lang != self.default_language:
-            if self.default_language not in self.translations:
-                self._load_language(self.default_language)
-            self.logger.debug(f"Key '{key}' not found in {lang}, falling back to {self.default_language}")
-            string = self._get_nested_value(self.default_language, key)
-        
-        # If still not found, return the key
-        if string is None:
-            self.logger.warning(f"Translation key not found: {key}")
+        strings, _ = self._catalog(language or self.current_language)
+        compiled = strings.get(key)
+        if compiled is None:
+            _lookup_misses.inc()
+            self._log_missing(key)
             return key
-        
-        # Format string with provided arguments
-        if kwargs:
+        _lookup_hits.inc()
+
+        if kwargs and compiled.needs_format:
             try:
-                string = string.format(**kwargs)
+                return compiled.template.format(**kwargs)
             except KeyError as e:
                 self.logger.error(f"Missing format argument for key '{key}': {e}")
-        
-        return string
+        return compiled.template
 
     def get_value(self, key: str, language: Optional[str] = None, default=None):
         """Get any translated value (string, list, dict) by key with fallback."""
-        lang = language or self.current_language
-
-        if lang not in self.translations:
-            self._load_language(lang)
-
-        value = self._get_nested_any(lang, key)
-        if value is None and lang != self.default_language:
-            if self.default_language not in self.translations:
-                self._load_language(self.default_language)
-            value = self._get_nested_any(self.default_language, key)
-
+        _, values = self._catalog(language or self.current_language)
+        value = values.get(key)
         return default if value is None else value
     
-    def _get_nested_value(self, language: str, key: str) -> Optional[str]:
-        """
-        Get a value from nested dictionary using dot notation.
-        
-        Args:
-            language: Language code
-            key: Dot-separated key path
-            
-        Returns:
-            The value if found, None otherwise
-        """
-        if language not in self.translations:
-            return None
-        
-        keys = key.split('.')
-        value = self.translations[language]
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return None
-        
-        return value if isinstance(value, str) else None
-
-    def _get_nested_any(self, language: str, key: str):
-        """Get a value from nested dictionary using dot notation, preserving original type."""
-        if language not in self.translations:
-            return None
-
-        keys = key.split('.')
-        value = self.translations[language]
-
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return None
-
-        return value
-    
     def get_available_languages(self) -> list:
         """Get list of available language codes in the strings directory."""
         languages = []
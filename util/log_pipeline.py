@@ -0,0 +1,180 @@
+"""
+Queue-based logging for the server hot path.
+
+Request threads only put records on an in-memory queue (``QueueHandler``);
+a background ``QueueListener`` thread formats them and does the file and
+console I/O, so a slow disk or console never blocks a chat message.
+
+Configured from the ``[logging]`` section of config.toml:
+
+* ``level`` - logger and handler level ("INFO" by default; "DEBUG" enables
+  the per-message hot-path lines);
+* ``format`` - "text" (the classic one-line layout) or "json" (one object per
+  line, including any ``extra`` fields such as the request session);
+* ``sample_every`` - ``{logger_name = N}``: keep 1 in N records below WARNING
+  from that logger and its children. Warnings and errors are never sampled.
+"""
+import atexit
+import copy
+import itertools
+import json
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed via ``extra=`` or a filter.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only the first of every N records below WARNING for the configured loggers.
+
+    ``sample_every`` maps logger names to N; a name also covers its child
+    loggers, and the most specific configured name wins.
+    """
+
+    def __init__(self, sample_every: Dict[str, int]):
+        super().__init__()
+        self.sample_every = {name: int(n) for name, n in sample_every.items() if int(n) > 1}
+        self._counters: Dict[str, itertools.count] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str):
+        while name:
+            rate = self.sample_every.get(name)
+            if rate is not None:
+                return name, rate
+            name = name.rpartition(".")[0]
+        return None, 1
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.sample_every:
+            return True
+        name, rate = self._rate_for(record.name)
+        if rate <= 1:
+            return True
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(name, itertools.count())
+        return next(counter) % rate == 0
+
+
+class _PreparedQueueHandler(QueueHandler):
+    """QueueHandler that leaves the layout to the listener's formatters.
+
+    The stock ``prepare`` formats the whole record on the calling thread; only
+    merging the message arguments and rendering a traceback have to happen
+    there, since neither may be safe to touch once the record changes threads.
+    """
+
+    _traceback_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = self._traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LogPipeline:
+    """A queue handler for one or more loggers, drained by a background listener.
+
+    Attaching to the root logger covers every module logger that propagates.
+    """
+
+    def __init__(
+        self,
+        handlers: Iterable[logging.Handler],
+        level: int = logging.INFO,
+        sample_every: Optional[Dict[str, int]] = None,
+    ):
+        self.handlers: List[logging.Handler] = list(handlers)
+        self.level = level
+        self.queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.handler = _PreparedQueueHandler(self.queue)
+        if sample_every:
+            self.handler.addFilter(SamplingFilter(sample_every))
+        self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self._loggers: List[Tuple[logging.Logger, int]] = []
+        self._started = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict, filename: str) -> "LogPipeline":
+        """Build file and console handlers from the ``[logging]`` section of config.toml."""
+        section = config.get("logging", {}) if isinstance(config, dict) else {}
+        level = logging.getLevelName(str(section.get("level", "INFO")).upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+        if str(section.get("format", "text")).strip().lower() == "json":
+            formatter: logging.Formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(TEXT_FORMAT)
+
+        handlers = [logging.FileHandler(filename), logging.StreamHandler()]
+        for handler in handlers:
+            handler.setLevel(level)
+            handler.setFormatter(formatter)
+        return cls(handlers, level=level, sample_every=section.get("sample_every") or None)
+
+    def attach(self, logger: logging.Logger) -> None:
+        """Route ``logger`` and its children through the queue at the pipeline's level."""
+        self._loggers.append((logger, logger.level))
+        logger.setLevel(self.level)
+        logger.addHandler(self.handler)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self.listener.start()
+            self._started = True
+        # The listener thread is a daemon; flush what is still queued at interpreter exit.
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Detach from the loggers, write out queued records and close the handlers."""
+        with self._lock:
+            for logger, level in self._loggers:
+                logger.removeHandler(self.handler)
+                logger.setLevel(level)
+            self._loggers.clear()
+            if not self._started:
+                return
+            self._started = False
+            self.listener.stop()
+        atexit.unregister(self.stop)
+        for handler in self.handlers:
+            handler.close()
@@ -0,0 +1,294 @@
+"""
+Follow a growing log file (CS2's console.log) without busy-waiting.
+
+``LogTailer`` reads whatever has been appended since the last wakeup and
+then blocks on a watcher until the file changes again. Watchers:
+
+* ``InotifyWatcher`` - inotify on Linux, via ctypes (no extra dependency).
+* ``Win32ChangeWatcher`` - directory change notifications on Windows (pywin32).
+* ``PollingWatcher`` - sleeps with exponential backoff; used everywhere else
+  and whenever a notification backend cannot be set up.
+
+Notification watchers still wake up on a timeout, so a missed event only
+delays a line instead of losing it. On every idle wakeup the tailer checks
+whether the file was rotated (different inode) or truncated (smaller than
+the read position) and starts over from the beginning of the new content.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class PollingWatcher:
+    """Sleep between checks, doubling the interval while the file stays idle."""
+
+    def __init__(self, min_interval: float = 0.05, max_interval: float = 0.5):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self._interval = min_interval
+
+    def wait(self, stop_event: threading.Event) -> None:
+        stop_event.wait(self._interval)
+        self._interval = min(self.max_interval, self._interval * 2)
+
+    def reset(self) -> None:
+        self._interval = self.min_interval
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Block until the watched file's directory reports a change to it (Linux only)."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, path: str, timeout: float = 0.5):
+        # Watch the directory rather than the file so rotation and re-creation are seen too.
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.filename = os.fsencode(os.path.basename(path))
+        self.timeout = timeout
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        if libc.inotify_add_watch(self._fd, os.fsencode(self.directory), self.WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            self._fd = -1
+            raise OSError(errno, f"inotify_add_watch failed for {self.directory}: {os.strerror(errno)}")
+
+    def wait(self, stop_event: threading.Event) -> None:
+        if self._fd < 0 or stop_event.is_set():
+            return
+        readable, _, _ = select.select([self._fd], [], [], self.timeout)
+        if readable:
+            self._drain()
+
+    def _drain(self) -> bool:
+        """Consume queued events; returns True if any concerned the watched file."""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self._fd, 4096)
+            except BlockingIOError:
+                return relevant
+            if not data:
+                return relevant
+            offset = 0
+            while offset + self._EVENT_HEADER.size <= len(data):
+                _, mask, _, length = self._EVENT_HEADER.unpack_from(data, offset)
+                offset += self._EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & self.IN_Q_OVERFLOW or name == self.filename:
+                    relevant = True
+
+    def reset(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class Win32ChangeWatcher:
+    """Block on a Windows change notification for the log file's directory."""
+
+    def __init__(self, path: str, timeout: float = 0.5):
+        import win32con
+        import win32event
+        import win32file
+
+        self._win32event = win32event
+        self._win32file = win32file
+        self.timeout = timeout
+        self._handle = win32file.FindFirstChangeNotification(
+            os.path.dirname(os.path.abspath(path)),
+            False,
+            win32con.FILE_NOTIFY_CHANGE_SIZE
+            | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE
+            | win32con.FILE_NOTIFY_CHANGE_FILE_NAME,
+        )
+
+    def wait(self, stop_event: threading.Event) -> None:
+        if self._handle is None or stop_event.is_set():
+            return
+        result = self._win32event.WaitForSingleObject(self._handle, int(self.timeout * 1000))
+        if result == self._win32event.WAIT_OBJECT_0:
+            self._win32file.FindNextChangeNotification(self._handle)
+
+    def reset(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._win32file.FindCloseChangeNotification(self._handle)
+            self._handle = None
+
+
+def create_watcher(path: str, backend: str = "auto", max_interval: float = 0.5):
+    """Build the watcher for ``backend`` ("auto", "inotify", "win32" or "poll").
+
+    Falls back to polling when the requested notification backend is unavailable.
+    """
+    backend = (backend or "auto").lower()
+    if backend == "auto":
+        if sys.platform.startswith("linux"):
+            backend = "inotify"
+        elif sys.platform == "win32":
+            backend = "win32"
+        else:
+            backend = "poll"
+
+    try:
+        if backend == "inotify":
+            return InotifyWatcher(path, timeout=max_interval)
+        if backend == "win32":
+            return Win32ChangeWatcher(path, timeout=max_interval)
+    except (AttributeError, ImportError, OSError) as e:
+        logger.warning(f"File change notifications unavailable ({backend}): {e}; falling back to polling.")
+    return PollingWatcher(max_interval=max_interval)
+
+
+class LogTailer:
+    """Yield lines appended to ``path``, waiting on a watcher between reads.
+
+    Only complete lines are yielded; a line still being written is held back
+    until its newline arrives. With ``from_end`` the existing content is
+    skipped on the first open, like ``tail -f``; rotated or truncated files
+    are always read from the start.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        watcher=None,
+        stop_event: Optional[threading.Event] = None,
+        from_end: bool = True,
+        encoding: str = "utf-8",
+    ):
+        self.path = path
+        self.watcher = watcher or PollingWatcher()
+        self.stop_event = stop_event or threading.Event()
+        self.from_end = from_end
+        self.encoding = encoding
+        self._file = None
+        self._identity = None
+        self._partial = b""
+        self._pending: List[str] = []
+
+    def _open(self, seek_end: bool) -> bool:
+        try:
+            handle = open(self.path, "rb")
+        except OSError:
+            return False
+        self._close_file()
+        self._file = handle
+        stat = os.fstat(handle.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        if seek_end:
+            handle.seek(0, os.SEEK_END)
+        self._partial = b""
+        return True
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _check_replaced(self) -> None:
+        """Reopen the file if it was rotated, re-created or truncated."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        if (stat.st_dev, stat.st_ino) != self._identity:
+            logger.info(f"{self.path} was replaced; reading the new file from the start.")
+            self._drain_file()
+            self._open(seek_end=False)
+        elif stat.st_size < self._file.tell():
+            logger.info(f"{self.path} was truncated; reading from the start.")
+            self._file.seek(0)
+            self._partial = b""
+
+    def _drain_file(self) -> None:
+        """Read what is left in the current handle (e.g. lines written just before rotation)."""
+        if self._file is None:
+            return
+        while self._read_chunk():
+            pass
+
+    def _read_chunk(self) -> bool:
+        data = self._file.read(READ_CHUNK_SIZE)
+        if not data:
+            return False
+        *complete, self._partial = (self._partial + data).split(b"\n")
+        self._pending.extend(line.decode(self.encoding, errors="replace") + "\n" for line in complete)
+        return True
+
+    def read_available(self, max_lines: int = 20) -> List[str]:
+        """Return up to ``max_lines`` complete lines without blocking."""
+        if self._file is None and not self._open(seek_end=self.from_end):
+            return []
+        while len(self._pending) < max_lines and self._read_chunk():
+            pass
+        lines, self._pending = self._pending[:max_lines], self._pending[max_lines:]
+        return lines
+
+    def batches(self, max_lines: int = 20) -> Iterator[List[str]]:
+        """Yield lists of new lines until ``stop_event`` is set; never yields an empty list."""
+        try:
+            while not self.stop_event.is_set():
+                lines = self.read_available(max_lines)
+                if lines:
+                    self.watcher.reset()
+                    yield lines
+                    continue
+
+                if self._file is not None:
+                    self._check_replaced()
+                    if self._pending:
+                        continue
+                self.watcher.wait(self.stop_event)
+        finally:
+            self.close()
+
+    def lines(self) -> Iterator[str]:
+        """Yield new lines one at a time."""
+        for batch in self.batches():
+            yield from batch
+
+    def parsed_batches(self, parse: Callable[[str], Optional[T]], max_lines: int = 20) -> Iterator[List[T]]:
+        """Yield lists of ``parse(line)`` results, dropping lines ``parse`` maps to None."""
+        for batch in self.batches(max_lines):
+            parsed = [result for result in map(parse, batch) if result is not None]
+            if parsed:
+                yield parsed
+
+    def close(self) -> None:
+        self._close_file()
+        self.watcher.close()
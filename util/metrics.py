@@ -0,0 +1,259 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+A small stand-in for ``prometheus_client`` (not a dependency): labelled
+counters and histograms that hot paths update cheaply, plus callback metrics
+that read existing stats (e.g. the database pool) when ``/metrics`` is
+scraped. Metrics are registered once at import time on the module-level
+``registry``; registering the same name again returns the existing metric.
+
+Every metric caps its number of label combinations (``max_series``); further
+combinations are folded into a single series whose label values are "other",
+so user-controlled labels such as session ids cannot grow memory unboundedly.
+"""
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; suits everything from a dict lookup to a slow upstream API call.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), max_series: int = 1000):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._children: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values) -> object:
+        """Return the child series for these label values, creating it on first use."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is not None:
+            return child
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                if len(self._children) >= self.max_series:
+                    key = ("other",) * len(self.labelnames)
+                    child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+            return child
+
+    def _series(self) -> List[Tuple[LabelValues, object]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled series."""
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, child in self._series():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Iterable[float] = DEFAULT_BUCKETS, max_series=1000):
+        super().__init__(name, documentation, labelnames, max_series)
+        self.bounds = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        """Record a value on the unlabelled series."""
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, child in self._series():
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.bounds + (math.inf,), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+CallbackResult = Union[None, float, Dict[LabelValues, float]]
+
+
+class CallbackMetric(_Metric):
+    """A gauge or counter whose values are read from ``callback`` at render time.
+
+    The callback returns a number, a ``{label_values: number}`` dict, or None
+    to omit the metric.
+    """
+
+    def __init__(self, name, documentation, callback: Callable[[], CallbackResult], labelnames=(), kind="gauge"):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        values = self.callback()
+        if values is None:
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        lines = self._header()
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together by ``render()``."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with a different shape")
+                if isinstance(existing, CallbackMetric):
+                    existing.callback = metric.callback
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (), max_series: int = 1000) -> Counter:
+        return self._register(Counter(name, documentation, labelnames, max_series))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        max_series: int = 1000,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets, max_series))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], CallbackResult],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric(name, documentation, callback, labelnames, kind))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Shared by every cache that reports hits and misses (TCG card pools, CS2 prices, localization, ...).
+cache_requests = registry.counter(
+    "bot_cache_requests_total",
+    "Cache lookups by cache and result (hit, stale, miss).",
+    ("cache", "result"),
+)
+
+
+def cache_result(cache: str, result: str) -> None:
+    """Count one lookup against ``cache`` with ``result`` "hit", "stale" or "miss"."""
+    cache_requests.labels(cache, result).inc()
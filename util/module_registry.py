@@ -84,7 +84,8 @@ class ModuleRegistry:
 
     def set_logger(self, logger):
         """Set a custom logger."""
-        if self.logger:
+        # Drop the default console handler, but never one from the logger being installed (e.g. a second BotServer).
+        if self.logger and self.logger is not logger and self.logger.handlers:
             self.logger.removeHandler(self.logger.handlers[0])
         self.logger = logger
 
@@ -2,13 +2,18 @@ import json
 import logging
 import os
 import random
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
 
+from util.card_store import CardStore, StoredCard
+from util.catalog_warmup import catalog_warmer
 from util.config import get_config_path
+from util.http_client import HTTPClientError, HttpClient
+from util.metrics import cache_result
 
 
 class MTGTCGAPIError(Exception):
@@ -20,21 +25,31 @@ class MTGTCGClient:
 
     BASE_URL = "https://api.scryfall.com"
 
+    CATALOG = "mtg"
+
     def __init__(self, timeout: float = 8.0, max_retries: int = 2):
         self.timeout = timeout
         self.max_retries = max(0, int(max_retries))
         self._logger = logging.getLogger(__name__)
         self._session = requests.Session()
+        self._http = HttpClient(self._session, timeout=timeout, max_retries=self.max_retries, retry_backoff=0.35)
 
         self._cache_ttl_seconds = int(os.getenv("MTG_TCG_CACHE_TTL_SECONDS", "43200"))
         configured_cache_path = os.getenv("MTG_TCG_CACHE_PATH", "").strip()
         if configured_cache_path:
             self._cache_path = Path(configured_cache_path)
         else:
-            config_dir = Path(get_config_path()).parent
-            self._cache_path = config_dir / "cache" / "mtg_tcg_cache.json"
+            self._cache_path = Path(get_config_path()).parent / "cache" / "mtg_tcg_cache.json"
+
+        configured_store_path = os.getenv("MTG_TCG_STORE_PATH", "").strip()
+        if configured_store_path:
+            store_path = Path(configured_store_path)
+        else:
+            store_path = Path(get_config_path()).parent / "cache" / "mtg_tcg_cards.sqlite3"
+        self._store = CardStore(store_path)
 
         self._set_name_cache: Dict[str, str] = {}
+        self._save_lock = threading.Lock()
         self._load_persistent_cache()
 
     def _load_persistent_cache(self) -> None:
@@ -44,9 +59,7 @@ class MTGTCGClient:
             payload = json.loads(self._cache_path.read_text(encoding="utf-8"))
             if not isinstance(payload, dict):
                 return
-            updated_at = float(payload.get("updated_at", 0))
-            if (time.time() - updated_at) > self._cache_ttl_seconds:
-                return
+            # Set names don't change once a set is released, so expired entries are kept.
             set_names = payload.get("set_names", {})
             if isinstance(set_names, dict):
                 self._set_name_cache = {
@@ -59,39 +72,28 @@ class MTGTCGClient:
 
     def _save_persistent_cache(self) -> None:
         try:
-            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
-            payload = {
-                "updated_at": time.time(),
-                "set_names": self._set_name_cache,
-            }
-            self._cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            with self._save_lock:
+                self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+                payload = {
+                    "updated_at": time.time(),
+                    "set_names": dict(self._set_name_cache),
+                }
+                self._cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
         except Exception:
             self._logger.exception("Failed saving MTG cache to %s", self._cache_path)
 
     def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        url = f"{self.BASE_URL}{path}"
-        attempts = self.max_retries + 1
         request_params = params or {}
-
-        for attempt in range(1, attempts + 1):
-            try:
-                response = self._session.get(url, params=request_params, timeout=self.timeout)
-                response.raise_for_status()
-                return response.json()
-            except requests.exceptions.RequestException as exc:
-                self._logger.warning(
-                    "MTG API request failed (attempt %s/%s) path=%s params=%s error=%s",
-                    attempt,
-                    attempts,
-                    path,
-                    request_params,
-                    exc,
-                )
-                if attempt >= attempts:
-                    raise MTGTCGAPIError(str(exc)) from exc
-                time.sleep(0.35 * attempt)
-
-        raise MTGTCGAPIError("Request failed")
+        try:
+            return self._http.get_json(f"{self.BASE_URL}{path}", params=request_params)
+        except HTTPClientError as exc:
+            self._logger.warning(
+                "MTG API request failed path=%s params=%s error=%s",
+                path,
+                request_params,
+                exc,
+            )
+            raise MTGTCGAPIError(str(exc)) from exc
 
     def _set_name(self, set_code: str) -> str:
         key = (set_code or "").strip().lower()
@@ -135,14 +137,69 @@ class MTGTCGClient:
                 continue
         return 0.25
 
+    def _compact_card(self, card: Dict[str, Any], set_name: str) -> StoredCard:
+        """Reduce a raw Scryfall card to the fields a pull needs."""
+        return StoredCard(
+            name=card.get("name", "Unknown Card"),
+            rarity=str(card.get("rarity", "unknown")).title(),
+            set_name=card.get("set_name") or set_name,
+            price=self._card_price(card),
+            good=self._is_good_card(card),
+        )
+
+    def _fetch_set_cards(self, set_code: str) -> List[StoredCard]:
+        """Download every paper printing in a set and replace its entry in the card store."""
+        set_name = self._set_name(set_code)
+        all_cards: List[Dict[str, Any]] = []
+        page = 1
+        while True:
+            payload = self._get(
+                "/cards/search",
+                params={
+                    "q": f"set:{set_code} game:paper",
+                    "unique": "prints",
+                    "page": page,
+                },
+            )
+            all_cards.extend(payload.get("data", []))
+            if not payload.get("has_more"):
+                break
+            page += 1
+
+        if not all_cards:
+            raise MTGTCGAPIError(f"No cards found for set '{set_code}'.")
+
+        compact = [self._compact_card(card, set_name) for card in all_cards]
+        info = self._store.replace_set(self.CATALOG, set_code, compact, set_name=set_name)
+        self._logger.info(
+            "MTG card pool cached set=%s cards=%s good_cards=%s",
+            set_code,
+            info.card_count,
+            info.good_count,
+        )
+        return compact
+
+    def _refresh_set(self, set_code: str) -> None:
+        if self._store.is_fresh(self.CATALOG, set_code, self._cache_ttl_seconds):
+            return
+        self._fetch_set_cards(set_code)
+
+    def is_set_cached(self, set_code: str) -> bool:
+        """True if pulls from this set can be served from the local card pool."""
+        info = self._store.set_info(self.CATALOG, (set_code or "").strip().lower())
+        return bool(info and info.card_count)
+
+    def prewarm_set(self, set_code: str) -> None:
+        try:
+            self._refresh_set(set_code.strip().lower())
+        except MTGTCGAPIError:
+            self._logger.exception("MTG prewarm failed for set=%s", set_code)
+
     def prewarm_sets(self, set_codes) -> None:
         for code in set_codes:
             if not isinstance(code, str) or not code.strip():
                 continue
-            try:
-                self._set_name(code.strip())
-            except MTGTCGAPIError:
-                self._logger.exception("MTG prewarm failed for set=%s", code)
+            self.prewarm_set(code)
 
     def _pull_random_card(self, query: str) -> Dict[str, Any]:
         return self._get("/cards/random", params={"q": query})
@@ -152,6 +209,27 @@ class MTGTCGClient:
         if not set_code:
             raise MTGTCGAPIError("Missing set_code")
 
+        if not self.is_set_cached(set_code):
+            cache_result("mtg_cards", "miss")
+            # Page through the set in the background; this pull uses a single random-card request.
+            catalog_warmer.warm(self.CATALOG, [set_code], self._refresh_set)
+        elif not self._store.is_fresh(self.CATALOG, set_code, self._cache_ttl_seconds):
+            cache_result("mtg_cards", "stale")
+            # Serve the stale pool now and refresh it in the background.
+            catalog_warmer.warm(self.CATALOG, [set_code], self._refresh_set)
+        else:
+            cache_result("mtg_cards", "hit")
+
+        if self.is_set_cached(set_code):
+            should_pull_good = random.random() < max(0.0, min(1.0, good_pull_chance))
+            card = None
+            if should_pull_good:
+                card = self._store.random_card(self.CATALOG, set_code, good=True)
+            if card is None:
+                card = self._store.random_card(self.CATALOG, set_code)
+            if card is not None:
+                return CardStore.to_pull(card)
+
         set_name = self._set_name(set_code)
         should_pull_good = random.random() < max(0.0, min(1.0, good_pull_chance))
 
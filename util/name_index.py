@@ -0,0 +1,136 @@
+"""
+Name resolution over a fixed catalog (fish, shop items, cases).
+
+User-typed names are resolved in tiers: exact name, exact alias, substring
+of a name, substring of an alias, then fuzzy (``fuzz.ratio``) above a
+threshold. Keys are normalized once when the index is built, the fuzzy tier
+uses a prebuilt ``FuzzyIndex``, and resolved queries are kept in an LRU.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from util.fuzzy_index import FuzzyIndex
+
+T = TypeVar("T")
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(str(name).split()).lower()
+
+
+class NameIndex(Generic[T]):
+    """Resolve names and aliases to catalog entries.
+
+    ``entries`` are ``(name, aliases, value)`` tuples. When ``fuzzy_aliases``
+    is set, aliases take part in the fuzzy tier as well as the exact ones.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[Tuple[str, Iterable[str], T]],
+        fuzzy_aliases: bool = False,
+        cache_size: int = 1024,
+    ):
+        self.values: List[T] = []
+        self._names: Dict[str, int] = {}
+        self._aliases: Dict[str, int] = {}
+        self._name_keys: List[Tuple[str, int]] = []
+        self._alias_keys: List[Tuple[str, int]] = []
+        fuzzy_keys: Dict[str, int] = {}
+
+        for name, aliases, value in entries:
+            if not isinstance(name, str) or not name.strip():
+                continue
+            position = len(self.values)
+            self.values.append(value)
+            key = normalize_name(name)
+            self._names.setdefault(key, position)
+            self._name_keys.append((key, position))
+            fuzzy_keys.setdefault(key, position)
+            for alias in aliases or ():
+                if isinstance(alias, str) and alias.strip():
+                    alias_key = normalize_name(alias)
+                    self._aliases.setdefault(alias_key, position)
+                    self._alias_keys.append((alias_key, position))
+                    if fuzzy_aliases:
+                        fuzzy_keys.setdefault(alias_key, position)
+
+        self._fuzzy_positions = fuzzy_keys
+        self._fuzzy = FuzzyIndex(fuzzy_keys, cache_size=0)
+        self.cache_size = max(0, int(cache_size))
+        self._cache: "OrderedDict[Tuple[str, bool, bool, Optional[int]], Optional[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get(self, name: str) -> Optional[T]:
+        """Exact, case-insensitive lookup by name only."""
+        position = self._names.get(normalize_name(name or ""))
+        return None if position is None else self.values[position]
+
+    def resolve(
+        self,
+        query: str,
+        aliases: bool = True,
+        substring: bool = False,
+        fuzzy_min: Optional[int] = None,
+        accept: Optional[Callable[[T], bool]] = None,
+    ) -> Optional[T]:
+        """Resolve ``query`` through the enabled tiers and return the matching entry, or None.
+
+        ``accept`` restricts results to entries it returns True for (results
+        are then not cached, since the filter can change between calls).
+        """
+        key = normalize_name(query or "")
+        if not key:
+            return None
+
+        if accept is not None:
+            position = self._lookup(key, aliases, substring, fuzzy_min, accept)
+            return None if position is None else self.values[position]
+
+        cache_key = (key, aliases, substring, fuzzy_min)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                position = self._cache[cache_key]
+                return None if position is None else self.values[position]
+
+        position = self._lookup(key, aliases, substring, fuzzy_min, None)
+
+        if self.cache_size:
+            with self._lock:
+                self._cache[cache_key] = position
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return None if position is None else self.values[position]
+
+    def _lookup(self, key, aliases, substring, fuzzy_min, accept) -> Optional[int]:
+        def ok(position: Optional[int]) -> bool:
+            return position is not None and (accept is None or accept(self.values[position]))
+
+        position = self._names.get(key)
+        if ok(position):
+            return position
+        if aliases:
+            position = self._aliases.get(key)
+            if ok(position):
+                return position
+
+        if substring:
+            for keys in (self._name_keys, self._alias_keys if aliases else ()):
+                for candidate, position in keys:
+                    if key in candidate and ok(position):
+                        return position
+
+        if fuzzy_min is None:
+            return None
+        if accept is None:
+            match, _ = self._fuzzy.best_match(key, min_score=fuzzy_min)
+            return None if match is None else self._fuzzy_positions[match]
+
+        allowed = [candidate for candidate, position in self._fuzzy_positions.items() if ok(position)]
+        match, _ = FuzzyIndex(allowed, cache_size=0).best_match(key, min_score=fuzzy_min)
+        return None if match is None else self._fuzzy_positions[match]
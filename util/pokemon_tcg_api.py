@@ -1,5 +1,4 @@
 import random
-import time
 import logging
 import os
 import json
@@ -8,7 +7,11 @@ from typing import Any, Dict, List, Optional
 
 import requests
 
+from util.card_store import CardStore, StoredCard
+from util.catalog_warmup import catalog_warmer
 from util.config import get_config_path
+from util.http_client import HTTPClientError, HttpClient
+from util.metrics import cache_result
 
 
 class PokemonTCGAPIError(Exception):
@@ -20,40 +23,53 @@ class PokemonTCGClient:
 
     BASE_URL = "https://api.pokemontcg.io/v2"
 
+    CATALOG = "pokemon"
+
     def __init__(self, api_key: Optional[str] = None, timeout: float = 10.0, max_retries: int = 2):
         self.timeout = timeout
         self.max_retries = max(0, int(max_retries))
-        self._cache: Dict[str, List[Dict[str, Any]]] = {}
         self._count_cache: Dict[str, int] = {}
         self._logger = logging.getLogger(__name__)
         self._cache_ttl_seconds = int(os.getenv("POKEMON_TCG_CACHE_TTL_SECONDS", "43200"))
 
+        config_dir = Path(get_config_path()).parent
         configured_cache_path = os.getenv("POKEMON_TCG_CACHE_PATH", "").strip()
         if configured_cache_path:
             self._cache_path = Path(configured_cache_path)
         else:
-            config_dir = Path(get_config_path()).parent
             self._cache_path = config_dir / "cache" / "pokemon_tcg_cache.json"
 
+        configured_store_path = os.getenv("POKEMON_TCG_STORE_PATH", "").strip()
+        if configured_store_path:
+            store_path = Path(configured_store_path)
+        else:
+            store_path = config_dir / "cache" / "pokemon_tcg_cards.sqlite3"
+        self._store = CardStore(store_path)
+
         self._session = requests.Session()
         if api_key:
             self._session.headers.update({"X-Api-Key": api_key})
+        self._http = HttpClient(self._session, timeout=timeout, max_retries=self.max_retries, retry_backoff=0.4)
+
+        self._import_legacy_cache()
 
-        self._load_persistent_cache()
+    def _import_legacy_cache(self) -> None:
+        """Move sets from the old monolithic JSON cache into the card store.
 
-    def _load_persistent_cache(self) -> None:
+        The JSON file is renamed to ``*.imported`` afterwards, so it is parsed on
+        the first startup only.
+        """
         try:
             if not self._cache_path.exists():
                 return
 
             payload = json.loads(self._cache_path.read_text(encoding="utf-8"))
             if not isinstance(payload, dict):
-                return
+                payload = {}
 
-            now = time.time()
-            loaded_sets = 0
+            imported_sets = 0
             for set_id, entry in payload.items():
-                if not isinstance(entry, dict):
+                if not isinstance(entry, dict) or self._store.set_info(self.CATALOG, set_id):
                     continue
 
                 updated_at = entry.get("updated_at", 0)
@@ -61,48 +77,62 @@ class PokemonTCGClient:
                 if not isinstance(cards, list) or not cards:
                     continue
 
-                if (now - float(updated_at)) > self._cache_ttl_seconds:
-                    continue
-
-                self._cache[set_id] = cards
-                loaded_sets += 1
+                # Expired sets are still imported; they are served stale and refreshed in the background.
+                self._store_cards(set_id, cards, updated_at=float(updated_at))
+                imported_sets += 1
 
-            if loaded_sets:
+            if imported_sets:
                 self._logger.info(
-                    "Loaded Pokemon TCG cache from disk sets=%s path=%s",
-                    loaded_sets,
+                    "Imported Pokemon TCG JSON cache into card store sets=%s path=%s",
+                    imported_sets,
                     self._cache_path,
                 )
+            self._cache_path.replace(self._cache_path.with_name(self._cache_path.name + ".imported"))
         except Exception:
-            self._logger.exception("Failed loading Pokemon TCG cache from %s", self._cache_path)
+            self._logger.exception("Failed importing Pokemon TCG cache from %s", self._cache_path)
+
+    def _has_cached_set(self, set_id: str) -> bool:
+        return self._store.is_fresh(self.CATALOG, set_id, self._cache_ttl_seconds)
+
+    def _has_stored_set(self, set_id: str) -> bool:
+        info = self._store.set_info(self.CATALOG, set_id)
+        return bool(info and info.card_count)
+
+    def _compact_card(self, card: Dict[str, Any], set_id: str) -> StoredCard:
+        """Reduce a raw API card to the fields a pull needs."""
+        set_data = card.get("set", {}) if isinstance(card.get("set"), dict) else {}
+        return StoredCard(
+            name=card.get("name", "Unknown Card"),
+            rarity=card.get("rarity", "Unknown"),
+            set_name=set_data.get("name", set_id),
+            price=round(self._card_price(card), 2),
+            good=self._is_good_card(card),
+        )
+
+    def _store_cards(self, set_id: str, cards: List[Dict[str, Any]], updated_at: Optional[float] = None) -> List[StoredCard]:
+        compact = [self._compact_card(card, set_id) for card in cards]
+        self._store.replace_set(self.CATALOG, set_id, compact, updated_at=updated_at)
+        return compact
+
+    def is_set_cached(self, set_id: str) -> bool:
+        """True if pulls from this set can be served from the local card store (fresh or stale)."""
+        return self._has_stored_set(set_id)
 
-    def _save_persistent_cache(self) -> None:
+    def prewarm_set(self, set_id: str, sample_size: int = 120) -> None:
+        """Preload a sample of cards for one set to reduce open-time API latency."""
         try:
-            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
-            now = time.time()
-            payload = {
-                set_id: {
-                    "updated_at": now,
-                    "cards": cards,
-                }
-                for set_id, cards in self._cache.items()
-                if cards
-            }
-            self._cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
-        except Exception:
-            self._logger.exception("Failed saving Pokemon TCG cache to %s", self._cache_path)
+            self._warm_set_sample(set_id.strip(), sample_size=sample_size)
+        except PokemonTCGAPIError:
+            self._logger.exception("Pokemon TCG prewarm failed for set_id=%s", set_id)
 
     def prewarm_sets(self, set_ids: List[str], sample_size: int = 120) -> None:
         """Preload a sample of cards for each set to reduce open-time API latency."""
         unique_sets = [s for s in dict.fromkeys(set_ids) if isinstance(s, str) and s.strip()]
         for set_id in unique_sets:
-            try:
-                self._warm_set_sample(set_id.strip(), sample_size=sample_size)
-            except PokemonTCGAPIError:
-                self._logger.exception("Pokemon TCG prewarm failed for set_id=%s", set_id)
+            self.prewarm_set(set_id, sample_size=sample_size)
 
     def _warm_set_sample(self, set_id: str, sample_size: int = 120) -> None:
-        if set_id in self._cache and self._cache[set_id]:
+        if self._has_cached_set(set_id):
             return
 
         query = f"set.id:{set_id}"
@@ -124,8 +154,7 @@ class PokemonTCGClient:
         if not cards:
             raise PokemonTCGAPIError(f"No cards returned while prewarming set '{set_id}'.")
 
-        self._cache[set_id] = cards
-        self._save_persistent_cache()
+        self._store_cards(set_id, cards)
         self._logger.info(
             "Pokemon TCG cache warmed set_id=%s cached_cards=%s total_cards=%s",
             set_id,
@@ -134,36 +163,21 @@ class PokemonTCGClient:
         )
 
     def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        url = f"{self.BASE_URL}{path}"
         request_params = params or {}
-        attempts = self.max_retries + 1
-
-        for attempt in range(1, attempts + 1):
-            try:
-                response = self._session.get(url, params=request_params, timeout=self.timeout)
-                response.raise_for_status()
-                return response.json()
-            except requests.exceptions.RequestException as exc:
-                self._logger.warning(
-                    "Pokemon TCG API request failed (attempt %s/%s) path=%s params=%s error=%s",
-                    attempt,
-                    attempts,
-                    path,
-                    request_params,
-                    exc,
-                )
-                if attempt >= attempts:
-                    self._logger.exception(
-                        "Pokemon TCG API request exhausted retries path=%s params=%s",
-                        path,
-                        request_params,
-                    )
-                    raise PokemonTCGAPIError(str(exc)) from exc
-                time.sleep(0.4 * attempt)
-
-    def _fetch_set_cards(self, set_id: str) -> List[Dict[str, Any]]:
-        if set_id in self._cache:
-            return self._cache[set_id]
+        try:
+            return self._http.get_json(f"{self.BASE_URL}{path}", params=request_params)
+        except HTTPClientError as exc:
+            self._logger.warning(
+                "Pokemon TCG API request failed path=%s params=%s error=%s",
+                path,
+                request_params,
+                exc,
+            )
+            raise PokemonTCGAPIError(str(exc)) from exc
+
+    def _fetch_set_cards(self, set_id: str) -> List[StoredCard]:
+        if self._has_cached_set(set_id):
+            return list(self._store.cards(self.CATALOG, set_id))
 
         if not set_id:
             raise PokemonTCGAPIError("Missing set_id for Pokemon pack pull.")
@@ -196,9 +210,7 @@ class PokemonTCGClient:
             self._logger.error("Pokemon TCG API returned no cards for set_id=%s", set_id)
             raise PokemonTCGAPIError(f"No cards found for set '{set_id}'.")
 
-        self._cache[set_id] = all_cards
-        self._save_persistent_cache()
-        return all_cards
+        return self._store_cards(set_id, all_cards)
 
     def _count_query(self, query: str) -> int:
         cached = self._count_cache.get(query)
@@ -292,34 +304,32 @@ class PokemonTCGClient:
         if not set_id:
             raise PokemonTCGAPIError("Missing set_id for Pokemon pack pull.")
 
-        cached_cards = self._cache.get(set_id, [])
-        if cached_cards:
+        if self._has_stored_set(set_id):
+            if self._has_cached_set(set_id):
+                cache_result("pokemon_cards", "hit")
+            else:
+                cache_result("pokemon_cards", "stale")
+                # Serve the stale set now and refresh it in the background.
+                catalog_warmer.warm(self.CATALOG, [set_id], self.prewarm_set)
             should_pull_good = random.random() < max(0.0, min(1.0, good_pull_chance))
+            card = None
             if should_pull_good:
-                cached_good = [card for card in cached_cards if self._is_good_card(card)]
-                if cached_good:
-                    card = random.choice(cached_good)
-                else:
-                    card = random.choice(cached_cards)
-            else:
-                card = random.choice(cached_cards)
+                card = self._store.random_card(self.CATALOG, set_id, good=True)
+            if card is None:
+                card = self._store.random_card(self.CATALOG, set_id)
 
-            good_hit = self._is_good_card(card)
-            set_data = card.get("set", {}) if isinstance(card.get("set"), dict) else {}
-            self._logger.info(
-                "Pokemon TCG pull (cache hit) set_id=%s good_roll=%s good_hit=%s card=%s",
-                set_id,
-                should_pull_good,
-                good_hit,
-                card.get("name", "Unknown Card"),
-            )
-            return {
-                "name": card.get("name", "Unknown Card"),
-                "rarity": card.get("rarity", "Unknown"),
-                "set_name": set_data.get("name", set_id),
-                "price": round(self._card_price(card), 2),
-                "good_hit": good_hit,
-            }
+            if card is not None:
+                self._logger.info(
+                    "Pokemon TCG pull (cache hit) set_id=%s good_roll=%s good_hit=%s card=%s",
+                    set_id,
+                    should_pull_good,
+                    card.good,
+                    card.name,
+                )
+                return CardStore.to_pull(card)
+
+        else:
+            cache_result("pokemon_cards", "miss")
 
         base_query = f"set.id:{set_id}"
         should_pull_good = random.random() < max(0.0, min(1.0, good_pull_chance))
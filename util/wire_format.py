@@ -0,0 +1,62 @@
+"""
+Body encoding between the adapters and the bot server.
+
+JSON is always understood. When ``msgpack`` is installed (optional,
+``pip install msgpack``) the server also accepts ``application/msgpack``
+request bodies and answers in msgpack to clients that list it in their
+``Accept`` header. Clients only switch their request bodies to msgpack after
+the server has answered in it, so old servers keep working unchanged.
+"""
+import json
+from typing import Any, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def _media_type(header: Optional[str]) -> str:
+    return (header or "").split(";", 1)[0].strip().lower()
+
+
+def accepts_msgpack(accept_header: Optional[str]) -> bool:
+    """True if msgpack is installed and listed in an ``Accept`` header."""
+    if msgpack is None or not accept_header:
+        return False
+    return any(_media_type(part) == MSGPACK_CONTENT_TYPE for part in accept_header.split(","))
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    return _media_type(content_type) == MSGPACK_CONTENT_TYPE
+
+
+def decode_body(body: bytes, content_type: Optional[str] = None) -> Any:
+    """Decode a request/response body; returns None when it is empty or malformed."""
+    if not body:
+        return None
+    if is_msgpack(content_type):
+        if msgpack is None:
+            return None
+        try:
+            return msgpack.unpackb(body, raw=False)
+        except (ValueError, msgpack.UnpackException):
+            return None
+    try:
+        return json.loads(body.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+
+
+def encode_body(payload: Any, use_msgpack: bool = False) -> Tuple[bytes, str]:
+    """Encode ``payload``; returns ``(body, content_type)``. Falls back to JSON without msgpack."""
+    if use_msgpack and msgpack is not None:
+        return msgpack.packb(payload, use_bin_type=True), MSGPACK_CONTENT_TYPE
+    return json.dumps(payload).encode("utf-8"), JSON_CONTENT_TYPE